@@ -1,48 +1,65 @@
 import asyncio
+from functools import lru_cache
+from typing import Dict
 
 from playwright.async_api import Page
 
-from agentq.core.agent.agentq import AgentQ
-from agentq.core.agent.agentq_actor import AgentQActor
-from agentq.core.agent.agentq_critic import AgentQCritic
-from agentq.core.agent.browser_nav_agent import BrowserNavAgent
-from agentq.core.agent.planner_agent import PlannerAgent
+from agentq.core.agent.base import BaseAgent
 from agentq.core.models.models import State
 from agentq.core.orchestrator.orchestrator import Orchestrator
+from agentq.core.orchestrator.session_pool import create_state_to_agent_map
 
-state_to_agent_map = {
-    State.PLAN: PlannerAgent(),
-    State.BROWSE: BrowserNavAgent(),
-    State.AGENTQ_BASE: AgentQ(),
-    State.AGENTQ_ACTOR: AgentQActor(),
-    State.AGENTQ_CRITIC: AgentQCritic(),
-}
 
+@lru_cache(maxsize=None)
+def get_state_to_agent_map() -> Dict[State, BaseAgent]:
+    """The agents shared by non-isolated runs, constructed on first use rather than at import."""
+    return create_state_to_agent_map()
 
-async def run_agent(command):
-    orchestrator = Orchestrator(state_to_agent_map=state_to_agent_map, eval_mode=True)
+
+EVAL_HOMEPAGE = "http://localhost:3000/abc"
+
+
+async def run_agent(command, homepage: str = EVAL_HOMEPAGE, isolated: bool = False):
+    """
+    Runs one command in eval mode and returns the final response.
+
+    With `isolated=True` the command runs in its own tab of the shared browser, so several
+    `run_agent` calls can be awaited concurrently in one process.
+    """
+    orchestrator = Orchestrator(
+        state_to_agent_map=create_state_to_agent_map()
+        if isolated
+        else get_state_to_agent_map(),
+        eval_mode=True,
+    )
     await orchestrator.start()
+    if isolated:
+        async with orchestrator.playwright_manager.session_page() as page:
+            orchestrator.page = page
+            return await _run_command(orchestrator, page, command, homepage)
     page: Page = await orchestrator.playwright_manager.get_current_page()
+    return await _run_command(orchestrator, page, command, homepage)
+
+
+async def _run_command(orchestrator: Orchestrator, page: Page, command, homepage: str):
     await page.set_extra_http_headers({"User-Agent": "AgentQ-Bot"})
-    await page.goto(
-        "http://localhost:3000/abc", wait_until="networkidle", timeout=30000
-    )
+    await page.goto(homepage, wait_until="networkidle", timeout=30000)
     result = await orchestrator.execute_command(command)
     return result
 
 
-def run_agent_sync(command):
+def run_agent_sync(command, homepage: str = EVAL_HOMEPAGE):
     if asyncio.get_event_loop().is_closed():
         loop = asyncio.new_event_loop()
         asyncio.set_event_loop(loop)
     else:
         loop = asyncio.get_event_loop()
 
-    return loop.run_until_complete(run_agent(command))
+    return loop.run_until_complete(run_agent(command, homepage=homepage))
 
 
 async def main():
-    orchestrator = Orchestrator(state_to_agent_map=state_to_agent_map)
+    orchestrator = Orchestrator(state_to_agent_map=get_state_to_agent_map())
     await orchestrator.start()
 
 
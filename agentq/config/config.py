@@ -14,16 +14,13 @@ PROJECT_TEMP_PATH = os.path.join(PROJECT_SOURCE_ROOT, "temp")
 USER_PREFERENCES_PATH = os.path.join(PROJECT_SOURCE_ROOT, "user_preferences")
 PROJECT_TEST_ROOT = os.path.join(PROJECT_ROOT, "test")
 
-# Check if the log folder exists, and if not, create it
-if not os.path.exists(SOURCE_LOG_FOLDER_PATH):
-    os.makedirs(SOURCE_LOG_FOLDER_PATH)
-    print(f"Created log folder at: {SOURCE_LOG_FOLDER_PATH}")
 
-# create user prefernces folder if it does not exist
-if not os.path.exists(USER_PREFERENCES_PATH):
-    os.makedirs(USER_PREFERENCES_PATH)
-    print(f"Created user preferences folder at: {USER_PREFERENCES_PATH}")
+def ensure_directory(path: str) -> str:
+    """
+    Creates the directory if it does not exist yet and returns its path.
 
-if not os.path.exists(PROJECT_TEMP_PATH):
-    os.makedirs(PROJECT_TEMP_PATH)
-    print(f"Created temp folder at: {PROJECT_TEMP_PATH}")
+    The folders above are created on first use rather than when this module is imported, so importing agentq has no
+    filesystem side effects.
+    """
+    os.makedirs(path, exist_ok=True)
+    return path
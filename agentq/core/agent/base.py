@@ -1,17 +1,53 @@
+import asyncio
 import json
+import logging
 import os
 from typing import Callable, List, Optional, Tuple, Type
 
-import instructor
-import instructor.patch
-import litellm
-import openai
-from instructor import Mode
-from langsmith import traceable
 from pydantic import BaseModel
 
 from agentq.utils.function_utils import get_function_schema
+from agentq.utils.langsmith_tracing import traceable
 from agentq.utils.logger import logger
+from agentq.utils.tracing import tracer
+
+_litellm_configured = False
+
+
+def _configure_litellm():
+    global _litellm_configured
+    if _litellm_configured:
+        return
+    import litellm
+
+    # Set global configurations for litellm. Verbose mode prints every request and response to stdout,
+    # so it is only turned on when debug logging is enabled (AGENTQ_LOG_LEVEL=DEBUG).
+    verbose = logger.isEnabledFor(logging.DEBUG)
+    litellm.logging = verbose
+    litellm.set_verbose = verbose
+    _litellm_configured = True
+
+
+def _create_client(client: str):
+    import instructor
+    import instructor.patch
+    import openai
+    from instructor import Mode
+
+    _configure_litellm()
+
+    # Llm client
+    if client == "openai":
+        llm_client = openai.Client()
+    elif client == "together":
+        llm_client = openai.OpenAI(
+            base_url="https://api.together.xyz/v1",
+            api_key=os.environ["TOGETHER_API_KEY"],
+        )
+    else:
+        raise ValueError(f"Unsupported client: {client}")
+
+    return instructor.from_openai(llm_client, mode=Mode.JSON)
 
 
 class BaseAgent:
@@ -40,20 +76,9 @@ class BaseAgent:
         self.input_format = input_format
         self.output_format = output_format
 
-        # Set global configurations for litellm
-        litellm.logging = True
-        litellm.set_verbose = True
-
-        # Llm client
-        if client == "openai":
-            self.client = openai.Client()
-        elif client == "together":
-            self.client = openai.OpenAI(
-                base_url="https://api.together.xyz/v1",
-                api_key=os.environ["TOGETHER_API_KEY"],
-            )
-
-        self.client = instructor.from_openai(self.client, mode=Mode.JSON)
+        # Llm client, built on first use (see the `client` property)
+        self.client_name = client
+        self._client = None
 
         # Tools
         self.tools_list = []
@@ -61,6 +86,16 @@ class BaseAgent:
         if tools:
             self._initialize_tools(tools)
 
+    @property
+    def client(self):
+        """
+        The instructor-patched LLM client. openai, instructor and litellm are imported and the client is built
+        the first time an agent calls the LLM, so constructing agents (and importing agentq) stays cheap.
+        """
+        if self._client is None:
+            self._client = _create_client(self.client_name)
+        return self._client
+
     def _initialize_tools(self, tools: List[Tuple[Callable, str]]):
         for func, func_desc in tools:
             self.tools_list.append(get_function_schema(func, description=func_desc))
@@ -128,25 +163,35 @@ class BaseAgent:
             # TODO:
             # 1. exeception handling while calling the client
             # 2. remove the else block as JSON mode in instrutor won't allow us to pass in tools.
-            if len(self.tools_list) == 0:
-                response = self.client.chat.completions.create(
-                    model=model,
-                    # model="gpt-4o-2024-08-06",
-                    # model="gpt-4o-mini",
-                    # model="groq/llama3-groq-70b-8192-tool-use-preview",
-                    # model="xlam-1b-fc-r",
-                    messages=self.messages,
-                    response_model=self.output_format,
-                    max_retries=4,
-                )
-            else:
-                response = self.client.chat.completions.create(
-                    model=model,
-                    messages=self.messages,
-                    response_model=self.output_format,
-                    tool_choice="auto",
-                    tools=self.tools_list,
-                )
+            with tracer.span(f"llm.{self.agent_name}", model=model) as span:
+                if len(self.tools_list) == 0:
+                    # the client is synchronous, run it off the event loop so concurrent sessions keep progressing
+                    response, completion = await asyncio.to_thread(
+                        self.client.chat.completions.create_with_completion,
+                        model=model,
+                        # model="gpt-4o-2024-08-06",
+                        # model="gpt-4o-mini",
+                        # model="groq/llama3-groq-70b-8192-tool-use-preview",
+                        # model="xlam-1b-fc-r",
+                        messages=self.messages,
+                        response_model=self.output_format,
+                        max_retries=4,
+                    )
+                else:
+                    response, completion = await asyncio.to_thread(
+                        self.client.chat.completions.create_with_completion,
+                        model=model,
+                        messages=self.messages,
+                        response_model=self.output_format,
+                        tool_choice="auto",
+                        tools=self.tools_list,
+                    )
+                usage = getattr(completion, "usage", None)
+                if usage is not None:
+                    span.set_attributes(
+                        prompt_tokens=usage.prompt_tokens,
+                        completion_tokens=usage.completion_tokens,
+                    )
 
             # instructor directly outputs response.choices[0].message. so we will do response_message = response
             # response_message = response.choices[0].message
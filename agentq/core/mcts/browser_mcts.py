@@ -1,10 +1,10 @@
 import asyncio
-import json
+import logging
+import os
 import sys
-from typing import List, Tuple
+from typing import Iterable, Iterator, List, Optional, Tuple
 
 import numpy as np
-from langsmith import traceable
 from playwright.async_api import Page
 
 from agentq.core.agent.agentq_actor import AgentQActor
@@ -13,6 +13,9 @@ from agentq.core.agent.base import BaseAgent
 from agentq.core.agent.vision_agent import VisionAgent
 from agentq.core.mcts.core.base import Reasoner, SearchConfig, WorldModel
 from agentq.core.mcts.core.mcts import MCTS, MCTSResult
+from agentq.core.mcts.dpo_mining import DPOMiningConfig, iter_mined_dpo_pairs
+from agentq.core.mcts.dpo_writer import DPODatasetWriter, get_dpo_writer
+from agentq.core.mcts.tree_store import MCTS_TREE_DIR_ENV_VAR, save_mcts_tree
 from agentq.core.mcts.visualization.visualizer_client import visualize
 from agentq.core.models.models import (
     ActionType,
@@ -22,9 +25,7 @@ from agentq.core.models.models import (
     AgentQCriticOutput,
     BrowserAction,
     BrowserState,
-    DPOAction,
     DPOPair,
-    DPOState,
     TaskWithActions,
     VisionInput,
     VisionOutput,
@@ -37,6 +38,9 @@ from agentq.core.skills.get_screenshot import get_screenshot
 from agentq.core.skills.get_url import geturl
 from agentq.core.skills.open_url import openurl
 from agentq.core.web_driver.playwright import PlaywrightManager
+from agentq.utils.langsmith_tracing import traceable
+from agentq.utils.logger import console, logger
+from agentq.utils.progress import report_progress
 
 # ANSI color codes
 BLUE = "\033[94m"
@@ -47,6 +51,9 @@ MAGENTA = "\033[95m"
 CYAN = "\033[96m"
 RESET = "\033[0m"
 
+# DPO pairs appended to the dataset per write while a search tree is mined.
+DPO_WRITE_CHUNK_SIZE = 16
+
 
 @traceable(run_type="chain", name="mcts")
 class BrowserWorldModel(WorldModel[BrowserState, BrowserAction, str]):
@@ -54,20 +61,18 @@ class BrowserWorldModel(WorldModel[BrowserState, BrowserAction, str]):
         super().__init__()
         self.objective = objective
         self.vision = vision
-        print(
-            f"{BLUE}[DEBUG] BrowserWorldModel initialized with objective: {self.objective}{RESET}"
-        )
+        logger.debug("BrowserWorldModel initialized with objective: %s", self.objective)
 
     async def init_state(self) -> BrowserState:
         # go to home page
-        print(f"{GREEN}[DEBUG] GOING TO INIT STATE HOMEPAGE{RESET}")
+        logger.debug("Going to the homepage for the initial state")
         playwright_manager = PlaywrightManager()
         await playwright_manager.go_to_homepage()
 
         # initialzie dom and url
         initial_dom = await self.get_current_dom()
         initial_url = await self.get_current_url()
-        print(f"{GREEN}[DEBUG] Initial state created - URL: {initial_url}{RESET}")
+        logger.debug("Initial state created - URL: %s", initial_url)
 
         return BrowserState(
             dom=initial_dom,
@@ -79,7 +84,7 @@ class BrowserWorldModel(WorldModel[BrowserState, BrowserAction, str]):
     async def step(
         self, state: BrowserState, browser_action: BrowserAction
     ) -> Tuple[BrowserState, dict]:
-        print(f"{YELLOW}[DEBUG] Executing step with action: {browser_action}{RESET}")
+        logger.debug("Executing step with action: %s", browser_action)
         new_dom, new_url = await self.execute_browser_action(browser_action)
         current_task = browser_action.task_with_action
         new_completed_tasks = state.completed_tasks + [current_task]
@@ -89,24 +94,24 @@ class BrowserWorldModel(WorldModel[BrowserState, BrowserAction, str]):
             objective=state.objective,
             completed_tasks=new_completed_tasks,
         )
-        print(f"{GREEN}[DEBUG] New state after step - URL: {new_url}{RESET}")
+        logger.debug("New state after step - URL: %s", new_url)
         return new_state, {}
 
     async def is_terminal(self, state: BrowserState) -> bool:
         terminal = await is_terminal(state, self.vision)
-        print(f"{CYAN}[DEBUG] is_terminal: {terminal}{RESET}")
+        logger.debug("is_terminal: %s", terminal)
         return terminal
 
     async def execute_browser_action(
         self, browser_action: BrowserAction
     ) -> Tuple[str, str]:
         action = browser_action.task_with_action.actions_to_be_performed[0]
-        print(f"{YELLOW}[DEBUG] Executing browser action: {action.type}{RESET}")
+        logger.debug("Executing browser action: %s", action.type)
 
         if action.type == ActionType.GOTO_URL:
-            print(f"{CYAN}[DEBUG] Trying to go to url{RESET}")
+            logger.debug("Trying to go to url")
             await openurl(url=action.website, timeout=action.timeout or 1)
-            print(f"{CYAN}[DEBUG] Went to url{RESET}")
+            logger.debug("Went to url")
         elif action.type == ActionType.TYPE:
             entry = EnterTextEntry(
                 query_selector=f"[mmid='{action.mmid}']",
@@ -114,13 +119,13 @@ class BrowserWorldModel(WorldModel[BrowserState, BrowserAction, str]):
             )
             await entertext(entry)
             # await wait_for_navigation()
-            print(f"{CYAN}[DEBUG] Typed text into element{RESET}")
+            logger.debug("Typed text into element")
         elif action.type == ActionType.CLICK:
             await click(
                 selector=f"[mmid='{action.mmid}']",
                 wait_before_execution=action.wait_before_execution or 2,
             )
-            print(f"{CYAN}[DEBUG] Clicked element{RESET}")
+            logger.debug("Clicked element")
         elif action.type == ActionType.ENTER_TEXT_AND_CLICK:
             await enter_text_and_click(
                 text_selector=f"[mmid='{action.text_element_mmid}']",
@@ -129,33 +134,33 @@ class BrowserWorldModel(WorldModel[BrowserState, BrowserAction, str]):
                 wait_before_click_execution=action.wait_before_click_execution or 2,
             )
             # await wait_for_navigation()
-            print(f"{CYAN}[DEBUG] Entered text and clicked element{RESET}")
+            logger.debug("Entered text and clicked element")
 
         try:
             new_dom = await self.get_current_dom()
         except Exception as e:
-            print(f"{RED}[DEBUG] Error getting DOM after action: {e}{RESET}")
+            logger.warning("Error getting DOM after action: %s", e)
             new_dom = "Error: Unable to retrieve DOM"
 
         try:
             new_url = await self.get_current_url()
         except Exception as e:
-            print(f"{RED}[DEBUG] Error getting URL after action: {e}{RESET}")
+            logger.warning("Error getting URL after action: %s", e)
             new_url = "Error: Unable to retrieve URL"
 
-        print(f"{GREEN}[DEBUG] After action execution - New URL: {new_url}{RESET}")
+        logger.debug("After action execution - New URL: %s", new_url)
         return new_dom, new_url
 
     async def get_current_dom(self) -> str:
         await wait_for_navigation()
         dom = await get_dom_with_content_type(content_type="all_fields")
-        print(f"{CYAN}[DEBUG] Got current DOM (length: {len(dom)}){RESET}")
+        logger.debug("Got current DOM (length: %s)", len(dom))
         return str(dom)
 
     async def get_current_url(self) -> str:
         # await wait_for_navigation()
         url = await geturl()
-        print(f"{CYAN}[DEBUG] Got current URL: {url}{RESET}")
+        logger.debug("Got current URL: %s", url)
         return url
 
 
@@ -165,10 +170,10 @@ class BrowserMCTSSearchConfig(SearchConfig[BrowserState, BrowserAction, str]):
         self.actor = actor
         self.critic = critic
         self.vision = vision
-        print(f"{BLUE}[DEBUG] BrowserMCTSSearchConfig initialized{RESET}")
+        logger.debug("BrowserMCTSSearchConfig initialized")
 
     async def get_actions(self, state: BrowserState) -> List[BrowserAction]:
-        print(f"{YELLOW}[DEBUG] Getting actions for current state{RESET}")
+        logger.debug("Getting actions for current state")
         actor_input: AgentQActorInput = AgentQActorInput(
             objective=state.objective,
             completed_tasks=state.completed_tasks,
@@ -178,12 +183,10 @@ class BrowserMCTSSearchConfig(SearchConfig[BrowserState, BrowserAction, str]):
         actor_output: AgentQActorOutput = await self.actor.run(actor_input)
 
         proposed_tasks_with_actions: List[TaskWithActions] = actor_output.proposed_tasks
-        print(
-            f"{CYAN}[DEBUG] Number of proposed tasks: {len(proposed_tasks_with_actions)}{RESET}"
-        )
+        logger.debug("Number of proposed tasks: %s", len(proposed_tasks_with_actions))
 
         ranked_actions = await self._rank_actions(state, proposed_tasks_with_actions)
-        print(f"{CYAN}[DEBUG] Number of sorted actions: {len(ranked_actions)}{RESET}")
+        logger.debug("Number of sorted actions: %s", len(ranked_actions))
 
         return ranked_actions
 
@@ -192,10 +195,10 @@ class BrowserMCTSSearchConfig(SearchConfig[BrowserState, BrowserAction, str]):
     ) -> Tuple[float, dict]:
         terminal_state = await is_terminal(state=state, vision=self.vision)
         if terminal_state:
-            print(f"{GREEN}[DEBUG] Terminal state reached, reward: 1.0{RESET}")
+            logger.debug("Terminal state reached, reward: 1.0")
             return 1.0, {}
         else:
-            print(f"{RED}[DEBUG] Non-terminal state, reward: -0.01{RESET}")
+            logger.debug("Non-terminal state, reward: -0.01")
             return -0.01, {}
 
     def fast_reward(
@@ -210,7 +213,7 @@ class BrowserMCTSSearchConfig(SearchConfig[BrowserState, BrowserAction, str]):
         remaining_tasks = tasks.copy()
         total_tasks = len(remaining_tasks)
 
-        print(f"{GREEN}[INFO] Sorting task via Critic now...")
+        logger.debug("Sorting tasks via the critic")
         for iteration in range(total_tasks):
             if not remaining_tasks:
                 break
@@ -237,22 +240,22 @@ class BrowserMCTSSearchConfig(SearchConfig[BrowserState, BrowserAction, str]):
                     task for task in remaining_tasks if task.id != top_task.id
                 ]
             else:
-                print(
-                    f"{MAGENTA}[DEBUG] Warning: No valid top task found in iteration {iteration}. Skipping.{RESET}"
+                logger.warning(
+                    "No valid top task found in iteration %s. Skipping.", iteration
                 )
 
-        print(f"{CYAN}[DEBUG] Sorted actions.")
+        logger.debug("Sorted actions.")
         return ranked_actions
 
 
 async def is_terminal(state: BrowserState, vision: BaseAgent) -> bool:
-    print(f"{YELLOW}[DEBUG] Checking if state is terminal{RESET}")
+    logger.debug("Checking if state is terminal")
     screenshot = await get_screenshot()
     vision_input: VisionInput = VisionInput(objective=state.objective)
     vision_output: VisionOutput = await vision.run(
         vision_input, screenshot, model="gpt-4o-2024-08-06"
     )
-    print(f"{YELLOW}[DEBUG] Output of vision LLM {vision_output.is_terminal}{RESET}")
+    logger.debug("Output of vision LLM %s", vision_output.is_terminal)
     return vision_output.is_terminal
 
 
@@ -280,132 +283,149 @@ class BrowserMCTSWrapper(Reasoner[BrowserState, BrowserAction, str]):
         )
         super().__init__(world_model, search_config, search_algo)
         self.dpo_pairs = []
-        print(
-            f"{BLUE}[DEBUG] BrowserMCTSWrapper initialized with objective: {objective}{RESET}"
-        )
+        logger.debug("BrowserMCTSWrapper initialized with objective: %s", objective)
 
     async def __call__(self) -> MCTSResult:
-        print(f"{YELLOW}[DEBUG] Starting MCTS search{RESET}")
+        logger.debug("Starting MCTS search")
         result = await super().__call__("")
         return result
 
     @staticmethod
-    def generate_dpo_pairs(result: MCTSResult) -> List[DPOPair]:
-        dpo_pairs = []
-
-        if result.trace_of_nodes is None or len(result.trace_of_nodes) < 2:
-            print(f"{RED}[DEBUG] No valid path found{RESET}")
-            return []
-
-        print(f"{BLUE}[DEBUG] Printing rewards before generating dpo pairs")
-        for i, node in enumerate(result.trace_of_nodes):
-            print(f"{BLUE} {node.state.url} - {node.Q}")
-
-        for i in range(len(result.trace_of_nodes) - 1):
-            current_node = result.trace_of_nodes[i]
-            next_node = result.trace_of_nodes[i + 1]
-
-            if current_node.children:
-                winning_action = next_node.action
-                for child in current_node.children:
-                    if child.action != winning_action:
-                        dpo_pair = DPOPair(
-                            state=DPOState(
-                                dom=current_node.state.dom[
-                                    :1000
-                                ],  # Truncate DOM to first 1000 characters
-                                objective=current_node.state.objective,
-                            ),
-                            winning_action=DPOAction(
-                                description=winning_action.task_with_action.description,
-                                action=winning_action.task_with_action.actions_to_be_performed[
-                                    0
-                                ],
-                            ),
-                            losing_action=DPOAction(
-                                description=child.action.task_with_action.description,
-                                action=child.action.task_with_action.actions_to_be_performed[
-                                    0
-                                ],
-                            ),
-                        )
-                        dpo_pairs.append(dpo_pair)
-
-        return dpo_pairs
+    def generate_dpo_pairs(
+        result: MCTSResult, mining_config: Optional[DPOMiningConfig] = None
+    ) -> List[DPOPair]:
+        return list(BrowserMCTSWrapper.iter_dpo_pairs(result, mining_config))
+
+    @staticmethod
+    def iter_dpo_pairs(
+        result: MCTSResult, mining_config: Optional[DPOMiningConfig] = None
+    ) -> Iterator[DPOPair]:
+        """
+        Yields the DPO pairs mined from the whole search tree one at a time, so they can be written as they are
+        generated. Siblings under every visited node are compared, not only along the best path, and a pair is
+        kept only when the winner's Q beats the loser's by the margin of the mining config (see
+        mine_preference_pairs).
+        """
+        if result.tree_state is None or not result.tree_state.children:
+            logger.warning("No search tree to mine DPO pairs from")
+            return
+
+        if logger.isEnabledFor(logging.DEBUG) and result.trace_of_nodes:
+            for node in result.trace_of_nodes:
+                logger.debug(
+                    "Reward before generating dpo pairs: %s - %s",
+                    node.state.url,
+                    node.Q,
+                )
+
+        yield from iter_mined_dpo_pairs(result.tree_state, mining_config)
 
     @staticmethod
     def print_result(result: MCTSResult):
         if result.trace is None or len(result.trace) == 0:
-            print(f"{RED}[DEBUG] No valid path found{RESET}")
+            logger.warning("No valid path found")
             return
 
+        if not console.isEnabledFor(logging.INFO):
+            return
         states, actions = result.trace
-        print(f"{GREEN}[DEBUG] Path found:{RESET}")
+        lines = [f"{GREEN}Path found:{RESET}"]
         for i, (state, action) in enumerate(zip(states, actions)):
-            print(f"{CYAN}[DEBUG] Step {i}{RESET}")
-            print(f"{CYAN}[DEBUG]  URL: {state.url}{RESET}")
-            print(
-                f"{CYAN}[DEBUG]  Action Type: {action.task_with_action.actions_to_be_performed[0].type}{RESET}"
-            )
-            print(
-                f"{CYAN}[DEBUG]  Action Description: {action.task_with_action.description}{RESET}"
+            lines.append(f"{CYAN}Step {i}{RESET}")
+            lines.append(f"{CYAN} URL: {state.url}{RESET}")
+            lines.append(
+                f"{CYAN} Action Type: {action.task_with_action.actions_to_be_performed[0].type}{RESET}"
             )
-            print(
-                f"{CYAN}[DEBUG]  Action Detail: {action.task_with_action} - {action}{RESET}"
+            lines.append(
+                f"{CYAN} Action Description: {action.task_with_action.description}{RESET}"
             )
+            logger.debug("Action detail: %s - %s", action.task_with_action, action)
 
-        print(f"{GREEN}[DEBUG] Final URL: {states[-1].url}{RESET}")
-        print(f"{GREEN}[DEBUG] Cumulative reward: {result.cum_reward}{RESET}")
-        print(f"{GREEN}[DEBUG] Total steps: {len(actions)}{RESET}")
+        lines.append(f"{GREEN}Final URL: {states[-1].url}{RESET}")
+        lines.append(f"{GREEN}Cumulative reward: {result.cum_reward}{RESET}")
+        lines.append(f"{GREEN}Total steps: {len(actions)}{RESET}")
+        console.info("\n".join(lines))
 
     @staticmethod
     def print_dpo_pairs(dpo_pairs: List[DPOPair]):
-        print(f"\n{MAGENTA}═══════════════ Generated DPO Pairs ═══════════════{RESET}")
+        if not console.isEnabledFor(logging.INFO):
+            return
+        lines = [
+            f"\n{MAGENTA}═══════════════ Generated DPO Pairs ═══════════════{RESET}"
+        ]
         for i, dpo_pair in enumerate(dpo_pairs, 1):
-            print(f"\n{CYAN}╔══ Pair {i} ══╗{RESET}")
-            print(f"{YELLOW}┌─ State ─┐{RESET}")
+            lines.append(f"\n{CYAN}╔══ Pair {i} ══╗{RESET}")
+            lines.append(f"{YELLOW}┌─ State ─┐{RESET}")
             trimmed_dom = (
                 dpo_pair.state.dom[:100] + "..."
                 if len(dpo_pair.state.dom) > 100
                 else dpo_pair.state.dom
             )
-            print(f"{YELLOW}│ DOM:{RESET} {trimmed_dom}")
-            print(f"{GREEN}┌─ Winning Action ─┐{RESET}")
-            print(f"{GREEN}│ Description:{RESET} {dpo_pair.winning_action.description}")
-            print(f"{GREEN}│ Action Type:{RESET} {dpo_pair.winning_action.action.type}")
-            print(f"{RED}┌─ Losing Action ─┐{RESET}")
-            print(f"{RED}│ Description:{RESET} {dpo_pair.losing_action.description}")
-            print(f"{RED}│ Action Type:{RESET} {dpo_pair.losing_action.action.type}")
-            print(f"{CYAN}╚{'═' * (len('══ Pair X ══') - 2)}╝{RESET}")
-        print(f"\n{MAGENTA}═══════════════ End of DPO Pairs ═══════════════{RESET}")
+            lines.append(f"{YELLOW}│ DOM:{RESET} {trimmed_dom}")
+            lines.append(f"{GREEN}┌─ Winning Action ─┐{RESET}")
+            lines.append(
+                f"{GREEN}│ Description:{RESET} {dpo_pair.winning_action.description}"
+            )
+            lines.append(
+                f"{GREEN}│ Action Type:{RESET} {dpo_pair.winning_action.action.type}"
+            )
+            lines.append(f"{RED}┌─ Losing Action ─┐{RESET}")
+            lines.append(
+                f"{RED}│ Description:{RESET} {dpo_pair.losing_action.description}"
+            )
+            lines.append(
+                f"{RED}│ Action Type:{RESET} {dpo_pair.losing_action.action.type}"
+            )
+            lines.append(f"{CYAN}╚{'═' * (len('══ Pair X ══') - 2)}╝{RESET}")
+        lines.append(
+            f"\n{MAGENTA}═══════════════ End of DPO Pairs ═══════════════{RESET}"
+        )
+        console.info("\n".join(lines))
 
     @staticmethod
-    async def write_dpo_pairs_to_file(dpo_pairs: List[DPOPair], filename: str):
+    async def write_dpo_pairs(
+        dpo_pairs: Iterable[DPOPair],
+        writer: DPODatasetWriter,
+        chunk_size: int = DPO_WRITE_CHUNK_SIZE,
+    ) -> List[DPOPair]:
         """
-        Write the generated DPO pairs to a JSONL file in a format optimized for DPO training scripts.
+        Appends the DPO pairs not yet in the dataset as they are generated, `chunk_size` pairs per write, in a
+        format optimized for DPO training scripts (see DPODatasetWriter). The pairs mined so far are on disk if
+        the run stops early, at one fsync per chunk rather than per pair.
+
+        Returns:
+            List[DPOPair]: All the generated pairs, including the duplicates that were not written.
         """
-        with open(filename, "w") as f:
-            for pair in dpo_pairs:
-                dpo_entry = {
-                    "prompt": f"Objective: {pair.state.objective}\nCurrent DOM: {pair.state.dom[:1000]}...",
-                    "chosen": f"Action: {pair.winning_action.action.model_dump_json()}\nDescription: {pair.winning_action.description}",
-                    "rejected": f"Action: {pair.losing_action.action.model_dump_json()}\nDescription: {pair.losing_action.description}",
-                }
-                json.dump(dpo_entry, f)
-                f.write("\n")  # Add a newline for JSONL format
-
-        print(f"{GREEN}[INFO] DPO pairs written to {filename} in JSONL format{RESET}")
+        generated: List[DPOPair] = []
+        chunk: List[DPOPair] = []
+        written = 0
+        for dpo_pair in dpo_pairs:
+            report_progress("dpo_pair", pair=dpo_pair.model_dump(mode="json"))
+            generated.append(dpo_pair)
+            chunk.append(dpo_pair)
+            if len(chunk) >= chunk_size:
+                written += await asyncio.to_thread(writer.write, chunk)
+                chunk = []
+        if chunk:
+            written += await asyncio.to_thread(writer.write, chunk)
+        console.info(
+            "%s%s new DPO pairs written to %s (%s duplicates skipped)%s",
+            GREEN,
+            written,
+            writer.directory,
+            len(generated) - written,
+            RESET,
+        )
+        return generated
 
     async def is_terminal(self, state: BrowserState) -> bool:
-        print(f"{YELLOW}[DEBUG] Checking if state is terminal{RESET}")
+        logger.debug("Checking if state is terminal")
         screenshot = await get_screenshot()
         vision_input: VisionInput = VisionInput(objective=state.objective)
         vision_output: VisionOutput = await self.vision.run(
             vision_input, screenshot, model="gpt-4o-2024-08-06"
         )
-        print(
-            f"{YELLOW}[DEBUG] Output of vision LLM {vision_output.is_terminal}{RESET}"
-        )
+        logger.debug("Output of vision LLM %s", vision_output.is_terminal)
         return vision_output.is_terminal
 
 
@@ -414,65 +434,93 @@ async def wait_for_navigation(max_retries=3):
         try:
             playwright_manager = PlaywrightManager()
             page = await playwright_manager.get_current_page()
-            await page.wait_for_load_state("domcontentloaded", timeout=30000)
-            print(
-                f"{GREEN}[DEBUG] Navigation successful on attempt {attempt + 1}{RESET}"
-            )
+            if not await playwright_manager.wait_for_page_ready(page, timeout=30):
+                raise TimeoutError("DOM still loading after 30 seconds")
+            logger.debug("Navigation successful on attempt %s", attempt + 1)
             return
         except Exception as e:
-            print(
-                f"{YELLOW}[DEBUG] Navigation error on attempt {attempt + 1}: {str(e)}{RESET}"
-            )
-    print(f"{RED}[DEBUG] Navigation failed after {max_retries} attempts{RESET}")
+            logger.warning("Navigation error on attempt %s: %s", attempt + 1, str(e))
+    logger.warning("Navigation failed after %s attempts", max_retries)
 
 
-async def main(objective: str = None, eval_mode: bool = False):
-    print(f"{BLUE}Starting MCTS{RESET}")
+async def main(
+    objective: str = None,
+    eval_mode: bool = False,
+    homepage: str = "http://localhost:3000/abc",
+):
+    console.info("%sStarting MCTS%s", BLUE, RESET)
     playwright_manager = PlaywrightManager()
 
     if not eval_mode:
         await playwright_manager.async_initialize()
     else:
         await playwright_manager.async_initialize(
-            eval_mode=eval_mode, homepage="http://localhost:3000/abc"
+            eval_mode=eval_mode, homepage=homepage
         )
         page: Page = await playwright_manager.get_current_page()
         await page.set_extra_http_headers({"User-Agent": "AgentQ-Bot"})
-    print(f"{GREEN}Browser started and ready{RESET}")
+    console.info("%sBrowser started and ready%s", GREEN, RESET)
 
-    print(f"{BLUE}[DEBUG] Starting main function{RESET}")
+    logger.debug("Starting main function")
     actor = AgentQActor()
     critic = AgentQCritic()
     vision = VisionAgent()
 
-    print(f"{CYAN}[DEBUG] Objective set: {objective}{RESET}")
+    return await run_mcts_search(objective, actor, critic, vision)
+
+
+async def run_mcts_search(
+    objective: str,
+    actor: BaseAgent,
+    critic: BaseAgent,
+    vision: BaseAgent,
+    n_iterations: int = 10,
+    depth_limit: int = 6,
+    exploration_weight: float = 1.0,
+    dpo_dataset_dir: Optional[str] = None,
+    mining_config: Optional[DPOMiningConfig] = None,
+    tree_dir: Optional[str] = None,
+) -> List[DPOPair]:
+    """
+    Runs the MCTS search for an objective on the current page with already constructed agents, and appends the resulting DPO pairs
+    to the DPO dataset (AGENTQ_DPO_DATASET_DIR, "dpo_dataset" by default).
+
+    The search tree is also persisted to `tree_dir` (AGENTQ_MCTS_TREE_DIR by default, not persisted when unset), so the
+    dataset can be rebuilt later with other mining thresholds or formats (see dpo_builder).
+    """
+    logger.debug("Objective set: %s", objective)
 
     browser_mcts_wrapper = BrowserMCTSWrapper(
         objective=objective,
         actor=actor,
         critic=critic,
         vision=vision,
-        n_iterations=10,
-        depth_limit=6,
-        exploration_weight=1.0,
+        n_iterations=n_iterations,
+        depth_limit=depth_limit,
+        exploration_weight=exploration_weight,
     )
 
-    print(f"{YELLOW}[DEBUG] Running MCTS wrapper{RESET}")
+    logger.debug("Running MCTS wrapper")
     result = await browser_mcts_wrapper()
 
     # Print results
-    print(f"{CYAN}[DEBUG] Printing MCTS result{RESET}")
     BrowserMCTSWrapper.print_result(result)
 
     # Tree visualization
     # visualize(result=result)
 
+    tree_dir = tree_dir or os.getenv(MCTS_TREE_DIR_ENV_VAR)
+    if tree_dir:
+        await asyncio.to_thread(save_mcts_tree, result, tree_dir)
+
     # Dpo pairs
-    dpo_pairs = BrowserMCTSWrapper.generate_dpo_pairs(result=result)
-    BrowserMCTSWrapper.print_dpo_pairs(dpo_pairs=dpo_pairs)
-    await BrowserMCTSWrapper.write_dpo_pairs_to_file(
-        dpo_pairs=dpo_pairs, filename="dpo_pairs.jsonl"
+    dpo_pairs = await BrowserMCTSWrapper.write_dpo_pairs(
+        dpo_pairs=BrowserMCTSWrapper.iter_dpo_pairs(
+            result=result, mining_config=mining_config
+        ),
+        writer=get_dpo_writer(dpo_dataset_dir),
     )
+    BrowserMCTSWrapper.print_dpo_pairs(dpo_pairs=dpo_pairs)
     return dpo_pairs
 
 
@@ -493,7 +541,7 @@ class StreamToFile:
 
 
 if __name__ == "__main__":
-    print(f"{BLUE}[DEBUG] Script started{RESET}")
+    logger.debug("Script started")
     output_stream = StreamToFile("output.txt")
     # sys.stdout = output_stream
     # sys.stderr = output_stream
@@ -508,4 +556,4 @@ if __name__ == "__main__":
         sys.stdout = sys.__stdout__
         sys.stderr = sys.__stderr__
         output_stream.close()
-    print(f"{GREEN}[DEBUG] Script finished{RESET}")
+    logger.debug("Script finished")
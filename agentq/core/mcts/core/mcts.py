@@ -18,6 +18,9 @@ from agentq.core.mcts.core.base import (
     WorldModel,
 )
 from agentq.core.web_driver.playwright import PlaywrightManager
+from agentq.utils.logger import logger
+from agentq.utils.progress import report_progress
+from agentq.utils.tracing import tracer
 
 
 class MCTSNode(Generic[State, Action, Example]):
@@ -118,7 +121,7 @@ class MCTSAggregation(Generic[State, Action, Example], ABC):
             if cur.is_terminal:
                 answer = self.retrieve_answer(cur.state)
                 if answer is None:
-                    print("MCTSAggregation: no answer retrieved.")
+                    logger.debug("MCTSAggregation: no answer retrieved.")
                     return []
                 if self.weight_policy == "edge":
                     answer_dict[answer] += cur.reward
@@ -221,16 +224,20 @@ class MCTS(SearchAlgorithm, Generic[State, Action, Example]):
         self.aggregator = aggregator
 
     async def iterate(self, node: MCTSNode) -> list[MCTSNode]:
-        path = await self._select(node)
-        print("Selected Node")
+        with tracer.span("mcts.select"):
+            path = await self._select(node)
+        logger.debug("Selected node at depth %d", len(path) - 1)
         # print(path)
         # print(path[-1])
         # print(path[-1].action)
         if not self._is_terminal_with_depth_limit(path[-1]):
-            await self._expand(path[-1])
-            await self._simulate(path)
-        cum_reward = self._back_propagate(path)
-        #self._print_tree(self.root)
+            with tracer.span("mcts.expand"):
+                await self._expand(path[-1])
+            with tracer.span("mcts.simulate"):
+                await self._simulate(path)
+        with tracer.span("mcts.backprop", path_length=len(path)):
+            cum_reward = self._back_propagate(path)
+        # self._print_tree(self.root)
         if (
             self.output_strategy == "max_iter"
             and path[-1].is_terminal
@@ -252,7 +259,7 @@ class MCTS(SearchAlgorithm, Generic[State, Action, Example]):
     def _print_tree(self, node: MCTSNode, depth: int = 0):
         indent = "  " * depth
         url = node.state.url if node.state and hasattr(node.state, "url") else "N/A"
-        print(f"{indent}URL: {url}, Q: {node.Q:.4f}, N: {node.N}")
+        logger.debug("%sURL: %s, Q: %.4f, N: %d", indent, url, node.Q, node.N)
         if node.children:
             for child in node.children:
                 self._print_tree(child, depth + 1)
@@ -295,7 +302,7 @@ class MCTS(SearchAlgorithm, Generic[State, Action, Example]):
         return max(node.children, key=self._uct)
 
     async def _expand(self, node: MCTSNode):
-        print("Expanding node")
+        logger.debug("Expanding node")
         if node.state is None:
             node.state, aux = await self.world_model.step(
                 node.parent.state, node.action
@@ -315,8 +322,7 @@ class MCTS(SearchAlgorithm, Generic[State, Action, Example]):
         # print(node.state.url)
         # print(node)
         actions = await self.search_config.get_actions(node.state)
-        print("Got possible actions")
-        print(actions)
+        logger.debug("Got %d possible actions: %s", len(actions), actions)
 
         for action in actions:
             fast_reward, fast_reward_details = self.search_config.fast_reward(
@@ -335,7 +341,7 @@ class MCTS(SearchAlgorithm, Generic[State, Action, Example]):
         node.children = children
 
     async def _simulate(self, path: list[MCTSNode]):
-        print("Simulating the node")
+        logger.debug("Simulating the node")
         node = path[-1]
         while True:
             if node.state is None:
@@ -343,8 +349,7 @@ class MCTS(SearchAlgorithm, Generic[State, Action, Example]):
             if self._is_terminal_with_depth_limit(node) or len(node.children) == 0:
                 return
             fast_rewards = [child.fast_reward for child in node.children]
-            print("fast rewards")
-            print(fast_rewards)
+            logger.debug("Fast rewards: %s", fast_rewards)
             node = node.children[self.simulate_choice(fast_rewards)]
             path.append(node)
 
@@ -360,14 +365,17 @@ class MCTS(SearchAlgorithm, Generic[State, Action, Example]):
     def _back_propagate(self, path: list[MCTSNode]):
         reward = path[-1].reward
         for node in reversed(path):
-            print(node.state.url)
-            print(node.Q)
-            print(node.N)
+            previous_q, previous_n = node.Q, node.N
             node.Q = (node.Q * node.N + reward) / (node.N + 1)
             node.N += 1
-            print("--updated--")
-            print(node.Q)
-            print(node.N)
+            logger.debug(
+                "Back propagated %s: Q %.4f -> %.4f, N %d -> %d",
+                node.state.url,
+                previous_q,
+                node.Q,
+                previous_n,
+                node.N,
+            )
         return path[0].Q  # Return the root node's updated Q-value
 
     def _dfs_max_reward(self, path: list[MCTSNode]) -> tuple[float, list[MCTSNode]]:
@@ -399,11 +407,19 @@ class MCTS(SearchAlgorithm, Generic[State, Action, Example]):
         for iter in trange(
             self.n_iters, disable=self.disable_tqdm, desc="MCTS iteration", leave=False
         ):
-            print(f"-----iter: {iter}----")
-            # start with home page for each iteration
-            playwright_manager = PlaywrightManager()
-            await playwright_manager.go_to_homepage()
-            path = await self.iterate(self.root)
+            logger.debug("MCTS iteration %d", iter)
+            with tracer.span("mcts.iteration", iteration=iter):
+                # start with home page for each iteration
+                playwright_manager = PlaywrightManager()
+                await playwright_manager.go_to_homepage()
+                path = await self.iterate(self.root)
+            report_progress(
+                "mcts_iteration",
+                iteration=iter,
+                n_iters=self.n_iters,
+                depth=len(path) - 1,
+                terminal=path[-1].is_terminal,
+            )
             if self.output_trace_in_each_iter:
                 self.trace_in_each_iter.append(deepcopy(path))
 
@@ -0,0 +1,218 @@
+"""Rebuilds DPO datasets offline from persisted MCTS trees and tree logs, without a browser or LLM calls."""
+
+import argparse
+import json
+import multiprocessing
+import os
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from agentq.core.mcts.core.mcts import MCTSNode
+from agentq.core.mcts.dpo_mining import DPOMiningConfig, iter_mined_dpo_pairs
+from agentq.core.mcts.dpo_writer import (
+    DEFAULT_DOM_CHARS,
+    DEFAULT_DPO_DATASET_DIR,
+    PROMPT_FORMATS,
+    DPODatasetWriter,
+    DPOFormat,
+    dpo_entry,
+)
+from agentq.core.mcts.tree_store import TREE_FILE, load_mcts_tree, load_tree_log
+from agentq.utils.logger import logger
+
+
+@dataclass
+class BuildSummary:
+    trees: int = 0
+    failed: int = 0
+    pairs: int = 0
+    written: int = 0
+
+    def __str__(self) -> str:
+        return (
+            f"{self.trees} trees ({self.failed} failed): {self.pairs} pairs mined, {self.written} written, "
+            f"{self.pairs - self.written} duplicates skipped"
+        )
+
+
+def is_tree_log(path: str) -> bool:
+    """Checks that a JSON file has the shape of an encoded TreeLog: snapshots of nodes and edges under "logs"."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            tree_log = json.load(f)
+    except (OSError, UnicodeDecodeError, json.JSONDecodeError):
+        return False
+    if not isinstance(tree_log, dict):
+        return False
+    logs = tree_log.get("logs")
+    return (
+        isinstance(logs, list)
+        and bool(logs)
+        and isinstance(logs[-1], dict)
+        and isinstance(logs[-1].get("nodes"), dict)
+        and isinstance(logs[-1].get("edges"), dict)
+    )
+
+
+def find_tree_sources(paths: Iterable[str]) -> List[str]:
+    """
+    Expands the paths to the trees below them: tree directories (with a tree.jsonl, see save_mcts_tree) and
+    TreeLog JSON files. Other JSON files found in the directories, configs or results, are skipped.
+    """
+    sources = []
+    for path in paths:
+        if os.path.isfile(path):
+            sources.append(
+                os.path.dirname(path) or "."
+                if os.path.basename(path) == TREE_FILE
+                else path
+            )
+            continue
+        for directory, _, file_names in sorted(os.walk(path)):
+            if TREE_FILE in file_names:
+                sources.append(directory)
+            for file_name in sorted(file_names):
+                if not file_name.endswith(".json"):
+                    continue
+                file_path = os.path.join(directory, file_name)
+                if is_tree_log(file_path):
+                    sources.append(file_path)
+                else:
+                    logger.warning(f"Skipping {file_path}, it is not a TreeLog")
+    return sources
+
+
+def load_tree(source: str) -> MCTSNode:
+    if os.path.isdir(source):
+        return load_mcts_tree(source)
+    return load_tree_log(source)
+
+
+def _mine_tree(
+    job: Tuple[str, DPOMiningConfig, DPOFormat],
+) -> Tuple[str, Optional[List[Dict[str, Any]]]]:
+    source, mining_config, dpo_format = job
+    try:
+        root = load_tree(source)
+        # the whole DOM is kept until formatting, which truncates it once
+        pairs = iter_mined_dpo_pairs(root, mining_config, dom_chars=None)
+        return source, [dpo_entry(pair, dpo_format) for pair in pairs]
+    except Exception as e:
+        logger.error(f"Could not mine DPO pairs from {source}: {e}")
+        return source, None
+
+
+def build_dpo_dataset(
+    sources: List[str],
+    output_dir: str = DEFAULT_DPO_DATASET_DIR,
+    mining_config: Optional[DPOMiningConfig] = None,
+    dpo_format: Optional[DPOFormat] = None,
+    workers: Optional[int] = None,
+    compression: Optional[str] = None,
+) -> BuildSummary:
+    """
+    Mines the trees in worker processes and appends their pairs to the dataset in `output_dir` as each tree is
+    done. Pairs already in the dataset are skipped, so a build can be rerun or extended with new trees.
+
+    Args:
+        sources (List[str]): Tree directories and TreeLog files (see find_tree_sources).
+        output_dir (str, optional): The dataset directory. Defaults to "dpo_dataset".
+        mining_config (DPOMiningConfig, optional): Visit and Q margin thresholds of the pairs.
+        dpo_format (DPOFormat, optional): DOM truncation and prompt format of the records.
+        workers (int, optional): Worker processes. Defaults to the CPU count, 1 mines in this process.
+        compression (str, optional): "zstd" to compress the shards.
+    """
+    mining_config = mining_config or DPOMiningConfig()
+    dpo_format = dpo_format or DPOFormat()
+    writer = DPODatasetWriter(
+        output_dir, compression=compression, dpo_format=dpo_format
+    )
+    jobs = [(source, mining_config, dpo_format) for source in sources]
+    workers = min(workers or os.cpu_count() or 1, max(len(jobs), 1))
+    summary = BuildSummary()
+
+    def record(source: str, entries: Optional[List[Dict[str, Any]]]):
+        summary.trees += 1
+        if entries is None:
+            summary.failed += 1
+            return
+        summary.pairs += len(entries)
+        summary.written += writer.write_entries(entries)
+        logger.info(f"{len(entries)} DPO pairs mined from {source}")
+
+    if workers == 1:
+        for job in jobs:
+            record(*_mine_tree(job))
+        return summary
+    # spawned rather than forked: the parent's logging thread must not be copied mid-write
+    with multiprocessing.get_context("spawn").Pool(workers) as pool:
+        for source, entries in pool.imap_unordered(_mine_tree, jobs):
+            record(source, entries)
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Rebuild a DPO dataset from persisted MCTS trees (AGENTQ_MCTS_TREE_DIR) and tree logs."
+    )
+    parser.add_argument(
+        "inputs",
+        nargs="+",
+        help="Tree directories, TreeLog JSON files, or directories to search for them",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        default=DEFAULT_DPO_DATASET_DIR,
+        help=f"Dataset directory (default: {DEFAULT_DPO_DATASET_DIR})",
+    )
+    parser.add_argument(
+        "--workers", type=int, default=None, help="Worker processes (default: CPUs)"
+    )
+    parser.add_argument(
+        "--dom-chars",
+        type=int,
+        default=DEFAULT_DOM_CHARS,
+        help=f"DOM characters kept in the prompt, 0 keeps the whole DOM (default: {DEFAULT_DOM_CHARS})",
+    )
+    parser.add_argument(
+        "--prompt-format",
+        choices=PROMPT_FORMATS,
+        default="text",
+        help="text: prompt/chosen/rejected strings, chat: the same as conversations (default: text)",
+    )
+    parser.add_argument("--compression", choices=["zstd"], default=None)
+    defaults = DPOMiningConfig()
+    parser.add_argument(
+        "--min-parent-visits", type=int, default=defaults.min_parent_visits
+    )
+    parser.add_argument(
+        "--min-child-visits", type=int, default=defaults.min_child_visits
+    )
+    parser.add_argument("--min-q-margin", type=float, default=defaults.min_q_margin)
+    parser.add_argument("--max-pairs-per-node", type=int, default=None)
+    args = parser.parse_args()
+
+    sources = find_tree_sources(args.inputs)
+    if not sources:
+        parser.error("No MCTS trees or tree logs found")
+    summary = build_dpo_dataset(
+        sources,
+        output_dir=args.output,
+        mining_config=DPOMiningConfig(
+            min_parent_visits=args.min_parent_visits,
+            min_child_visits=args.min_child_visits,
+            min_q_margin=args.min_q_margin,
+            max_pairs_per_node=args.max_pairs_per_node,
+        ),
+        dpo_format=DPOFormat(
+            dom_chars=args.dom_chars or None, prompt_format=args.prompt_format
+        ),
+        workers=args.workers,
+        compression=args.compression,
+    )
+    print(summary)
+
+
+if __name__ == "__main__":
+    main()
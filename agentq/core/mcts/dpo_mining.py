@@ -0,0 +1,174 @@
+from dataclasses import dataclass
+from typing import Iterator, List, NamedTuple, Optional
+
+import numpy as np
+
+from agentq.core.mcts.core.mcts import MCTSNode
+from agentq.core.mcts.dpo_writer import DEFAULT_DOM_CHARS
+from agentq.core.models.models import DPOAction, DPOPair, DPOState
+
+
+@dataclass
+class DPOMiningConfig:
+    """
+    Attributes:
+        min_parent_visits (int): Visits of a node before its children are compared. With fewer the children's
+                                 Q values come from too few rollouts to rank them.
+        min_child_visits (int): Visits of both actions of a pair. Unvisited children have no Q value.
+        min_q_margin (float): Minimum Q(winner) - Q(loser). Rewards are 1.0 for a terminal state and -0.01 per
+                              step, so 0.1 keeps pairs where the winner reached the goal noticeably more often.
+        max_pairs_per_node (int | None): Keep only the pairs with the largest margins at each node.
+    """
+
+    min_parent_visits: int = 2
+    min_child_visits: int = 1
+    min_q_margin: float = 0.1
+    max_pairs_per_node: Optional[int] = None
+
+
+class CompactTree:
+    """
+    The visited part of an MCTS tree as flat numpy arrays, indexed in breadth-first order (the root is 0).
+
+    Attributes:
+        nodes (List[MCTSNode]): The nodes, to get back to states and actions.
+        parent (np.ndarray): Index of the parent of each node, -1 for the root.
+        q (np.ndarray): Q value of each node.
+        visits (np.ndarray): Visit count N of each node.
+        depth (np.ndarray): Depth of each node.
+    """
+
+    def __init__(self, nodes: List[MCTSNode], parent: np.ndarray):
+        self.nodes = nodes
+        self.parent = parent
+        self.q = np.fromiter(
+            (node.Q for node in nodes), dtype=np.float64, count=len(nodes)
+        )
+        self.visits = np.fromiter(
+            (node.N for node in nodes), dtype=np.int64, count=len(nodes)
+        )
+        self.depth = np.fromiter(
+            (node.depth for node in nodes), dtype=np.int64, count=len(nodes)
+        )
+
+    @classmethod
+    def from_root(cls, root: MCTSNode) -> "CompactTree":
+        nodes = [root]
+        parent = [-1]
+        index = 0
+        while index < len(nodes):
+            for child in nodes[index].children or []:
+                nodes.append(child)
+                parent.append(index)
+            index += 1
+        return cls(nodes, np.asarray(parent, dtype=np.int64))
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+
+class MinedPair(NamedTuple):
+    parent: int
+    winner: int
+    loser: int
+    margin: float
+
+
+def mine_preference_pairs(
+    tree: CompactTree, config: Optional[DPOMiningConfig] = None
+) -> List[MinedPair]:
+    """
+    Compares the sibling actions under every sufficiently visited node of the tree, not only along the best
+    trajectory, and keeps the (winner, loser) pairs whose Q margin passes the thresholds of the config.
+
+    All sibling pairs of the tree are built and filtered at once with numpy, so mining costs the same whether
+    the tree has tens or tens of thousands of nodes.
+
+    Returns:
+        List[MinedPair]: Pairs as node indices of the tree, grouped by parent and by decreasing margin.
+    """
+    config = config or DPOMiningConfig()
+    parent = tree.parent
+    eligible = np.flatnonzero((parent >= 0) & (tree.visits >= config.min_child_visits))
+    eligible = eligible[tree.visits[parent[eligible]] >= config.min_parent_visits]
+    if len(eligible) < 2:
+        return []
+
+    # siblings are contiguous once sorted by parent: build every ordered pair within each group
+    children = eligible[np.argsort(parent[eligible], kind="stable")]
+    _, group_start, group_size = np.unique(
+        parent[children], return_index=True, return_counts=True
+    )
+    size_of = np.repeat(group_size, group_size)
+    start_of = np.repeat(group_start, group_size)
+    winners = np.repeat(np.arange(len(children)), size_of)
+    first_pair = np.cumsum(size_of) - size_of
+    losers = np.repeat(start_of, size_of) + (
+        np.arange(len(winners)) - np.repeat(first_pair, size_of)
+    )
+    winners, losers = children[winners], children[losers]
+
+    margins = tree.q[winners] - tree.q[losers]
+    keep = (winners != losers) & (margins >= config.min_q_margin) & (margins > 0)
+    winners, losers, margins = winners[keep], losers[keep], margins[keep]
+    parents = parent[winners]
+
+    order = np.lexsort((-margins, parents))
+    winners, losers, margins, parents = (
+        winners[order],
+        losers[order],
+        margins[order],
+        parents[order],
+    )
+    if config.max_pairs_per_node is not None and len(parents):
+        _, pair_start, pair_count = np.unique(
+            parents, return_index=True, return_counts=True
+        )
+        rank = np.arange(len(parents)) - np.repeat(pair_start, pair_count)
+        top = rank < config.max_pairs_per_node
+        winners, losers, margins, parents = (
+            winners[top],
+            losers[top],
+            margins[top],
+            parents[top],
+        )
+
+    return [
+        MinedPair(int(p), int(w), int(lo), float(m))
+        for p, w, lo, m in zip(parents, winners, losers, margins)
+    ]
+
+
+def _dpo_action(node: MCTSNode) -> Optional[DPOAction]:
+    task = node.action.task_with_action
+    if not task.actions_to_be_performed:
+        return None
+    return DPOAction(
+        description=task.description, action=task.actions_to_be_performed[0]
+    )
+
+
+def iter_mined_dpo_pairs(
+    root: MCTSNode,
+    config: Optional[DPOMiningConfig] = None,
+    dom_chars: Optional[int] = DEFAULT_DOM_CHARS,
+) -> Iterator[DPOPair]:
+    """
+    Yields the DPO pairs mined from the whole tree under `root` (see mine_preference_pairs), with the DOM of
+    their state cut to `dom_chars` characters, or whole when None.
+    """
+    tree = CompactTree.from_root(root)
+    for mined in mine_preference_pairs(tree, config):
+        state = tree.nodes[mined.parent].state
+        winning_action = _dpo_action(tree.nodes[mined.winner])
+        losing_action = _dpo_action(tree.nodes[mined.loser])
+        if state is None or winning_action is None or losing_action is None:
+            continue
+        yield DPOPair(
+            state=DPOState(
+                dom=state.dom[:dom_chars],
+                objective=state.objective,
+            ),
+            winning_action=winning_action,
+            losing_action=losing_action,
+        )
@@ -0,0 +1,344 @@
+import hashlib
+import io
+import json
+import os
+import re
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from agentq.core.models.models import DPOPair
+from agentq.utils.logger import logger
+
+try:
+    import fcntl
+except ImportError:  # Windows, only producers within one process are synchronized
+    fcntl = None  # type: ignore
+
+# Directory of the DPO dataset written by the MCTS runs, and the compression of its shards ("zstd" or none).
+DPO_DATASET_DIR_ENV_VAR = "AGENTQ_DPO_DATASET_DIR"
+DPO_COMPRESSION_ENV_VAR = "AGENTQ_DPO_COMPRESSION"
+DEFAULT_DPO_DATASET_DIR = "dpo_dataset"
+
+_SHARD_PATTERN = re.compile(r"^(?P<prefix>.+)-(?P<number>\d{5})\.jsonl(?P<zst>\.zst)?$")
+
+
+# DOM characters kept in the prompt of a pair, unless a DPOFormat says otherwise.
+DEFAULT_DOM_CHARS = 1000
+PROMPT_FORMATS = ("text", "chat")
+
+
+@dataclass(frozen=True)
+class DPOFormat:
+    """
+    Attributes:
+        dom_chars (int | None): DOM characters kept in the prompt, None keeps the whole DOM.
+        prompt_format (str): "text" for prompt/chosen/rejected strings, or "chat" for the same content as
+                             conversations (a user message for the prompt, assistant messages for the responses).
+    """
+
+    dom_chars: Optional[int] = DEFAULT_DOM_CHARS
+    prompt_format: str = "text"
+
+    def __post_init__(self):
+        if self.prompt_format not in PROMPT_FORMATS:
+            raise ValueError(f"Unsupported DPO prompt format: {self.prompt_format}")
+
+
+def dpo_entry(pair: DPOPair, dpo_format: Optional[DPOFormat] = None) -> Dict[str, Any]:
+    """Formats a DPO pair as a prompt/chosen/rejected record, the format DPO training scripts expect."""
+    dpo_format = dpo_format or DPOFormat()
+    dom = pair.state.dom[: dpo_format.dom_chars]
+    entry = {
+        "prompt": f"Objective: {pair.state.objective}\nCurrent DOM: {dom}...",
+        "chosen": f"Action: {pair.winning_action.action.model_dump_json()}\nDescription: {pair.winning_action.description}",
+        "rejected": f"Action: {pair.losing_action.action.model_dump_json()}\nDescription: {pair.losing_action.description}",
+    }
+    if dpo_format.prompt_format == "chat":
+        return {
+            "prompt": [{"role": "user", "content": entry["prompt"]}],
+            "chosen": [{"role": "assistant", "content": entry["chosen"]}],
+            "rejected": [{"role": "assistant", "content": entry["rejected"]}],
+        }
+    return entry
+
+
+def _zstandard():
+    try:
+        import zstandard
+    except ImportError as e:
+        raise ImportError(
+            "zstd compressed DPO shards need the zstandard package: pip install zstandard"
+        ) from e
+    return zstandard
+
+
+class DPODatasetWriter:
+    """
+    Appends DPO pairs to a dataset directory as they are generated, across runs.
+
+    Pairs are written to size-bounded JSONL shards (`dpo_pairs-00000.jsonl`, `dpo_pairs-00001.jsonl`, ...),
+    optionally zstd-compressed, one zstd frame per write. A pair whose record was written before, by any run, is
+    skipped: the hashes of the written records are kept in an append-only index file (`dpo_pairs.index`) and in
+    memory. A zstd shard whose last frame was cut short by a crash is not appended to, as readers stop at that
+    frame: the next write starts a new shard.
+
+    Producers in one process share a writer (see get_dpo_writer) and are serialized by a lock. Producers in
+    other processes are serialized by a lock file, and each writer reads the hashes the others appended to the
+    index before writing.
+
+    Example:
+        writer = get_dpo_writer("dpo_dataset")
+        writer.write(dpo_pairs)
+    """
+
+    def __init__(
+        self,
+        directory: str = DEFAULT_DPO_DATASET_DIR,
+        max_shard_bytes: int = 64 * 1024 * 1024,
+        compression: Optional[str] = None,
+        prefix: str = "dpo_pairs",
+        dpo_format: Optional[DPOFormat] = None,
+    ):
+        """
+        Args:
+            directory (str, optional): The dataset directory. Defaults to "dpo_dataset".
+            max_shard_bytes (int, optional): Size on disk after which a new shard is started. Defaults to 64 MiB.
+            compression (str, optional): "zstd" to compress the shards. Defaults to None.
+            prefix (str, optional): File name prefix of the shards and the index. Defaults to "dpo_pairs".
+            dpo_format (DPOFormat, optional): DOM truncation and prompt format of the records. Defaults to the
+                                              text format with 1000 DOM characters.
+        """
+        if compression not in (None, "zstd"):
+            raise ValueError(f"Unsupported DPO shard compression: {compression}")
+        self.directory = directory
+        self.max_shard_bytes = max_shard_bytes
+        self.compression = compression
+        self.prefix = prefix
+        self.dpo_format = dpo_format or DPOFormat()
+        self.written = 0
+        self.duplicates = 0
+        self._compressor = _zstandard().ZstdCompressor(level=3) if compression else None
+        self._hashes: Set[bytes] = set()
+        self._index_path = os.path.join(directory, f"{prefix}.index")
+        self._index_offset = 0
+        # the last zstd shard appended to, and the size up to which its frames are known to be complete
+        self._complete_frames: Tuple[Optional[str], int] = (None, 0)
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def content_hash(entry: Dict[str, Any]) -> bytes:
+        canonical = json.dumps(entry, sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(canonical.encode("utf-8")).digest()[:16]
+
+    def write(self, pairs: Iterable[DPOPair]) -> int:
+        """
+        Appends the pairs that are not in the dataset yet.
+
+        Returns:
+            int: The number of pairs written.
+        """
+        return self.write_entries(dpo_entry(pair, self.dpo_format) for pair in pairs)
+
+    def write_entries(self, entries: Iterable[Dict[str, Any]]) -> int:
+        """Appends already formatted records (see dpo_entry) that are not in the dataset yet."""
+        entries = list(entries)
+        if not entries:
+            return 0
+        with self._lock, self._process_lock():
+            self._read_index()
+            lines: List[str] = []
+            new_hashes: List[bytes] = []
+            for entry in entries:
+                digest = self.content_hash(entry)
+                if digest in self._hashes or digest in new_hashes:
+                    self.duplicates += 1
+                    continue
+                new_hashes.append(digest)
+                lines.append(json.dumps(entry) + "\n")
+            if not lines:
+                return 0
+
+            data = "".join(lines).encode("utf-8")
+            if self._compressor is not None:
+                data = self._compressor.compress(data)
+            shard = self._shard_for(len(data))
+            if self._compressor is None and not _ends_with_newline(shard):
+                # keep a record cut short by a crash on its own line, readers skip it
+                data = b"\n" + data
+            # records first, then their hashes: a crash in between duplicates a pair rather than losing it
+            self._append(shard, data)
+            if self._compressor is not None:
+                self._complete_frames = (shard, os.path.getsize(shard))
+            self._append(
+                self._index_path,
+                "".join(digest.hex() + "\n" for digest in new_hashes).encode("ascii"),
+            )
+            self._index_offset = os.path.getsize(self._index_path)
+            self._hashes.update(new_hashes)
+            self.written += len(lines)
+            return len(lines)
+
+    def write_pair(self, pair: DPOPair) -> bool:
+        return self.write([pair]) == 1
+
+    @staticmethod
+    def _append(path: str, data: bytes):
+        with open(path, "ab") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+
+    @contextmanager
+    def _process_lock(self) -> Iterator[None]:
+        if fcntl is None:
+            yield
+            return
+        with open(os.path.join(self.directory, f".{self.prefix}.lock"), "a") as f:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+    def _read_index(self):
+        """Loads the hashes appended to the index since the last read, by this or another process."""
+        if not os.path.exists(self._index_path):
+            return
+        with open(self._index_path, "rb") as f:
+            f.seek(self._index_offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    # a line cut short by a crash, appending after it would corrupt the next hash
+                    f.close()
+                    os.truncate(self._index_path, self._index_offset)
+                    break
+                self._hashes.add(bytes.fromhex(line.decode("ascii").strip()))
+                self._index_offset += len(line)
+
+    def shards(self) -> List[str]:
+        """Returns the shard paths of this dataset in write order."""
+        return [path for _, path in _list_shards(self.directory, self.prefix)]
+
+    def _shard_for(self, incoming_bytes: int) -> str:
+        suffix = ".jsonl.zst" if self.compression else ".jsonl"
+        shards = _list_shards(self.directory, self.prefix)
+        number = shards[-1][0] if shards else 0
+        if shards:
+            size = os.path.getsize(shards[-1][1])
+            if not shards[-1][1].endswith(suffix) or (
+                size > 0 and size + incoming_bytes > self.max_shard_bytes
+            ):
+                number += 1
+                logger.info(f"Starting DPO shard {number} in {self.directory}")
+            elif self.compression and not self._frames_complete(shards[-1][1]):
+                # readers stop at a frame cut short by a crash, frames appended after it would be lost
+                number += 1
+                logger.warning(
+                    f"Incomplete zstd frame at the end of {shards[-1][1]}, starting DPO shard {number}"
+                )
+        return os.path.join(self.directory, f"{self.prefix}-{number:05d}{suffix}")
+
+    def _frames_complete(self, shard: str) -> bool:
+        """Checks that a zstd shard ends with a complete frame, decompressing only the frames not checked yet."""
+        checked_shard, offset = self._complete_frames
+        if checked_shard != shard or offset > os.path.getsize(shard):
+            offset = 0
+        with open(shard, "rb") as f:
+            f.seek(offset)
+            data = f.read()
+        zstandard = _zstandard()
+        decompressor = zstandard.ZstdDecompressor()
+        while data:
+            frame = decompressor.decompressobj()
+            try:
+                frame.decompress(data)
+            except zstandard.ZstdError:
+                return False
+            if not frame.eof:
+                return False
+            offset += len(data) - len(frame.unused_data)
+            data = frame.unused_data
+        self._complete_frames = (shard, offset)
+        return True
+
+
+def _ends_with_newline(path: str) -> bool:
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        return True
+    with open(path, "rb") as f:
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) == b"\n"
+
+
+def _parse_records(lines: Iterable[str], path: str) -> Iterator[Dict[str, Any]]:
+    for line in lines:
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError:
+            logger.warning(f"Skipping an incomplete DPO record in {path}")
+
+
+def _list_shards(directory: str, prefix: str) -> List[Tuple[int, str]]:
+    shards = []
+    for file_name in os.listdir(directory):
+        match = _SHARD_PATTERN.match(file_name)
+        if match and match.group("prefix") == prefix:
+            shards.append(
+                (int(match.group("number")), os.path.join(directory, file_name))
+            )
+    return sorted(shards)
+
+
+def read_dpo_dataset(
+    directory: str = DEFAULT_DPO_DATASET_DIR, prefix: str = "dpo_pairs"
+) -> Iterator[Dict[str, Any]]:
+    """
+    Yields the prompt/chosen/rejected records of a dataset, shard by shard, decompressing zstd shards. A frame
+    cut short by a crash ends its shard: the records before it are read, and reading goes on with the next shard.
+    """
+    for _, path in _list_shards(directory, prefix):
+        if path.endswith(".zst"):
+            zstandard = _zstandard()
+            with open(path, "rb") as f:
+                reader = zstandard.ZstdDecompressor().stream_reader(
+                    f, read_across_frames=True
+                )
+                try:
+                    yield from _parse_records(
+                        io.TextIOWrapper(reader, encoding="utf-8"), path
+                    )
+                except (zstandard.ZstdError, UnicodeDecodeError) as e:
+                    logger.warning(f"Skipping an incomplete zstd frame in {path}: {e}")
+        else:
+            with open(path, encoding="utf-8") as f:
+                yield from _parse_records(f, path)
+
+
+_writers: Dict[str, DPODatasetWriter] = {}
+_writers_lock = threading.Lock()
+
+
+def get_dpo_writer(directory: Optional[str] = None) -> DPODatasetWriter:
+    """
+    Returns the shared writer of a dataset directory, so concurrent sessions of this process share its lock and
+    hash index.
+
+    Args:
+        directory (str, optional): Defaults to AGENTQ_DPO_DATASET_DIR, or "dpo_dataset". Shards are
+                                   zstd-compressed when AGENTQ_DPO_COMPRESSION is "zstd".
+    """
+    directory = directory or os.getenv(DPO_DATASET_DIR_ENV_VAR, DEFAULT_DPO_DATASET_DIR)
+    key = os.path.abspath(directory)
+    with _writers_lock:
+        writer = _writers.get(key)
+        if writer is None:
+            writer = DPODatasetWriter(
+                directory, compression=os.getenv(DPO_COMPRESSION_ENV_VAR) or None
+            )
+            _writers[key] = writer
+        return writer
@@ -0,0 +1,257 @@
+import hashlib
+import json
+import os
+import time
+import uuid
+from collections import deque
+from typing import Any, Dict, Iterator, List, Optional
+
+from agentq.core.mcts.core.mcts import MCTSNode, MCTSResult
+from agentq.core.models.models import BrowserAction, BrowserState, TaskWithActions
+from agentq.utils.logger import logger
+
+# Directory the MCTS runs persist their search trees to, nothing is persisted when unset.
+MCTS_TREE_DIR_ENV_VAR = "AGENTQ_MCTS_TREE_DIR"
+
+TREE_FILE = "tree.jsonl"
+DOM_DIR = "doms"
+TREE_FORMAT_VERSION = 1
+
+
+def dom_key(dom: str) -> str:
+    return hashlib.sha256(dom.encode("utf-8")).hexdigest()[:32]
+
+
+def dom_path(tree_dir: str, key: str) -> str:
+    return os.path.join(tree_dir, DOM_DIR, f"{key}.txt")
+
+
+def _write_dom(tree_dir: str, dom: str) -> str:
+    key = dom_key(dom)
+    path = dom_path(tree_dir, key)
+    if not os.path.exists(path):  # states of a tree often share a page
+        with open(f"{path}.tmp", "w", encoding="utf-8") as f:
+            f.write(dom)
+        os.replace(f"{path}.tmp", path)
+    return key
+
+
+def iter_tree_records(result: MCTSResult, tree_dir: str) -> Iterator[Dict[str, Any]]:
+    """
+    Yields the records of a search tree breadth first: a "tree" header, then a "node" record per node, each
+    non-root node preceded by the "edge" record of the action that led to it. DOMs are written to
+    `<tree_dir>/doms/<key>.txt` and referenced by key, so the records stay small.
+    """
+    root = result.tree_state
+    trace = result.trace_of_nodes or []
+    yield {
+        "type": "tree",
+        "version": TREE_FORMAT_VERSION,
+        "objective": root.state.objective if root.state is not None else None,
+        "root": root.id,
+        "trace": [node.id for node in trace],
+        "created_at": time.time(),
+    }
+    queue = deque([root])
+    while queue:
+        node = queue.popleft()
+        if node.parent is not None:
+            yield {
+                "type": "edge",
+                "source": node.parent.id,
+                "target": node.id,
+                "action": node.action.task_with_action.model_dump(mode="json"),
+                "rank": node.action.rank,
+            }
+        yield {
+            "type": "node",
+            "id": node.id,
+            "depth": node.depth,
+            "N": node.N,
+            "Q": float(node.Q),
+            "reward": float(node.reward),
+            "is_terminal": bool(node.is_terminal),
+            "url": node.state.url if node.state is not None else None,
+            "dom": _write_dom(tree_dir, node.state.dom)
+            if node.state is not None
+            else None,
+        }
+        queue.extend(node.children or [])
+
+
+def save_mcts_tree(
+    result: MCTSResult, directory: str, tree_id: Optional[str] = None
+) -> str:
+    """
+    Persists the search tree of an MCTS run as `<directory>/<tree_id>/tree.jsonl` plus its DOMs, so DPO datasets
+    can be rebuilt from it later without a browser (see dpo_builder).
+
+    Returns:
+        str: The tree directory.
+    """
+    tree_id = tree_id or f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}"
+    tree_dir = os.path.join(directory, tree_id)
+    os.makedirs(os.path.join(tree_dir, DOM_DIR), exist_ok=True)
+    tree_path = os.path.join(tree_dir, TREE_FILE)
+    nodes = 0
+    # written aside and moved in place, so a tree file is always complete
+    with open(f"{tree_path}.tmp", "w", encoding="utf-8") as f:
+        for record in iter_tree_records(result, tree_dir):
+            f.write(json.dumps(record) + "\n")
+            nodes += record["type"] == "node"
+    os.replace(f"{tree_path}.tmp", tree_path)
+    logger.info(f"Saved MCTS tree of {nodes} nodes to {tree_dir}")
+    return tree_dir
+
+
+def _new_node(
+    node_id: Any,
+    state: Optional[BrowserState],
+    action: Optional[BrowserAction],
+    parent: Optional[MCTSNode],
+    visits: int,
+    q: float,
+    reward: float = 0.0,
+    is_terminal: bool = False,
+) -> MCTSNode:
+    node = MCTSNode(
+        state=state,
+        action=action,
+        parent=parent,
+        fast_reward=reward,
+        is_terminal=is_terminal,
+    )
+    node.id = node_id
+    node.N = visits
+    node.Q = q
+    if parent is not None:
+        if parent.children is None:
+            parent.children = []
+        parent.children.append(node)
+    return node
+
+
+def load_mcts_tree(tree_dir: str) -> MCTSNode:
+    """Rebuilds the root MCTSNode of a tree persisted by save_mcts_tree, with its states and actions."""
+    header: Dict[str, Any] = {}
+    node_records: Dict[int, Dict[str, Any]] = {}
+    edges: List[Dict[str, Any]] = []
+    with open(os.path.join(tree_dir, TREE_FILE), encoding="utf-8") as f:
+        for line in f:
+            record = json.loads(line)
+            if record["type"] == "tree":
+                header = record
+            elif record["type"] == "node":
+                node_records[record["id"]] = record
+            elif record["type"] == "edge":
+                edges.append(record)
+    if header.get("version") != TREE_FORMAT_VERSION:
+        raise ValueError(
+            f"Unsupported MCTS tree version in {tree_dir}: {header.get('version')}"
+        )
+
+    doms: Dict[str, str] = {}
+
+    def read_dom(key: str) -> str:
+        if key not in doms:
+            with open(dom_path(tree_dir, key), encoding="utf-8") as f:
+                doms[key] = f.read()
+        return doms[key]
+
+    def new_node(record, parent, task=None, rank=0.0):
+        state = None
+        if record["dom"] is not None:
+            completed_tasks = list(parent.state.completed_tasks) if parent else []
+            if task is not None:
+                completed_tasks.append(task)
+            state = BrowserState(
+                dom=read_dom(record["dom"]),
+                url=record["url"],
+                objective=header["objective"],
+                completed_tasks=completed_tasks,
+            )
+        action = (
+            BrowserAction(task_with_action=task, rank=rank)
+            if task is not None
+            else None
+        )
+        return _new_node(
+            record["id"],
+            state,
+            action,
+            parent,
+            record["N"],
+            record["Q"],
+            record["reward"],
+            record["is_terminal"],
+        )
+
+    nodes = {header["root"]: new_node(node_records[header["root"]], None)}
+    # edges come breadth first, so the source of an edge is always built already
+    for edge in edges:
+        task = TaskWithActions.model_validate(edge["action"])
+        nodes[edge["target"]] = new_node(
+            node_records[edge["target"]], nodes[edge["source"]], task, edge["rank"]
+        )
+    return nodes[header["root"]]
+
+
+def load_tree_log(path: str) -> MCTSNode:
+    """Rebuilds the root MCTSNode of the last snapshot of a TreeLog JSON file (see tree_from_log)."""
+    with open(path, encoding="utf-8") as f:
+        return tree_from_log(json.load(f))
+
+
+def tree_from_log(tree_log: Dict[str, Any]) -> MCTSNode:
+    """
+    Rebuilds the root MCTSNode of the last snapshot of a JSON-encoded TreeLog (see TreeLog.from_mcts_results).
+
+    Tree logs have no actions: the action of a node is the last completed task of its state, so unvisited
+    nodes are left out. Logs written before edges recorded visit counts count one visit per visited node,
+    and at least the visits of its children for an inner node.
+    """
+    snapshot = tree_log["logs"][-1]
+    node_data = {
+        int(node_id): node["data"] for node_id, node in snapshot["nodes"].items()
+    }
+    children: Dict[int, List[Dict[str, Any]]] = {}
+    targets = set()
+    for edge in snapshot["edges"].values():
+        children.setdefault(int(edge["source"]), []).append(edge)
+        targets.add(int(edge["target"]))
+    root_id = next(node_id for node_id in node_data if node_id not in targets)
+
+    def state_of(data: Dict[str, Any]) -> Optional[BrowserState]:
+        if not data.get("dom"):
+            return None
+        return BrowserState.model_validate(
+            {key: data[key] for key in BrowserState.model_fields if key in data}
+        )
+
+    def visits_of(node: MCTSNode, logged: Optional[int]) -> int:
+        if logged is not None:
+            return logged
+        return max(1, sum(child.N for child in node.children or []))
+
+    def build(node_id: int, parent: Optional[MCTSNode], edge_data) -> MCTSNode:
+        state = state_of(node_data[node_id])
+        action = None
+        if state is not None and state.completed_tasks and parent is not None:
+            action = BrowserAction(task_with_action=state.completed_tasks[-1], rank=0.0)
+        node = _new_node(
+            node_id,
+            state,
+            action,
+            parent,
+            0,
+            edge_data.get("Q", 0.0),
+            edge_data.get("reward", 0.0),
+        )
+        for edge in children.get(node_id, []):
+            target = int(edge["target"])
+            if state_of(node_data[target]) is not None:
+                build(target, node, edge["data"])
+        node.N = visits_of(node, edge_data.get("N"))
+        return node
+
+    return build(root_id, None, {})
@@ -1,19 +1,41 @@
 def main():
     import argparse
+    import os
 
-    from agentq.core.mcts.visualization import VisualizerClient
+    from agentq.core.mcts.core.mcts import MCTSResult
+    from agentq.core.mcts.tree_store import TREE_FILE, load_tree_log
+    from agentq.core.mcts.visualization.local_visualizer import export_tree, serve_tree
 
-    parser = argparse.ArgumentParser()
-    parser.add_argument("tree_log", type=str)
-    parser.add_argument("--base_url", type=str)
+    parser = argparse.ArgumentParser(
+        description="View an MCTS tree locally: a tree directory (AGENTQ_MCTS_TREE_DIR) or a TreeLog JSON file."
+    )
+    parser.add_argument("tree", type=str)
+    parser.add_argument("--port", type=int, default=0)
+    parser.add_argument("--no_browser", action="store_true")
+    parser.add_argument(
+        "--out",
+        type=str,
+        help="Directory to export a tree log to (default: mcts_trees)",
+    )
     args = parser.parse_args()
 
-    if args.base_url is None:
-        client = VisualizerClient()
-    else:
-        client = VisualizerClient(args.base_url)
+    tree_dir = args.tree
+    if os.path.isfile(tree_dir) and os.path.basename(tree_dir) == TREE_FILE:
+        tree_dir = os.path.dirname(tree_dir) or "."
+    elif os.path.isfile(tree_dir):
+        root = load_tree_log(tree_dir)
+        tree_dir = export_tree(
+            MCTSResult(
+                terminal_state=None,
+                cum_reward=None,
+                trace=None,
+                trace_of_nodes=None,
+                tree_state=root,
+            ),
+            args.out,
+        )
+    serve_tree(tree_dir, port=args.port, open_browser=not args.no_browser)
 
-    with open(args.tree_log) as f:
-        data = f.read()
-    result = client.post_log(data)
-    print(result.access_url)
+
+if __name__ == "__main__":
+    main()
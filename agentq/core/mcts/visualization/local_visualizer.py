@@ -0,0 +1,118 @@
+import functools
+import json
+import os
+import shutil
+import threading
+import webbrowser
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional, Tuple, Union
+
+from agentq.core.mcts.core.mcts import MCTSResult
+from agentq.core.mcts.tree_store import (
+    MCTS_TREE_DIR_ENV_VAR,
+    save_mcts_tree,
+    tree_from_log,
+)
+from agentq.core.mcts.visualization.tree_log import TreeLog, TreeLogEncoder
+from agentq.utils.logger import logger
+
+DEFAULT_VISUALIZATION_DIR = "mcts_trees"
+VIEWER_FILE = "index.html"
+_VIEWER_TEMPLATE = os.path.join(os.path.dirname(__file__), "viewer.html")
+
+
+def write_viewer(tree_dir: str) -> str:
+    """Copies the static viewer next to the tree.jsonl of a tree directory, and returns its path."""
+    path = os.path.join(tree_dir, VIEWER_FILE)
+    shutil.copyfile(_VIEWER_TEMPLATE, path)
+    return path
+
+
+def export_tree(
+    result: Union[MCTSResult, TreeLog],
+    directory: Optional[str] = None,
+    tree_id: Optional[str] = None,
+) -> str:
+    """
+    Writes a search tree and the viewer to `<directory>/<tree_id>/`. The tree is streamed to tree.jsonl as node
+    and edge records, with the DOMs stored once in doms/ and referenced by key (see save_mcts_tree), so the
+    viewer loads the tree structure first and a DOM only when it is opened.
+
+    Args:
+        result (MCTSResult | TreeLog): The search result, or a tree log (its last snapshot, visited nodes only).
+        directory (str, optional): Defaults to AGENTQ_MCTS_TREE_DIR, or "mcts_trees".
+        tree_id (str, optional): Defaults to a timestamped id.
+
+    Returns:
+        str: The tree directory, to pass to serve_tree.
+    """
+    if isinstance(result, TreeLog):
+        root = tree_from_log(json.loads(json.dumps(result, cls=TreeLogEncoder)))
+        result = MCTSResult(
+            terminal_state=None,
+            cum_reward=None,
+            trace=None,
+            trace_of_nodes=None,
+            tree_state=root,
+        )
+    directory = directory or os.getenv(MCTS_TREE_DIR_ENV_VAR, DEFAULT_VISUALIZATION_DIR)
+    tree_dir = save_mcts_tree(result, directory, tree_id)
+    write_viewer(tree_dir)
+    return tree_dir
+
+
+class _QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        logger.debug("Visualizer: " + format, *args)
+
+
+def _tree_server(
+    tree_dir: str, host: str, port: int
+) -> Tuple[ThreadingHTTPServer, str]:
+    if not os.path.exists(os.path.join(tree_dir, VIEWER_FILE)):
+        write_viewer(tree_dir)
+    handler = functools.partial(_QuietHandler, directory=tree_dir)
+    server = ThreadingHTTPServer((host, port), handler)
+    return server, f"http://{host}:{server.server_address[1]}/{VIEWER_FILE}"
+
+
+def start_tree_server(
+    tree_dir: str, host: str = "127.0.0.1", port: int = 0
+) -> Tuple[ThreadingHTTPServer, str]:
+    """
+    Serves a tree directory on localhost from a daemon thread and returns right away, so it can be called from
+    a running event loop. The server stops with the process, or with server.shutdown().
+
+    Returns:
+        Tuple[ThreadingHTTPServer, str]: The server and the URL of the viewer.
+    """
+    server, url = _tree_server(tree_dir, host, port)
+    threading.Thread(
+        target=server.serve_forever, name="mcts-visualizer", daemon=True
+    ).start()
+    logger.info(f"Serving the MCTS tree viewer at {url}")
+    return server, url
+
+
+def serve_tree(
+    tree_dir: str, host: str = "127.0.0.1", port: int = 0, open_browser: bool = True
+):
+    """
+    Serves a tree directory on localhost until interrupted. Browsers do not let a page opened from disk fetch
+    files next to it, so the viewer needs this tiny server rather than a file:// URL.
+
+    Args:
+        tree_dir (str): A tree directory (see export_tree).
+        host (str, optional): Defaults to localhost only.
+        port (int, optional): Defaults to a free port.
+        open_browser (bool, optional): Open the viewer in the default browser. Defaults to True.
+    """
+    server, url = _tree_server(tree_dir, host, port)
+    with server:
+        logger.info(f"Serving the MCTS tree viewer at {url}")
+        if open_browser:
+            webbrowser.open(url)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
@@ -80,7 +80,12 @@ class TreeLog:
             return NodeData(state_dict)
 
         def default_edge_data_factory(n: MCTSNode) -> EdgeData:
-            edge_data = {"Q": n.Q, "reward": n.reward, **get_reward_details(n)}
+            edge_data = {
+                "Q": n.Q,
+                "N": n.N,
+                "reward": n.reward,
+                **get_reward_details(n),
+            }
 
             # Add color information to the edge data
             edge_data["color"] = "brown"
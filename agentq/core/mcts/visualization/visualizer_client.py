@@ -1,12 +1,19 @@
 import dataclasses
 import json
+import os
 import webbrowser
 from typing import Optional, Union
 
 import requests
 
 from agentq.core.mcts.core.mcts import MCTSResult
+from agentq.core.mcts.visualization.local_visualizer import (
+    VIEWER_FILE,
+    export_tree,
+    start_tree_server,
+)
 from agentq.core.mcts.visualization.tree_log import TreeLog, TreeLogEncoder
+from agentq.utils.logger import logger
 
 _API_DEFAULT_BASE_URL = "https://2wz3t0av30.execute-api.us-west-1.amazonaws.com/staging"
 _VISUALIZER_DEFAULT_BASE_URL = "https://www.llm-reasoners.net"
@@ -49,17 +56,41 @@ def present_visualizer(receipt: VisualizerClient.TreeLogReceipt):
     webbrowser.open(receipt.access_url)
 
 
-def visualize(result: Union[TreeLog, MCTSResult], **kwargs):
-    tree_log: TreeLog
-
-    if isinstance(result, TreeLog):
-        tree_log = result
-    elif isinstance(result, MCTSResult):
-        tree_log = TreeLog.from_mcts_results(result, **kwargs)
-    else:
+def visualize(
+    result: Union[TreeLog, MCTSResult],
+    directory: Optional[str] = None,
+    serve: bool = False,
+    open_browser: bool = True,
+    **kwargs,
+) -> str:
+    """
+    Exports the tree locally with its viewer (see local_visualizer). Nothing is uploaded; use
+    VisualizerClient().post_log explicitly for the hosted visualizer.
+
+    Args:
+        result (TreeLog | MCTSResult): The search result or tree log to view.
+        directory (str, optional): Defaults to AGENTQ_MCTS_TREE_DIR, or "mcts_trees".
+        serve (bool, optional): Also serve the viewer on localhost, from a daemon thread so the caller's event
+                                loop keeps running. Defaults to False.
+        open_browser (bool, optional): Open the served viewer in the default browser. Defaults to True.
+        **kwargs: The node_data_factory and edge_data_factory of TreeLog.from_mcts_results, accepted for
+                  existing callers and ignored: the local viewer shows the whole node.
+
+    Returns:
+        str: The path of the viewer's index.html, or its URL when served. Open it with
+             `python -m agentq.core.mcts.visualization <tree directory>`.
+    """
+    if not isinstance(result, (TreeLog, MCTSResult)):
         raise TypeError(f"Unsupported result type: {type(result)}")
-
-    receipt = VisualizerClient().post_log(tree_log)
-
-    if receipt is not None:
-        present_visualizer(receipt)
+    if kwargs:
+        logger.warning(
+            f"visualize ignores {sorted(kwargs)}, the local viewer shows the whole node"
+        )
+
+    tree_dir = export_tree(result, directory)
+    if not serve:
+        return os.path.join(tree_dir, VIEWER_FILE)
+    _, url = start_tree_server(tree_dir)
+    if open_browser:
+        webbrowser.open(url)
+    return url
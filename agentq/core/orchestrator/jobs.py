@@ -0,0 +1,213 @@
+import asyncio
+import time
+import uuid
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from agentq.core.orchestrator.session_pool import AgentSession, SessionPool
+from agentq.utils.logger import logger
+from agentq.utils.progress import progress_listener
+
+
+class JobKind(str, Enum):
+    EXECUTE = "execute"
+    MCTS = "mcts"
+
+
+class JobStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+class JobQueueFullError(Exception):
+    """Raised when a job is submitted while the queue already holds `max_queued` jobs."""
+
+
+@dataclass
+class Job:
+    """
+    A long-running objective executed in the background.
+
+    Attributes:
+        events (List[Dict[str, Any]]): Progress events in order: each completed task, MCTS iteration and DPO pair,
+                                       followed by a final "job_finished" event.
+    """
+
+    kind: JobKind
+    goal: str
+    job_id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    status: JobStatus = JobStatus.QUEUED
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    result: Any = None
+    error: Optional[str] = None
+    events: List[Dict[str, Any]] = field(default_factory=list)
+    _changed: asyncio.Event = field(default_factory=asyncio.Event, repr=False)
+
+    @property
+    def done(self) -> bool:
+        return self.status in (JobStatus.SUCCEEDED, JobStatus.FAILED)
+
+    def add_event(self, event: Dict[str, Any]):
+        self.events.append(event)
+        # wake up every stream waiting for this job, then re-arm for the next event
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    def to_dict(self, events_after: Optional[int] = None) -> Dict[str, Any]:
+        job_dict = {
+            "job_id": self.job_id,
+            "kind": self.kind.value,
+            "goal": self.goal,
+            "status": self.status.value,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "result": self.result,
+            "error": self.error,
+            "event_count": len(self.events),
+        }
+        if events_after is not None:
+            job_dict["events"] = self.events[events_after:]
+        return job_dict
+
+
+class JobManager:
+    """
+    Runs objectives as background jobs on a SessionPool.
+
+    `submit` returns immediately with a queued Job. One worker per pool session pulls jobs from an in-process
+    asyncio queue and runs them with a progress listener bound, so clients can poll the job or stream its events
+    with `stream_events` instead of holding a connection (and a worker) until the objective finishes.
+
+    Example:
+        jobs = JobManager(pool)
+        await jobs.start()
+        job = jobs.submit(JobKind.EXECUTE, "search for shoes")
+        async for event in jobs.stream_events(job.job_id):
+            print(event)
+    """
+
+    def __init__(
+        self, pool: SessionPool, max_queued: int = 100, keep_finished: int = 1000
+    ):
+        """
+        Args:
+            pool (SessionPool): The pool of warm sessions the jobs run on.
+            max_queued (int, optional): Maximum number of queued jobs before `submit` rejects new ones. Defaults to 100.
+            keep_finished (int, optional): Number of finished jobs kept for polling, oldest are dropped first. Defaults to 1000.
+        """
+        self.pool = pool
+        self.max_queued = max_queued
+        self.keep_finished = keep_finished
+        self._jobs: Dict[str, Job] = {}
+        self._finished: List[str] = []
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+
+    async def start(self):
+        if self._queue is not None:
+            return
+        await self.pool.start()
+        self._queue = asyncio.Queue(maxsize=self.max_queued)
+        self._workers = [
+            asyncio.create_task(self._worker(worker_id))
+            for worker_id in range(self.pool.size)
+        ]
+
+    async def stop(self):
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._queue = None
+
+    def submit(self, kind: JobKind, goal: str) -> Job:
+        if self._queue is None:
+            raise RuntimeError("JobManager.start() must be awaited before submit()")
+        job = Job(kind=kind, goal=goal)
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            raise JobQueueFullError(
+                f"{self._queue.qsize()} jobs are already queued"
+            ) from None
+        self._jobs[job.job_id] = job
+        logger.info(f"Queued {kind.value} job {job.job_id}: {goal}")
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    async def stream_events(
+        self, job_id: str, after: int = 0
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yields the job's progress events from index `after` on, waiting for new ones until the job has finished.
+        """
+        job = self._jobs[job_id]
+        index = after
+        while True:
+            changed = job._changed
+            while index < len(job.events):
+                yield job.events[index]
+                index += 1
+            if job.done:
+                return
+            await changed.wait()
+
+    async def _worker(self, worker_id: int):
+        while True:
+            job: Job = await self._queue.get()  # type: ignore
+            try:
+                # jobs are admitted by the queue, so direct requests filling the pool's waiting line must
+                # not fail them
+                async with self.pool.acquire(limit_waiting=False) as session:
+                    await self._run(job, session)
+            except Exception as e:
+                # failures before the job started, e.g. the pool was stopped
+                logger.error(f"Worker {worker_id} could not run job {job.job_id}: {e}")
+                self._finish(job, JobStatus.FAILED, error=str(e))
+            finally:
+                self._queue.task_done()  # type: ignore
+
+    async def _run(self, job: Job, session: AgentSession):
+        job.status = JobStatus.RUNNING
+        job.started_at = time.time()
+        job.add_event({"event": "job_started", "time": job.started_at})
+        try:
+            with progress_listener(job.add_event):
+                if job.kind == JobKind.MCTS:
+                    dpo_pairs = await session.run_mcts(job.goal)
+                    result = [pair.model_dump(mode="json") for pair in dpo_pairs]
+                else:
+                    result = await session.run_command(job.goal)
+        except Exception as e:
+            logger.error(f"Job {job.job_id} failed: {e}")
+            self._finish(job, JobStatus.FAILED, error=str(e))
+        else:
+            self._finish(job, JobStatus.SUCCEEDED, result=result)
+
+    def _finish(
+        self,
+        job: Job,
+        status: JobStatus,
+        result: Any = None,
+        error: Optional[str] = None,
+    ):
+        if job.done:
+            return
+        job.status = status
+        job.result = result
+        job.error = error
+        job.finished_at = time.time()
+        job.add_event(
+            {"event": "job_finished", "time": job.finished_at, "status": status.value}
+        )
+        self._finished.append(job.job_id)
+        while len(self._finished) > self.keep_finished:
+            self._jobs.pop(self._finished.pop(0), None)
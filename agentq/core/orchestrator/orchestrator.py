@@ -1,11 +1,12 @@
 import asyncio
+import logging
 import textwrap
 import uuid
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 from colorama import Fore, init
 from dotenv import load_dotenv
-from langsmith import traceable
+from playwright.async_api import Page
 
 from agentq.core.agent.base import BaseAgent
 from agentq.core.models.models import (
@@ -26,6 +27,7 @@ from agentq.core.models.models import (
     Task,
     TaskWithActions,
 )
+from agentq.core.skills.batch_actions import batch_entertext, group_batchable_actions
 from agentq.core.skills.click_using_selector import click
 from agentq.core.skills.enter_text_and_click import enter_text_and_click
 from agentq.core.skills.enter_text_using_selector import EnterTextEntry, entertext
@@ -35,26 +37,42 @@ from agentq.core.skills.get_url import geturl
 from agentq.core.skills.open_url import openurl
 from agentq.core.skills.solve_captcha import solve_captcha
 from agentq.core.web_driver.playwright import PlaywrightManager
+from agentq.utils.debug_artifacts import artifact_session
+from agentq.utils.langsmith_tracing import traceable
+from agentq.utils.logger import console, logger
+from agentq.utils.progress import report_progress
+from agentq.utils.tracing import tracer
 
 init(autoreset=True)
 
 
 class Orchestrator:
     def __init__(
-        self, state_to_agent_map: Dict[State, BaseAgent], eval_mode: bool = False
+        self,
+        state_to_agent_map: Dict[State, BaseAgent],
+        eval_mode: bool = False,
+        page: Optional[Page] = None,
     ):
+        """
+        Args:
+            state_to_agent_map (Dict[State, BaseAgent]): The agent handling each state.
+            eval_mode (bool, optional): Run commands without the interactive loop and return the final response. Defaults to False.
+            page (Page, optional): A tab this orchestrator works on exclusively, so several orchestrators can share the browser concurrently.
+                                   Defaults to None, i.e. the last opened tab.
+        """
         load_dotenv()
         self.state_to_agent_map = state_to_agent_map
         self.playwright_manager = PlaywrightManager()
+        self.page = page
         self.eval_mode = eval_mode
         self.shutdown_event = asyncio.Event()
         self.session_id = str(uuid.uuid4())
         self.memory = None
 
     async def start(self):
-        print("Starting orchestrator")
+        console.info("Starting orchestrator")
         await self.playwright_manager.async_initialize(eval_mode=self.eval_mode)
-        print("Browser started and ready")
+        console.info("Browser started and ready")
 
         if not self.eval_mode:
             await self._command_loop()
@@ -70,7 +88,7 @@ class Orchestrator:
             except asyncio.CancelledError:
                 break
             except Exception as e:
-                print(f"An error occurred: {e}")
+                console.error("An error occurred: %s", e)
 
     async def _get_user_input(self):
         return await asyncio.get_event_loop().run_in_executor(
@@ -79,6 +97,13 @@ class Orchestrator:
 
     @traceable(run_type="chain", name="execute_command")
     async def execute_command(self, command: str):
+        with artifact_session(self.session_id):
+            if self.page is not None:
+                with self.playwright_manager.use_page(self.page):
+                    return await self._execute_command(command)
+            return await self._execute_command(command)
+
+    async def _execute_command(self, command: str):
         try:
             # Create initial memory
             self.memory = Memory(
@@ -99,7 +124,7 @@ class Orchestrator:
             # Get the current event loop
             loop = asyncio.get_event_loop()
 
-            print(f"Executing command {self.memory.objective}")
+            console.info("Executing command %s", self.memory.objective)
             while self.memory.current_state != State.COMPLETED:
                 await loop.create_task(self._handle_state())
             self._print_final_response()
@@ -109,7 +134,9 @@ class Orchestrator:
             else:
                 return
         except Exception as e:
-            print(f"Error executing the command {self.memory.objective}: {e}")
+            console.error(
+                "Error executing the command %s: %s", self.memory.objective, e
+            )
 
     def run(self) -> Memory:
         while self.memory.current_state != State.COMPLETED:
@@ -124,6 +151,10 @@ class Orchestrator:
         if current_state not in self.state_to_agent_map:
             raise ValueError(f"Unhandled state! No agent for {current_state}")
 
+        with tracer.span("orchestrator.turn", state=current_state.value):
+            await self._dispatch_state(current_state)
+
+    async def _dispatch_state(self, current_state: State):
         if current_state == State.PLAN:
             await self._handle_planner()
         elif current_state == State.BROWSE:
@@ -155,7 +186,7 @@ class Orchestrator:
 
         self._update_memory_from_planner(output)
 
-        print(f"{Fore.MAGENTA}Planner has updated the memory.")
+        console.debug(Fore.MAGENTA + "Planner has updated the memory.")
 
     async def _handle_browser_navigation(self):
         agent = self.state_to_agent_map[State.BROWSE]
@@ -175,7 +206,7 @@ class Orchestrator:
 
         self._update_memory_from_browser_nav(output)
 
-        print(f"{Fore.MAGENTA}Executor has completed a task.")
+        console.debug(Fore.MAGENTA + "Executor has completed a task.")
 
     async def _handle_agentq_base(self):
         agent = self.state_to_agent_map[State.AGENTQ_BASE]
@@ -209,17 +240,19 @@ class Orchestrator:
 
                 await self._update_memory_from_agentq_base(output)
 
-                print(f"{Fore.MAGENTA}Base Agent Q has updated the memory.")
+                console.debug(Fore.MAGENTA + "Base Agent Q has updated the memory.")
                 break  # If successful, break out of the retry loop
 
             except Exception as e:
-                print(f"{Fore.YELLOW}An error occurred: {e}")
+                console.warning("%sAn error occurred: %s", Fore.YELLOW, e)
                 if attempt < max_retries - 1:
-                    print(f"{Fore.YELLOW}Retrying in {retry_delay} seconds...")
+                    console.warning(
+                        "%sRetrying in %s seconds...", Fore.YELLOW, retry_delay
+                    )
                     await asyncio.sleep(retry_delay)
                 else:
-                    print(
-                        f"{Fore.RED}Max retries reached. Unable to complete the action."
+                    console.error(
+                        Fore.RED + "Max retries reached. Unable to complete the action."
                     )
                     raise
 
@@ -248,7 +281,7 @@ class Orchestrator:
 
         await self._update_memory_from_agentq_actor(output)
 
-        print(f"{Fore.MAGENTA}Base Agent Q has updated the memory.")
+        console.debug(Fore.MAGENTA + "Base Agent Q has updated the memory.")
 
     async def _handle_agnetq_critic(self, tasks_for_eval: List[TaskWithActions]):
         agent = self.state_to_agent_map[State.AGENTQ_CRITIC]
@@ -265,7 +298,7 @@ class Orchestrator:
             dom = await get_dom_with_content_type(content_type="all_fields")
             url = await geturl()
 
-            print(f"{Fore.GREEN}Critic agent has been called")
+            console.debug(Fore.GREEN + "Critic agent has been called")
 
             input_data = AgentQCriticInput(
                 objective=self.memory.objective,
@@ -287,8 +320,11 @@ class Orchestrator:
             if task_to_remove:
                 remaining_tasks.remove(task_to_remove)
             else:
-                print(
-                    f"{Fore.RED}Warning: Top task not found in remaining tasks. Skipping. {top_task} && {remaining_tasks}"
+                console.warning(
+                    "%sTop task not found in remaining tasks. Skipping. %s && %s",
+                    Fore.RED,
+                    top_task,
+                    remaining_tasks,
                 )
 
         # Add the last remaining task
@@ -297,7 +333,7 @@ class Orchestrator:
 
         await self._update_memory_from_agentq_critic(sorted_tasks)
 
-        print(f"{Fore.MAGENTA}Critic Agent has sorted all the tasks.")
+        console.debug(Fore.MAGENTA + "Critic Agent has sorted all the tasks.")
 
     def _update_memory_from_planner(self, planner_output: PlannerOutput):
         if planner_output.is_complete:
@@ -317,8 +353,12 @@ class Orchestrator:
         else:
             raise ValueError("Planner did not provide next task or completion status")
 
+    def _complete_task(self, task):
+        self.memory.completed_tasks.append(task)
+        report_progress("task_completed", task=task.model_dump(mode="json"))
+
     def _update_memory_from_browser_nav(self, browser_nav_output: BrowserNavOutput):
-        self.memory.completed_tasks.append(browser_nav_output.completed_task)
+        self._complete_task(browser_nav_output.completed_task)
         self.memory.current_task = None
         self.memory.current_state = State.PLAN
 
@@ -332,13 +372,13 @@ class Orchestrator:
                 action_results = await self.handle_agentq_actions(
                     agentq_output.next_task_actions
                 )
-                print("Action results:", action_results)
+                logger.debug("Action results: %s", action_results)
                 flattened_results = "; ".join(action_results)
                 agentq_output.next_task.result = flattened_results
             else:
                 agentq_output.next_task.result = "No actions were called. Call actions next time or use the provided DOM to get the information you need"
 
-            self.memory.completed_tasks.append(agentq_output.next_task)
+            self._complete_task(agentq_output.next_task)
             self.memory.plan = agentq_output.plan
             self.memory.thought = agentq_output.thought
             current_task_id = len(self.memory.completed_tasks) + 1
@@ -371,13 +411,13 @@ class Orchestrator:
         action_results = await self.handle_agentq_actions(
             top_task.actions_to_be_performed
         )
-        print("Action results:", action_results)
+        logger.debug("Action results: %s", action_results)
         flattened_results = "; ".join(action_results)
 
         top_task.id = len(self.memory.completed_tasks) + 1
         top_task.result = flattened_results
 
-        self.memory.completed_tasks.append(top_task)
+        self._complete_task(top_task)
 
         # Make proposed and sorted tasks empty
         self.memory.current_tasks_for_eval = None
@@ -388,7 +428,11 @@ class Orchestrator:
 
     async def handle_agentq_actions(self, actions: List[Action]):
         results = []
-        for action in actions:
+        for group in group_batchable_actions(actions):
+            if len(group) > 1:
+                results.extend(await self._execute_type_batch(group))
+                continue
+            action = group[0]
             page = await self.playwright_manager.get_current_page()
             max_retries = 3
             retry_delay = 2
@@ -399,21 +443,24 @@ class Orchestrator:
                         result = await openurl(
                             url=action.website, timeout=action.timeout or 1
                         )
-                        await page.wait_for_load_state("networkidle", timeout=10000)
-                        print("Action - GOTO")
+                        readiness = await self.playwright_manager.get_page_readiness(
+                            page
+                        )
+                        await readiness.wait_for_network_idle(timeout=10)
+                        logger.debug("Action - GOTO")
                     elif action.type == ActionType.TYPE:
                         entry = EnterTextEntry(
                             query_selector=f"[mmid='{action.mmid}']",
                             text=action.content,
                         )
                         result = await entertext(entry)
-                        print("Action - TYPE")
+                        logger.debug("Action - TYPE")
                     elif action.type == ActionType.CLICK:
                         result = await click(
                             selector=f"[mmid='{action.mmid}']",
                             wait_before_execution=action.wait_before_execution or 1,
                         )
-                        print("Action - CLICK")
+                        logger.debug("Action - CLICK")
                     elif action.type == ActionType.ENTER_TEXT_AND_CLICK:
                         result = await enter_text_and_click(
                             text_selector=f"[mmid='{action.text_element_mmid}']",
@@ -422,7 +469,7 @@ class Orchestrator:
                             wait_before_click_execution=action.wait_before_click_execution
                             or 1.5,
                         )
-                        print("Action - ENTER TEXT AND CLICK")
+                        logger.debug("Action - ENTER TEXT AND CLICK")
                     elif action.type == ActionType.SOLVE_CAPTCHA:
                         result = await solve_captcha(
                             text_selector=f"[mmid='{action.text_element_mmid}']",
@@ -436,60 +483,95 @@ class Orchestrator:
                     results.append(result)
                     break  # If successful, break out of the retry loop
                 except Exception as e:
-                    print(f"Error during action {action.type}: {e}")
+                    console.warning("Error during action %s: %s", action.type, e)
                     if attempt < max_retries - 1:
-                        print(f"Retrying in {retry_delay} seconds...")
+                        console.warning("Retrying in %s seconds...", retry_delay)
                         await asyncio.sleep(retry_delay)
                     else:
-                        print(f"Max retries reached. Skipping action: {action.type}")
+                        console.error(
+                            "Max retries reached. Skipping action: %s", action.type
+                        )
                         results.append(f"Failed to execute action: {action.type}")
 
         return results
 
+    async def _execute_type_batch(self, actions: List[Action]) -> List[str]:
+        entries = [
+            EnterTextEntry(
+                query_selector=f"[mmid='{action.mmid}']", text=action.content
+            )
+            for action in actions
+        ]
+        try:
+            results = await batch_entertext(entries)
+            logger.debug("Action - TYPE x%d (batched)", len(actions))
+            return results
+        except Exception as e:
+            # fall back to entering the texts one by one, e.g. if the page navigated mid-batch
+            console.warning(
+                "Error during batched TYPE actions, retrying one by one: %s", e
+            )
+            results = []
+            for action in actions:
+                results.extend(await self.handle_agentq_actions([action]))
+            return results
+
     async def shutdown(self):
-        print("Shutting down orchestrator!")
+        console.info("Shutting down orchestrator!")
         self.shutdown_event.set()
         await self.playwright_manager.stop_playwright()
 
     def _print_memory_and_agent(self, agent_type: str):
-        print(f"{Fore.CYAN}{'='*50}")
-        print(f"{Fore.YELLOW}Current State: {Fore.GREEN}{self.memory.current_state}")
-        print(f"{Fore.YELLOW}Agent: {Fore.GREEN}{agent_type}")
-        print(f"{Fore.YELLOW}Current Thought: {Fore.GREEN}{self.memory.thought}")
+        # printed on every step, so the panel is only built when console debug output is enabled
+        if not console.isEnabledFor(logging.DEBUG):
+            return
+        lines = [f"{Fore.CYAN}{'='*50}"]
+        lines.append(
+            f"{Fore.YELLOW}Current State: {Fore.GREEN}{self.memory.current_state}"
+        )
+        lines.append(f"{Fore.YELLOW}Agent: {Fore.GREEN}{agent_type}")
+        lines.append(f"{Fore.YELLOW}Current Thought: {Fore.GREEN}{self.memory.thought}")
         if len(self.memory.plan) == 0:
-            print(f"{Fore.YELLOW}Plan:{Fore.GREEN} none")
+            lines.append(f"{Fore.YELLOW}Plan:{Fore.GREEN} none")
         else:
-            print(f"{Fore.YELLOW}Plan:")
+            lines.append(f"{Fore.YELLOW}Plan:")
             for task in self.memory.plan:
-                print(f"{Fore.GREEN} {task.id}. {task.description}")
+                lines.append(f"{Fore.GREEN} {task.id}. {task.description}")
         if self.memory.current_task:
-            print(
+            lines.append(
                 f"{Fore.YELLOW}Current Task: {Fore.GREEN}{self.memory.current_task.description}"
             )
         if len(self.memory.completed_tasks) == 0:
-            print(f"{Fore.YELLOW}Completed Tasks:{Fore.GREEN} none")
+            lines.append(f"{Fore.YELLOW}Completed Tasks:{Fore.GREEN} none")
         else:
-            print(f"{Fore.YELLOW}Completed Tasks:")
+            lines.append(f"{Fore.YELLOW}Completed Tasks:")
             for task in self.memory.completed_tasks:
                 status = "✓" if task.result else " "
-                print(f"{Fore.GREEN}  [{status}] {task.id}. {task.description}")
-        print(f"{Fore.CYAN}{'='*50}")
+                lines.append(f"{Fore.GREEN}  [{status}] {task.id}. {task.description}")
+        lines.append(f"{Fore.CYAN}{'='*50}")
+        console.debug("\n".join(lines))
 
     def _print_task_result(self, task: Task):
-        print(f"{Fore.CYAN}{'='*50}")
-        print(f"{Fore.YELLOW}Task Completed: {Fore.GREEN}{task.description}")
-        print(f"{Fore.YELLOW}Result:")
+        if not console.isEnabledFor(logging.INFO):
+            return
+        lines = [f"{Fore.CYAN}{'='*50}"]
+        lines.append(f"{Fore.YELLOW}Task Completed: {Fore.GREEN}{task.description}")
+        lines.append(f"{Fore.YELLOW}Result:")
         wrapped_result = textwrap.wrap(task.result, width=80)
         for line in wrapped_result:
-            print(f"{Fore.WHITE}{line}")
-        print(f"{Fore.CYAN}{'='*50}")
+            lines.append(f"{Fore.WHITE}{line}")
+        lines.append(f"{Fore.CYAN}{'='*50}")
+        console.info("\n".join(lines))
 
     def _print_final_response(self):
-        print(f"\n{Fore.GREEN}{'='*50}")
-        print(f"{Fore.GREEN}Objective Completed!")
-        print(f"{Fore.GREEN}{'='*50}")
-        print(f"{Fore.YELLOW}Final Response:")
+        if not console.isEnabledFor(logging.INFO):
+            return
+        lines = [f"\n{Fore.GREEN}{'='*50}"]
+        lines.append(f"{Fore.GREEN}Objective Completed!")
+        lines.append(f"{Fore.GREEN}{'='*50}")
+        lines.append(f"{Fore.YELLOW}Final Response:")
         wrapped_response = textwrap.wrap(self.memory.final_response, width=80)
         for line in wrapped_response:
-            print(f"{Fore.WHITE}{line}")
-        print(f"{Fore.GREEN}{'='*50}")
+            lines.append(f"{Fore.WHITE}{line}")
+        lines.append(f"{Fore.GREEN}{'='*50}")
+        console.info("\n".join(lines))
@@ -0,0 +1,190 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, List, Optional
+
+from playwright.async_api import Page
+
+from agentq.core.agent.agentq import AgentQ
+from agentq.core.agent.agentq_actor import AgentQActor
+from agentq.core.agent.agentq_critic import AgentQCritic
+from agentq.core.agent.base import BaseAgent
+from agentq.core.agent.browser_nav_agent import BrowserNavAgent
+from agentq.core.agent.planner_agent import PlannerAgent
+from agentq.core.agent.vision_agent import VisionAgent
+from agentq.core.mcts.browser_mcts import run_mcts_search
+from agentq.core.models.models import DPOPair, State
+from agentq.core.orchestrator.orchestrator import Orchestrator
+from agentq.core.web_driver.playwright import PlaywrightManager
+from agentq.utils.debug_artifacts import artifact_session
+from agentq.utils.logger import logger
+
+
+def create_state_to_agent_map() -> Dict[State, BaseAgent]:
+    # agents keep the messages of the run in progress, so every concurrent session needs its own instances
+    return {
+        State.PLAN: PlannerAgent(),
+        State.BROWSE: BrowserNavAgent(),
+        State.AGENTQ_BASE: AgentQ(),
+        State.AGENTQ_ACTOR: AgentQActor(),
+        State.AGENTQ_CRITIC: AgentQCritic(),
+    }
+
+
+class PoolFullError(Exception):
+    """Raised when a session pool rejects a request because too many requests are already waiting."""
+
+
+class AgentSession:
+    """
+    A warm agent session: its own tab of the shared browser, an Orchestrator bound to that tab
+    and the agents used by both the orchestrator and MCTS, all constructed ahead of the first request.
+    """
+
+    def __init__(self, session_id: int, page: Page, homepage: str):
+        self.session_id = session_id
+        self.page = page
+        self.homepage = homepage
+        self.state_to_agent_map = create_state_to_agent_map()
+        self.orchestrator = Orchestrator(
+            state_to_agent_map=self.state_to_agent_map, eval_mode=True, page=page
+        )
+        self.vision = VisionAgent()
+
+    async def reset(self):
+        """Navigates the session's tab back to the homepage."""
+        await self.page.goto(
+            self.homepage, wait_until="domcontentloaded", timeout=30000
+        )
+
+    async def run_command(self, command: str):
+        await self.reset()
+        return await self.orchestrator.execute_command(command)
+
+    async def run_mcts(self, objective: str, **search_kwargs) -> List[DPOPair]:
+        await self.reset()
+        with PlaywrightManager().use_page(self.page), artifact_session(
+            f"mcts_session_{self.session_id}"
+        ):
+            return await run_mcts_search(
+                objective,
+                actor=self.state_to_agent_map[State.AGENTQ_ACTOR],
+                critic=self.state_to_agent_map[State.AGENTQ_CRITIC],
+                vision=self.vision,
+                **search_kwargs,
+            )
+
+
+class SessionPool:
+    """
+    A fixed number of pre-warmed agent sessions sharing one browser, with admission control.
+
+    The browser is started and every session's tab and agents are created once in `start`, so a request only
+    waits for a free session instead of a browser launch, homepage navigation and agent construction.
+    Requests wait in FIFO order for a free session. Once `max_waiting` requests are waiting, further requests
+    are rejected with PoolFullError instead of piling up.
+
+    Example:
+        pool = SessionPool(size=2, homepage="http://localhost:3000/abc")
+        await pool.start()
+        async with pool.acquire() as session:
+            result = await session.run_command("search for shoes")
+    """
+
+    def __init__(
+        self,
+        size: int = 2,
+        homepage: str = "https://google.com",
+        max_waiting: int = 16,
+        eval_mode: bool = True,
+    ):
+        """
+        Args:
+            size (int, optional): Number of concurrent sessions. Defaults to 2.
+            homepage (str, optional): Page every session starts a request from. Defaults to "https://google.com".
+            max_waiting (int, optional): Maximum number of requests waiting for a session before new ones are rejected. Defaults to 16.
+            eval_mode (bool, optional): Start the browser with a temporary profile. Defaults to True.
+        """
+        self.size = size
+        self.homepage = homepage
+        self.max_waiting = max_waiting
+        self.eval_mode = eval_mode
+        self.playwright_manager = PlaywrightManager()
+        self._sessions: List[AgentSession] = []
+        self._idle: Optional[asyncio.Queue] = None
+        self._waiting = 0
+        self._served = 0
+
+    async def start(self):
+        if self._idle is not None:
+            return
+        start = time.monotonic()
+        await self.playwright_manager.async_initialize(
+            eval_mode=self.eval_mode, homepage=self.homepage
+        )
+        browser_context = await self.playwright_manager.get_browser_context()
+        self._idle = asyncio.Queue()
+        for session_id in range(self.size):
+            page = await browser_context.new_page()  # type: ignore
+            await self.playwright_manager.get_page_readiness(page)
+            await page.set_extra_http_headers({"User-Agent": "AgentQ-Bot"})
+            session = AgentSession(session_id, page, self.homepage)
+            await session.reset()
+            self._sessions.append(session)
+            self._idle.put_nowait(session)
+        logger.info(
+            f"Session pool warmed up {self.size} sessions in {time.monotonic() - start:.2f}s"
+        )
+
+    async def stop(self):
+        for session in self._sessions:
+            if not session.page.is_closed():
+                await session.page.close()
+        self._sessions = []
+        self._idle = None
+        await self.playwright_manager.stop_playwright()
+
+    @asynccontextmanager
+    async def acquire(
+        self, timeout: Optional[float] = None, limit_waiting: bool = True
+    ) -> AsyncIterator[AgentSession]:
+        """
+        Waits for a free session and returns it to the pool afterwards.
+
+        Args:
+            timeout (float, optional): Maximum wait for a free session in seconds. Defaults to None (no limit).
+            limit_waiting (bool, optional): Reject the request when `max_waiting` requests are already waiting.
+                                            Callers with their own admission control, like the JobManager
+                                            workers, pass False to wait in line regardless. Defaults to True.
+
+        Raises:
+            PoolFullError: If `max_waiting` requests are already waiting.
+            asyncio.TimeoutError: If no session became free within `timeout`.
+        """
+        if self._idle is None:
+            raise RuntimeError("SessionPool.start() must be awaited before acquire()")
+        if limit_waiting and self._idle.empty() and self._waiting >= self.max_waiting:
+            raise PoolFullError(
+                f"All {self.size} sessions are busy and {self._waiting} requests are waiting"
+            )
+        self._waiting += 1
+        try:
+            session: AgentSession = await asyncio.wait_for(self._idle.get(), timeout)
+        finally:
+            self._waiting -= 1
+        try:
+            yield session
+        finally:
+            self._served += 1
+            self._idle.put_nowait(session)
+
+    def stats(self) -> Dict[str, int]:
+        idle = self._idle.qsize() if self._idle is not None else 0
+        return {
+            "size": self.size,
+            "idle": idle,
+            "busy": len(self._sessions) - idle,
+            "waiting": self._waiting,
+            "max_waiting": self.max_waiting,
+            "served": self._served,
+        }
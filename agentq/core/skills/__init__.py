@@ -1,3 +1,4 @@
+from agentq.core.skills.batch_actions import batch_entertext, group_batchable_actions
 from agentq.core.skills.click_using_selector import (
     click,
     do_click,
@@ -10,6 +11,7 @@ from agentq.core.skills.enter_text_using_selector import (
     bulk_enter_text,
     custom_fill_element,
     do_entertext,
+    needs_key_events,
 )
 from agentq.core.skills.get_dom_with_content_type import get_dom_with_content_type
 from agentq.core.skills.get_url import geturl
@@ -19,6 +21,8 @@ from agentq.core.skills.press_key_combination import press_key_combination
 from agentq.core.skills.solve_captcha import solve_captcha
 
 __all__ = (
+    batch_entertext,
+    group_batchable_actions,
     click,
     do_click,
     is_element_present,
@@ -28,6 +32,7 @@ __all__ = (
     bulk_enter_text,
     custom_fill_element,
     do_entertext,
+    needs_key_events,
     get_dom_with_content_type,
     geturl,
     get_user_input,
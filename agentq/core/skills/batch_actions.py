@@ -0,0 +1,198 @@
+import inspect
+from typing import List
+
+from agentq.core.models.models import ActionType
+from agentq.core.skills.enter_text_using_selector import (
+    NEEDS_KEY_EVENTS_JS,
+    EnterTextEntry,
+    entertext,
+)
+from agentq.core.web_driver.element_registry import ATTRIBUTES_OF_INTEREST
+from agentq.core.web_driver.playwright import PlaywrightManager
+from agentq.utils.dom_mutation_observer import subscribe, unsubscribe
+from agentq.utils.logger import logger
+from agentq.utils.tracing import traced
+
+# Fills the entries in one round-trip. Values are set through the native setter of the element's prototype
+# so frameworks that track the value (React, Vue) see the change, followed by the input and change events
+# that keyboard typing would fire. Returns, per entry, either an error or the element's opening tag. Stops at
+# the first field that reacts to individual key events (see needs_key_events), which is returned as
+# {needs_key_events: true} and left unfilled: the synthetic events would not run its suggestions or validation.
+BATCH_FILL_JS = """
+([entries, attributesOfInterest]) => {
+    const needsKeyEvents = NEEDS_KEY_EVENTS_JS;
+    const openingTag = (element) => {
+        let tag = `<${element.tagName.toLowerCase()}`;
+        for (const attr of attributesOfInterest) {
+            const value = element.getAttribute(attr);
+            if (value) {
+                tag += ` ${attr}="${value}"`;
+            }
+        }
+        return tag + '>';
+    };
+    const fill = ({selector, text}) => {
+        let element;
+        try {
+            element = document.querySelector(selector);
+        } catch (e) {
+            return {error: `Error entering text in selector ${selector}. Error: ${e.message}`};
+        }
+        if (!element) {
+            return {error: `Error: Selector ${selector} not found. Unable to continue.`};
+        }
+        if (needsKeyEvents(element)) {
+            return {needs_key_events: true};
+        }
+        try {
+            const outerHtml = openingTag(element);
+            element.focus();
+            if (element.isContentEditable) {
+                element.textContent = text;
+            } else {
+                const prototype = Object.getPrototypeOf(element);
+                const setter = Object.getOwnPropertyDescriptor(prototype, 'value')?.set;
+                if (setter) {
+                    setter.call(element, text);
+                } else {
+                    element.value = text;
+                }
+            }
+            element.dispatchEvent(new Event('input', {bubbles: true}));
+            element.dispatchEvent(new Event('change', {bubbles: true}));
+            return {outer_html: outerHtml};
+        } catch (e) {
+            return {error: `Error entering text in selector ${selector}. Error: ${e.message}`};
+        }
+    };
+    const outcomes = [];
+    for (const entry of entries) {
+        const outcome = fill(entry);
+        outcomes.push(outcome);
+        if (outcome.needs_key_events) {
+            break;
+        }
+    }
+    return outcomes;
+}
+""".replace("NEEDS_KEY_EVENTS_JS", NEEDS_KEY_EVENTS_JS.strip())
+
+
+def group_batchable_actions(actions: List) -> List[List]:
+    """
+    Splits a list of actions into consecutive groups that can be executed together.
+
+    Consecutive TYPE actions never navigate, so they are grouped and executed by `batch_entertext`.
+    Every other action (GOTO, CLICK, ENTER_TEXT_AND_CLICK, ...) may navigate and forms a group on its own.
+
+    Args:
+        actions (List[Action]): The actions proposed by the agent, in order.
+
+    Returns:
+        List[List[Action]]: The actions split into groups, preserving order.
+    """
+    groups: List[List] = []
+    for action in actions:
+        if (
+            action.type == ActionType.TYPE
+            and groups
+            and groups[-1][0].type == ActionType.TYPE
+        ):
+            groups[-1].append(action)
+        else:
+            groups.append([action])
+    return groups
+
+
+@traced("skill.batch_entertext")
+async def batch_entertext(entries: List[EnterTextEntry]) -> List[str]:
+    """
+    Enters text into several DOM elements in a single page script, with a single settle wait at the end.
+
+    This is the batched counterpart of `entertext` for form filling: selectors are resolved, values set and
+    input/change events dispatched in one `page.evaluate`, instead of one round of selector resolution,
+    highlighting, screenshots and waits per field. Fields that react to individual key events (autocompletes,
+    comboboxes, key handlers) end the batch: they are typed with `entertext` and the batch resumes after them.
+
+    Args:
+        entries (List[EnterTextEntry]): The selectors (using the mmid attribute) and texts to enter, in order.
+
+    Returns:
+        List[str]: One result per entry, in the same format `entertext` returns.
+
+    Example:
+        results = await batch_entertext([
+            EnterTextEntry(query_selector="[mmid='12']", text="Jane"),
+            EnterTextEntry(query_selector="[mmid='13']", text="Doe"),
+        ])
+    """
+    logger.info(f"Entering text in {len(entries)} elements in one batch")
+
+    browser_manager = PlaywrightManager()
+    page = await browser_manager.get_current_page()
+    if page is None:  # type: ignore
+        return [
+            "Error: No active page found. OpenURL command opens a new page."
+            for _ in entries
+        ]
+
+    function_name = inspect.currentframe().f_code.co_name  # type: ignore
+    await browser_manager.take_screenshots(f"{function_name}_start", page)
+
+    dom_changes_detected = None
+
+    def detect_dom_changes(changes: str):  # type: ignore
+        nonlocal dom_changes_detected
+        dom_changes_detected = changes  # type: ignore
+
+    results: List[str] = []
+    index = 0
+    while index < len(entries):
+        subscribe(detect_dom_changes, page)
+        try:
+            outcomes = await page.evaluate(
+                BATCH_FILL_JS,
+                [
+                    [
+                        {"selector": entry.query_selector, "text": entry.text}
+                        for entry in entries[index:]
+                    ],
+                    ATTRIBUTES_OF_INTEREST,
+                ],
+            )
+            filled = [
+                outcome for outcome in outcomes if not outcome.get("needs_key_events")
+            ]
+            if filled:
+                # one wait for the fields filled together, this also allows the mutation observer to detect changes
+                await browser_manager.wait_for_page_settle(
+                    page, action="batch_entertext"
+                )
+        finally:
+            unsubscribe(detect_dom_changes, page)
+
+        for entry, outcome in zip(entries[index:], filled):
+            if "error" in outcome:
+                logger.error(outcome["error"])
+                results.append(outcome["error"])
+                continue
+            success_msg = f'Success. Text "{entry.text}" set successfully in the element with selector {entry.query_selector}'
+            logger.info(success_msg)
+            results.append(f"{success_msg} and outer HTML: {outcome['outer_html']}.")
+        index += len(filled)
+        if dom_changes_detected and filled:
+            results[-1] = (
+                f"{results[-1]}.\n As a consequence of this action, new elements have appeared in view: {dom_changes_detected}. This means that the action of entering text {entries[index - 1].text} is not yet executed and needs further interaction. Get all_fields DOM to complete the interaction."
+            )
+            dom_changes_detected = None
+
+        if len(filled) < len(outcomes):
+            # typed key by key, so the field's autocomplete and validation handlers run
+            logger.info(
+                f"Selector {entries[index].query_selector} reacts to key events, typing it outside the batch"
+            )
+            results.append(await entertext(entries[index]))
+            index += 1
+
+    await browser_manager.take_screenshots(f"{function_name}_end", page)
+    return results
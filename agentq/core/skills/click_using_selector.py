@@ -4,7 +4,6 @@ import traceback
 from typing import Dict
 
 from playwright.async_api import ElementHandle, Page
-from playwright.async_api import TimeoutError as PlaywrightTimeoutError
 from typing_extensions import Annotated
 
 from agentq.core.web_driver.playwright import PlaywrightManager
@@ -13,8 +12,10 @@ from agentq.utils.dom_mutation_observer import (
     unsubscribe,  # type: ignore
 )
 from agentq.utils.logger import logger
+from agentq.utils.tracing import traced
 
 
+@traced("skill.click")
 async def click(
     selector: Annotated[
         str,
@@ -58,25 +59,21 @@ async def click(
         nonlocal dom_changes_detected
         dom_changes_detected = changes
 
-    subscribe(detect_dom_changes)
+    subscribe(detect_dom_changes, page)
+
+    readiness = await browser_manager.get_page_readiness(page)
+    generation_before_click = readiness.generation
 
     # Wrap the click action and subsequent operations in a try-except block
     try:
-        # Set up navigation expectation with a shorter timeout
-        async with page.expect_navigation(wait_until="domcontentloaded", timeout=10000):
-            result = await do_click(page, selector, wait_before_execution)
-
-        # Wait for a short time to ensure the page has settled
-        await asyncio.sleep(1)
-    except PlaywrightTimeoutError:
-        # If navigation times out, it might be a single-page app or a slow-loading page
-        logger.warning(
-            "Navigation timeout occurred, but the click might have been successful."
-        )
-        result = {
-            "summary_message": "Click executed, but no full page navigation detected",
-            "detailed_message": "Click executed successfully, but no full page navigation was detected. This might be normal for single-page applications or slow-loading pages.",
-        }
+        result = await do_click(page, selector, wait_before_execution)
+        # Wait until a navigation, if any, has loaded and the page has settled. This also gives the mutation observer time to detect changes
+        await browser_manager.wait_for_page_settle(page, timeout=10, action="click")
+        if readiness.generation == generation_before_click:
+            # It might be a single-page app, or the click only changed part of the page
+            result["detailed_message"] += (
+                " No full page navigation was detected. This might be normal for single-page applications."
+            )
     except Exception as e:
         logger.error(f"Error during click operation: {e}")
         result = {
@@ -84,10 +81,7 @@ async def click(
             "detailed_message": f"Click executed, but encountered an error: {str(e)}",
         }
 
-    await asyncio.sleep(
-        0.1
-    )  # sleep for 100ms to allow the mutation observer to detect changes
-    unsubscribe(detect_dom_changes)
+    unsubscribe(detect_dom_changes, page)
     await browser_manager.take_screenshots(f"{function_name}_end", page)
 
     if dom_changes_detected:
@@ -104,7 +98,7 @@ async def do_click(
     Parameters:
     - page: The Playwright page instance.
     - selector: The query selector string to identify the element for the click action.
-    - wait_before_execution: Optional wait time in seconds before executing the click event logic.
+    - wait_before_execution: Optional upper bound in seconds to wait for the page to settle before executing the click event logic.
 
     Returns:
     Dict[str,str] - Explanation of the outcome of this operation represented as a dictionary with 'summary_message' and 'detailed_message'.
@@ -113,9 +107,13 @@ async def do_click(
         f'Executing ClickElement with "{selector}" as the selector. Wait time before execution: {wait_before_execution} seconds.'
     )
 
-    # Wait before execution if specified
+    browser_manager = PlaywrightManager()
+
+    # Wait before execution if specified, returning early once the page has settled
     if wait_before_execution > 0:
-        await asyncio.sleep(wait_before_execution)
+        await browser_manager.wait_for_page_settle(
+            page, timeout=wait_before_execution, action="before_click"
+        )
 
     # Wait for the selector to be present and ensure it's attached and visible. If timeout, try javascript click
     try:
@@ -123,10 +121,13 @@ async def do_click(
             f'Executing ClickElement with "{selector}" as the selector. Waiting for the element to be attached and visible.'
         )
 
-        element = await asyncio.wait_for(
-            page.wait_for_selector(selector, state="attached", timeout=2000),
-            timeout=2000,
-        )
+        # elements captured during DOM extraction skip the selector resolution
+        element = await browser_manager.get_registered_element(selector, page)
+        if element is None:
+            element = await asyncio.wait_for(
+                page.wait_for_selector(selector, state="attached", timeout=2000),
+                timeout=2000,
+            )
         if element is None:
             raise ValueError(f'Element with selector: "{selector}" not found')
 
@@ -151,9 +152,13 @@ async def do_click(
             # If the element is not visible, try to click it anyway
             pass
 
-        element_tag_name = await element.evaluate(
-            "element => element.tagName.toLowerCase()"
-        )
+        registered = await browser_manager.lookup_registered_element(selector, page)
+        if registered is not None:
+            element_tag_name = registered.tag_name
+        else:
+            element_tag_name = await element.evaluate(
+                "element => element.tagName.toLowerCase()"
+            )
 
         if element_tag_name == "option":
             element_value = await element.get_attribute(
@@ -1,4 +1,3 @@
-import asyncio
 import inspect
 
 from typing_extensions import Annotated
@@ -8,8 +7,10 @@ from agentq.core.skills.click_using_selector import do_click
 from agentq.core.skills.enter_text_using_selector import do_entertext
 from agentq.core.skills.press_key_combination import do_press_key_combination
 from agentq.utils.logger import logger
+from agentq.utils.tracing import traced
 
 
+@traced("skill.enter_text_and_click")
 async def enter_text_and_click(
     text_selector: Annotated[
         str,
@@ -106,9 +107,8 @@ async def enter_text_and_click(
         result["detailed_message"] += f' {do_click_result["detailed_message"]}'
         # await browser_manager.notify_user(do_click_result["summary_message"])
 
-    await asyncio.sleep(
-        0.1
-    )  # sleep for 100ms to allow the mutation observer to detect changes
+    # wait for the page to settle, this also allows the mutation observer to detect changes
+    await browser_manager.wait_for_page_settle(page, action="enter_text_and_click")
 
     await browser_manager.take_screenshots(f"{function_name}_end", page)
 
@@ -1,4 +1,3 @@
-import asyncio
 import inspect
 import traceback
 from dataclasses import dataclass
@@ -7,14 +6,14 @@ from typing import (
     List,  # noqa: UP035
 )
 
-from playwright.async_api import Page
+from playwright.async_api import ElementHandle, Page
 from typing_extensions import Annotated
 
 from agentq.core.web_driver.playwright import PlaywrightManager
-from agentq.core.skills.press_key_combination import press_key_combination
 from agentq.utils.dom_helper import get_element_outer_html
 from agentq.utils.dom_mutation_observer import subscribe, unsubscribe
 from agentq.utils.logger import logger
+from agentq.utils.tracing import traced
 
 
 @dataclass
@@ -84,6 +83,7 @@ async def custom_fill_element(page: Page, selector: str, text_to_enter: str):
         raise
 
 
+@traced("skill.entertext")
 async def entertext(
     entry: Annotated[
         EnterTextEntry,
@@ -158,7 +158,7 @@ async def entertext(
         nonlocal dom_changes_detected
         dom_changes_detected = changes  # type: ignore
 
-    subscribe(detect_dom_changes)
+    subscribe(detect_dom_changes, page)
 
     # Clear existing text before entering new text
     # await page.evaluate(f"document.querySelector('{query_selector}').value = '';")
@@ -183,10 +183,9 @@ async def entertext(
     # )
     result = await do_entertext(page, query_selector, text_to_enter)
     # logger.info(f"#########do_entertext returned: {result}")
-    await asyncio.sleep(
-        0.1
-    )  # sleep for 100ms to allow the mutation observer to detect changes
-    unsubscribe(detect_dom_changes)
+    # wait for the page to settle, this also allows the mutation observer to detect changes
+    await browser_manager.wait_for_page_settle(page, action="entertext")
+    unsubscribe(detect_dom_changes, page)
 
     await browser_manager.take_screenshots(f"{function_name}_end", page)
 
@@ -195,6 +194,48 @@ async def entertext(
     return result["detailed_message"]
 
 
+# Guesses whether a field reacts to individual key events (see needs_key_events). Shared with the batched fill,
+# which leaves such fields to be typed key by key.
+NEEDS_KEY_EVENTS_JS = """
+(element) => {
+    const fillableTags = ['INPUT', 'TEXTAREA'];
+    if (!fillableTags.includes(element.tagName) && !element.isContentEditable) {
+        return true;
+    }
+    const role = (element.getAttribute('role') || '').toLowerCase();
+    const autocomplete = (element.getAttribute('aria-autocomplete') || '').toLowerCase();
+    if (role === 'combobox' || (autocomplete && autocomplete !== 'none')) {
+        return true;
+    }
+    if (element.hasAttribute('list') || element.hasAttribute('aria-haspopup')) {
+        return true;
+    }
+    return ['onkeydown', 'onkeyup', 'onkeypress'].some((handler) => element.hasAttribute(handler));
+}
+"""
+
+
+async def needs_key_events(element: ElementHandle) -> bool:
+    """
+    Guesses whether a field reacts to individual key events, in which case the text has to be typed key by key.
+
+    Autocomplete widgets (comboboxes, fields bound to a datalist or with a popup) and fields with inline
+    key handlers usually listen to keydown/keyup. Plain inputs, textareas and contenteditable elements only
+    need the input event, which Playwright's 'fill' fires after inserting the whole text at once.
+
+    Args:
+        element (ElementHandle): The field to enter text in.
+
+    Returns:
+        bool: True if the text should be typed key by key.
+    """
+    try:
+        return await element.evaluate(NEEDS_KEY_EVENTS_JS)
+    except Exception as e:
+        logger.debug(f"Could not inspect field, typing key by key: {e}")
+        return True
+
+
 async def do_entertext(
     page: Page, selector: str, text_to_enter: str, use_keyboard_fill: bool = True
 ):
@@ -219,29 +260,38 @@ async def do_entertext(
         result = await do_entertext(page, '#username', 'test_user')
 
     Note:
-        - The 'use_keyboard_fill' parameter determines whether to simulate keyboard typing or not.
-        - If 'use_keyboard_fill' is set to True, the function uses the 'page.keyboard.type' method to enter the text.
+        - The 'use_keyboard_fill' parameter determines whether to simulate keyboard input or not.
+        - If 'use_keyboard_fill' is set to True, the function uses Playwright's 'fill' to enter the text at once, or types it
+          key by key with 'page.keyboard.type' when the field likely reacts to individual key events (see 'needs_key_events').
         - If 'use_keyboard_fill' is set to False, the function uses the 'custom_fill_element' method to enter the text.
     """
     try:
-        elem = await page.query_selector(selector)
+        browser_manager = PlaywrightManager()
+        # elements captured during DOM extraction skip the selector resolution and attribute lookups
+        elem = await browser_manager.get_registered_element(selector, page)
+        if elem is None:
+            elem = await page.query_selector(selector)
 
         if elem is None:
             error = f"Error: Selector {selector} not found. Unable to continue."
             return {"summary_message": error, "detailed_message": error}
 
         # logger.info(f"######### Found selector {selector} to enter text")
-        element_outer_html = await get_element_outer_html(elem, page)
+        registered = await browser_manager.lookup_registered_element(selector, page)
+        if registered is not None:
+            element_outer_html = registered.opening_tag
+        else:
+            element_outer_html = await get_element_outer_html(elem, page)
 
-        if use_keyboard_fill:
+        if use_keyboard_fill and not await needs_key_events(elem):
+            # fill clears the field and inserts the whole text at once, firing the input event
+            logger.debug(f"Filling element with selector {selector}")
+            await elem.fill(text_to_enter)
+        elif use_keyboard_fill:
             await elem.focus()
-            await asyncio.sleep(0.1)
-            await press_key_combination("Control+A")
-            await asyncio.sleep(0.1)
-            await press_key_combination("Backspace")
-            await asyncio.sleep(0.1)
-            logger.debug(f"Focused element with selector {selector} to enter text")
-            # add a 100ms delay
+            await page.keyboard.press("Control+A")
+            await page.keyboard.press("Backspace")
+            logger.debug(f"Focused element with selector {selector} to type text")
             await page.keyboard.type(text_to_enter, delay=1)
         else:
             await custom_fill_element(page, selector, text_to_enter)
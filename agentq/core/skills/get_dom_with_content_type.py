@@ -1,17 +1,18 @@
-import os
 import time
 from typing import Any, Dict, Optional, Union
 
 from playwright.async_api import Page
 from typing_extensions import Annotated
 
-from agentq.config.config import SOURCE_LOG_FOLDER_PATH
 from agentq.core.web_driver.playwright import PlaywrightManager
+from agentq.utils.debug_artifacts import debug_artifacts
 from agentq.utils.dom_helper import wait_for_non_loading_dom_state
 from agentq.utils.get_detailed_accessibility_tree import do_get_accessibility_info
 from agentq.utils.logger import logger
+from agentq.utils.tracing import traced
 
 
+@traced("dom.extract")
 async def get_dom_with_content_type(
     content_type: Annotated[
         str,
@@ -78,12 +79,7 @@ async def get_dom_with_content_type(
         # Extract text from the body or the highest-level element
         logger.debug("Fetching DOM for text_only")
         text_content = await get_filtered_text_content(page)
-        with open(
-            os.path.join(SOURCE_LOG_FOLDER_PATH, "text_only_dom.txt"),
-            "w",
-            encoding="utf-8",
-        ) as f:
-            f.write(text_content)
+        debug_artifacts.write("text_only_dom.txt", text_content)
         extracted_data = text_content
         user_success_message = "Fetched the text content of the DOM"
     else:
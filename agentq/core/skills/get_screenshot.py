@@ -1,12 +1,12 @@
-import base64
-
 from typing_extensions import Annotated, Optional
 
 from agentq.core.web_driver.playwright import PlaywrightManager
 from agentq.utils.logger import logger
+from agentq.utils.tracing import traced
 from playwright.async_api import Page
 
 
+@traced("screenshot")
 async def get_screenshot(
         webpage: Optional[Page] = None
 ) -> (
@@ -17,8 +17,11 @@ async def get_screenshot(
     """
     Captures and returns a base64 encoded screenshot of the current page (only the visible viewport and not the full page)
 
+    The format, quality and maximum size come from the screenshot service (AGENTQ_SCREENSHOT_* environment
+    variables, JPEG downscaled to 1024px by default), and an unchanged page is not captured twice, see ScreenshotService.
+
     Returns:
-    - Base64 encoded string of the screenshot image.
+    - Base64 encoded data URL of the screenshot image.
     """
 
     try:
@@ -34,16 +37,13 @@ async def get_screenshot(
             logger.info("No active page found. OpenURL command opens a new page.")
             raise ValueError("No active page found. OpenURL command opens a new page.")
 
-        await page.wait_for_load_state("domcontentloaded")
+        await browser_manager.wait_for_page_ready(page)
 
-        # Capture the screenshot
+        # Capture the screenshot, already base64 encoded
         logger.info("about to capture")
-        screenshot_bytes = await page.screenshot(full_page=False)
-
-        # Encode the screenshot as base64
-        base64_screenshot = base64.b64encode(screenshot_bytes).decode("utf-8")
+        screenshot = await browser_manager.capture_screenshot(page)
 
-        return f"data:image/png;base64,{base64_screenshot}"
+        return screenshot.data_url
 
     except Exception as e:
         raise ValueError(
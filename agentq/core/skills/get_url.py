@@ -27,7 +27,7 @@ async def geturl(
         if not page:
             raise ValueError("No active page found. OpenURL command opens a new page.")
 
-        await page.wait_for_load_state("domcontentloaded")
+        await browser_manager.wait_for_page_ready(page)
 
         # Get the URL of the current page
         try:
@@ -6,8 +6,10 @@ from typing_extensions import Annotated
 
 from agentq.core.web_driver.playwright import PlaywrightManager
 from agentq.utils.logger import logger
+from agentq.utils.tracing import traced
 
 
+@traced("skill.openurl")
 async def openurl(
     url: Annotated[
         str,
@@ -48,10 +50,11 @@ async def openurl(
                 url, timeout=max(30000, timeout * 1000), wait_until="domcontentloaded"
             )
 
-            # Wait for network idle to ensure page is fully loaded
-            await page.wait_for_load_state(
-                "networkidle", timeout=max(30000, timeout * 1000)
-            )
+            # Wait for network idle to ensure page is fully loaded. Pages that never go idle (polling, analytics)
+            # are usable once the DOM is loaded, so this is not treated as a failed navigation.
+            readiness = await browser_manager.get_page_readiness(page)
+            if not await readiness.wait_for_network_idle(timeout=max(30, timeout)):
+                logger.warning(f"Network did not go idle after loading {url}")
 
             await browser_manager.take_screenshots(f"{function_name}_end", page)
 
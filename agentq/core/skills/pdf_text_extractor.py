@@ -4,7 +4,7 @@ import httpx
 import pdfplumber
 from typing_extensions import Annotated
 
-from agentq.config.config import PROJECT_TEMP_PATH
+from agentq.config.config import PROJECT_TEMP_PATH, ensure_directory
 from agentq.core.web_driver.playwright import PlaywrightManager
 from agentq.utils.logger import logger
 from agentq.utils.message_type import MessageType
@@ -19,7 +19,7 @@ async def extract_text_from_pdf(
     returns: str - All the text found in the PDF.
     """
     file_path = os.path.join(
-        PROJECT_TEMP_PATH, "downloaded_file.pdf"
+        ensure_directory(PROJECT_TEMP_PATH), "downloaded_file.pdf"
     )  # fixed file path for downloading the PDF
 
     try:
@@ -1,4 +1,3 @@
-import asyncio
 import inspect
 
 from playwright.async_api import Page  # type: ignore
@@ -49,7 +48,7 @@ async def press_key_combination(
         nonlocal dom_changes_detected
         dom_changes_detected = changes  # type: ignore
 
-    subscribe(detect_dom_changes)
+    subscribe(detect_dom_changes, page)
     # If it's a combination, hold down the modifier keys
     for key in keys[:-1]:  # All keys except the last one are considered modifier keys
         await page.keyboard.down(key)
@@ -60,10 +59,9 @@ async def press_key_combination(
     # Release the modifier keys
     for key in keys[:-1]:
         await page.keyboard.up(key)
-    await asyncio.sleep(
-        0.1
-    )  # sleep for 100ms to allow the mutation observer to detect changes
-    unsubscribe(detect_dom_changes)
+    # wait for the page to settle, this also allows the mutation observer to detect changes
+    await browser_manager.wait_for_page_settle(page, action="press_key_combination")
+    unsubscribe(detect_dom_changes, page)
 
     if dom_changes_detected:
         return f"Key {key_combination} executed successfully.\n As a consequence of this action, new elements have appeared in view:{dom_changes_detected}. This means that the action is not yet executed and needs further interaction. Get all_fields DOM to complete the interaction."
@@ -24,7 +24,6 @@ async def upload_file(
     logger.info(
         f"Uploading file onto the page from {file_path} using selector {selector}"
     )
-    print("naman-selector")
     # print(label)
     # label = "Add File"
     browser_manager = PlaywrightManager(browser_type="chromium", headless=False)
@@ -33,10 +32,14 @@ async def upload_file(
     if not page:
         raise ValueError("No active page found. OpenURL command opens a new page")
 
-    await page.wait_for_load_state("domcontentloaded")
+    await browser_manager.wait_for_page_ready(page)
 
     try:
-        await page.locator(selector).set_input_files(file_path)
+        element = await browser_manager.get_registered_element(selector, page)
+        if element is not None:
+            await element.set_input_files(file_path)
+        else:
+            await page.locator(selector).set_input_files(file_path)
         # await page.get_by_label(label).set_input_files(file_path)
         logger.info(
             "File upload was successful. I can confirm it. Please proceed ahead with next step."
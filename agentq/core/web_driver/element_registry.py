@@ -0,0 +1,191 @@
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set
+
+from playwright.async_api import ElementHandle, JSHandle, Page
+
+from agentq.utils.logger import logger
+
+# Attributes reported back to the agents when describing an element, see get_element_outer_html
+ATTRIBUTES_OF_INTEREST: List[str] = [
+    "id",
+    "name",
+    "aria-label",
+    "placeholder",
+    "href",
+    "src",
+    "aria-autocomplete",
+    "role",
+    "type",
+    "data-testid",
+    "value",
+    "selected",
+    "aria-labelledby",
+    "aria-describedby",
+    "aria-haspopup",
+]
+
+# Elements the agents act on. Other elements keep their mmid but are resolved through the selector.
+INTERACTIVE_ELEMENTS_SELECTOR = (
+    "input, textarea, select, option, button, a, label, summary, "
+    "[role], [contenteditable], [onclick], [tabindex]"
+)
+
+MMID_SELECTOR_PATTERN = re.compile(r"""^\[mmid=['"]?(\d+)['"]?\]$""")
+
+COLLECT_ELEMENTS_JS = """
+([selector, attributes]) => {
+    const elements = Array.from(document.querySelectorAll(selector)).filter((element) => element.hasAttribute('mmid'));
+    const infos = elements.map((element) => {
+        const values = {};
+        for (const attr of attributes) {
+            const value = element.getAttribute(attr);
+            if (value) {
+                values[attr] = value;
+            }
+        }
+        return {mmid: element.getAttribute('mmid'), tag: element.tagName.toLowerCase(), attributes: values};
+    });
+    return {elements, infos};
+}
+"""
+
+
+@dataclass
+class RegisteredElement:
+    """
+    An element captured during DOM extraction.
+
+    Attributes:
+        mmid (str): The mmid injected during extraction.
+        tag_name (str): Lower-case tag name.
+        attributes (Dict[str, str]): The non-empty ATTRIBUTES_OF_INTEREST of the element at extraction time.
+        index (int): Position of the element in the page-side element array.
+    """
+
+    mmid: str
+    tag_name: str
+    attributes: Dict[str, str] = field(default_factory=dict)
+    index: int = 0
+
+    @property
+    def opening_tag(self) -> str:
+        opening_tag = f"<{self.tag_name}"
+        for attr in ATTRIBUTES_OF_INTEREST:
+            value = self.attributes.get(attr)
+            if value:
+                opening_tag += f' {attr}="{value}"'
+        return opening_tag + ">"
+
+
+class _PageElements:
+    def __init__(
+        self,
+        generation: int,
+        elements_handle: JSHandle,
+        elements: Dict[str, RegisteredElement],
+    ):
+        self.generation = generation
+        self.elements_handle = elements_handle
+        self.elements = elements
+
+
+class ElementRegistry:
+    """
+    Maps mmids to the elements captured during the last DOM extraction of each page.
+
+    The registry is filled in one round-trip when the DOM is extracted. It keeps a page-side array of the
+    interactive elements and their attributes of interest, so skills get an ElementHandle and the element
+    description without resolving `[mmid='N']` again or fetching attributes one CDP call at a time.
+    Entries are only served while the page's document generation (see PageReadiness) is unchanged.
+    Every extraction re-numbers the mmids and replaces the entries.
+    """
+
+    def __init__(self):
+        self._pages: Dict[Page, _PageElements] = {}
+        self._known_pages: Set[Page] = set()
+
+    async def populate(self, page: Page, generation: int):
+        """
+        Captures the interactive elements of the page. Call right after the mmids have been injected.
+
+        Args:
+            page (Page): The page that was just extracted.
+            generation (int): The page's current document generation.
+        """
+        await self.invalidate(page)
+        try:
+            result_handle = await page.evaluate_handle(
+                COLLECT_ELEMENTS_JS,
+                [INTERACTIVE_ELEMENTS_SELECTOR, ATTRIBUTES_OF_INTEREST],
+            )
+            elements_handle = await result_handle.get_property("elements")
+            infos = await (await result_handle.get_property("infos")).json_value()
+            await result_handle.dispose()
+        except Exception as e:
+            logger.debug(f"Could not populate the element registry: {e}")
+            return
+        elements = {
+            info["mmid"]: RegisteredElement(
+                mmid=info["mmid"],
+                tag_name=info["tag"],
+                attributes=info["attributes"],
+                index=index,
+            )
+            for index, info in enumerate(infos)
+        }
+        if page not in self._known_pages:
+            self._known_pages.add(page)
+            page.on("close", self.forget)
+        self._pages[page] = _PageElements(generation, elements_handle, elements)
+        logger.debug(f"Registered {len(elements)} interactive elements")
+
+    async def invalidate(self, page: Page):
+        page_elements = self._pages.pop(page, None)
+        if page_elements is not None:
+            try:
+                await page_elements.elements_handle.dispose()
+            except Exception:
+                # the handle dies with its document, nothing left to release
+                pass
+
+    def lookup(
+        self, page: Page, selector: str, generation: int
+    ) -> Optional[RegisteredElement]:
+        """
+        Returns the registered element for an `[mmid='N']` selector, or None if it is unknown or stale.
+        """
+        page_elements = self._pages.get(page)
+        if page_elements is None or page_elements.generation != generation:
+            return None
+        match = MMID_SELECTOR_PATTERN.match(selector.strip())
+        if match is None:
+            return None
+        return page_elements.elements.get(match.group(1))
+
+    async def get_element(
+        self, page: Page, selector: str, generation: int
+    ) -> Optional[ElementHandle]:
+        """
+        Returns a handle to the registered element for an `[mmid='N']` selector, still attached to the document.
+        Returns None when the caller has to resolve the selector itself.
+        """
+        registered = self.lookup(page, selector, generation)
+        if registered is None:
+            return None
+        try:
+            handle = await self._pages[page].elements_handle.evaluate_handle(
+                "(elements, index) => { const element = elements[index]; return element && element.isConnected ? element : null; }",
+                registered.index,
+            )
+        except Exception as e:
+            logger.debug(f"Registered element {selector} is no longer reachable: {e}")
+            return None
+        element = handle.as_element()
+        if element is None:
+            await handle.dispose()
+        return element
+
+    def forget(self, page: Page):
+        self._pages.pop(page, None)
+        self._known_pages.discard(page)
@@ -0,0 +1,412 @@
+import asyncio
+import time
+from typing import Any, Dict, List, Optional, Set
+
+from playwright.async_api import Page, Request
+
+from agentq.utils.logger import logger
+from agentq.utils.tracing import percentile, tracer
+
+# Resolves once the DOM has not changed for `quietMs` and the document size and element count
+# are equal on two consecutive checks, or once `timeoutMs` has elapsed. Resolves to true when the page settled.
+SETTLE_JS = """
+([quietMs, timeoutMs]) => new Promise((resolve) => {
+    const start = performance.now();
+    let lastMutation = start;
+    const observer = new MutationObserver(() => { lastMutation = performance.now(); });
+    observer.observe(document, {
+        subtree: true,
+        childList: true,
+        characterData: true,
+        attributes: true,
+        attributeFilter: ['class', 'hidden', 'open', 'disabled', 'aria-expanded', 'aria-hidden'],
+    });
+    const layoutKey = () => {
+        const root = document.scrollingElement || document.documentElement;
+        return root ? `${root.scrollWidth}x${root.scrollHeight}:${document.getElementsByTagName('*').length}` : '';
+    };
+    let lastLayout = null;
+    const check = () => {
+        const now = performance.now();
+        const layout = layoutKey();
+        const layoutStable = layout === lastLayout;
+        lastLayout = layout;
+        const settled = layoutStable && now - lastMutation >= quietMs;
+        if (settled || now - start >= timeoutMs) {
+            observer.disconnect();
+            resolve(settled);
+            return;
+        }
+        // setTimeout rather than requestAnimationFrame, which is throttled in background tabs
+        setTimeout(check, 50);
+    };
+    check();
+})
+"""
+
+
+# Installs, once per document, an observer counting DOM mutations, typed values and checked states in
+# `window.__agentqMutations`, and reports them to the page's tracker through the `agentq_dom_mutated` binding
+# at most every 100 ms. Evaluates to the current count, so a caller can read it in the same round-trip.
+MUTATION_COUNTER_JS = """
+(() => {
+    if (window.__agentqMutations === undefined) {
+        window.__agentqMutations = 0;
+        let reportPending = false;
+        const count = () => {
+            window.__agentqMutations++;
+            if (!reportPending && typeof window.agentq_dom_mutated === 'function') {
+                reportPending = true;
+                setTimeout(() => { reportPending = false; window.agentq_dom_mutated().catch(() => {}); }, 100);
+            }
+        };
+        new MutationObserver(count).observe(document, {
+            subtree: true,
+            childList: true,
+            characterData: true,
+            attributes: true,
+        });
+        // values typed into fields and checked states change without a DOM mutation
+        document.addEventListener('input', count, true);
+        document.addEventListener('change', count, true);
+    }
+    return window.__agentqMutations;
+})()
+"""
+
+
+class SettleStats:
+    """
+    Collects how long each kind of action took to settle, so the settle bounds can be tuned from real runs.
+    """
+
+    def __init__(self):
+        self._durations: Dict[str, List[float]] = {}
+        self._timeouts: Dict[str, int] = {}
+
+    def record(self, action: str, duration: float, settled: bool):
+        self._durations.setdefault(action, []).append(duration)
+        if not settled:
+            self._timeouts[action] = self._timeouts.get(action, 0) + 1
+
+    def summary(self) -> List[Dict[str, Any]]:
+        rows = []
+        for action, durations in self._durations.items():
+            values = sorted(durations)
+            rows.append(
+                {
+                    "action": action,
+                    "count": len(values),
+                    "timeouts": self._timeouts.get(action, 0),
+                    "p50_ms": round(percentile(values, 0.5) * 1000, 1),
+                    "p95_ms": round(percentile(values, 0.95) * 1000, 1),
+                    "max_ms": round(values[-1] * 1000, 1),
+                }
+            )
+        return rows
+
+    def log_summary(self):
+        for row in self.summary():
+            logger.info(
+                f"Settle latency for {row['action']}: n={row['count']} p50={row['p50_ms']}ms p95={row['p95_ms']}ms max={row['max_ms']}ms timeouts={row['timeouts']}"
+            )
+
+    def clear(self):
+        self._durations = {}
+        self._timeouts = {}
+
+
+settle_stats = SettleStats()
+
+
+class PageReadiness:
+    """
+    Event-driven load state of a single page.
+
+    Instead of polling `document.readyState` or calling `wait_for_load_state` from every skill,
+    the tracker subscribes once to the page's navigation, load and network events and keeps the
+    result in memory. Skills then await the cached state without extra CDP round-trips.
+
+    Attributes:
+        generation (int): Incremented on every main-frame document navigation. Anything derived from the DOM
+                          (element handles, screenshots) can be keyed by it.
+        ready_since (float | None): Monotonic time at which the current document stopped loading, None while loading.
+        loaded_since (float | None): Monotonic time of the current document's `load` event.
+        last_mutation (float | None): Monotonic time at which this page last reported a DOM mutation (see
+                                      MUTATION_COUNTER_JS), None if it has not mutated since it was tracked.
+    """
+
+    def __init__(self, page: Page):
+        self.page = page
+        self.generation = 0
+        self.ready_since: Optional[float] = None
+        self.loaded_since: Optional[float] = None
+        self.last_network_activity = time.monotonic()
+        self.last_mutation: Optional[float] = None
+        self._inflight: Set[Request] = set()
+        self._dom_ready = asyncio.Event()
+        self._loaded = asyncio.Event()
+        self._network_activity = asyncio.Event()
+        self._navigation_request: Optional[Request] = None
+
+        page.on("request", self._on_request)
+        page.on("requestfinished", self._on_request_done)
+        page.on("requestfailed", self._on_request_failed)
+        page.on("domcontentloaded", self._on_domcontentloaded)
+        page.on("load", self._on_load)
+
+    async def sync(self):
+        """
+        Seeds the state from the page once, for pages that finished loading before the tracker was attached.
+        """
+        try:
+            dom_state = await self.page.evaluate("document.readyState")
+        except Exception as e:
+            logger.debug(
+                f"Could not read document.readyState while syncing readiness: {e}"
+            )
+            return
+        if dom_state != "loading":
+            self._mark_dom_ready()
+        if dom_state == "complete":
+            self._mark_loaded()
+
+    @property
+    def is_dom_ready(self) -> bool:
+        return self._dom_ready.is_set()
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._loaded.is_set()
+
+    @property
+    def inflight_requests(self) -> int:
+        return len(self._inflight)
+
+    def note_mutation(self):
+        self.last_mutation = time.monotonic()
+
+    async def wait_for_dom_ready(self, timeout: float = 5.0) -> bool:
+        """
+        Waits until the current document is no longer 'loading' (external resources may still be loading).
+
+        Args:
+            timeout (float, optional): Maximum wait in seconds. Defaults to 5.0.
+
+        Returns:
+            bool: True if the DOM is ready, False if the timeout was reached.
+        """
+        if self._dom_ready.is_set():
+            return True
+        try:
+            await asyncio.wait_for(self._dom_ready.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            # the events may have been missed (e.g. an aborted navigation), ask the page once
+            await self.sync()
+            return self._dom_ready.is_set()
+
+    async def wait_for_load(self, timeout: float = 10.0) -> bool:
+        """
+        Waits for the `load` event of the current document.
+
+        Args:
+            timeout (float, optional): Maximum wait in seconds. Defaults to 10.0.
+
+        Returns:
+            bool: True if the page has loaded, False if the timeout was reached.
+        """
+        if self._loaded.is_set():
+            return True
+        try:
+            await asyncio.wait_for(self._loaded.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            await self.sync()
+            return self._loaded.is_set()
+
+    async def wait_for_network_idle(
+        self, idle_time: float = 0.5, timeout: float = 10.0
+    ) -> bool:
+        """
+        Waits until no request has been in flight for `idle_time` seconds.
+
+        Args:
+            idle_time (float, optional): Required quiet window in seconds. Defaults to 0.5.
+            timeout (float, optional): Maximum wait in seconds. Defaults to 10.0.
+
+        Returns:
+            bool: True if the network went idle, False if the timeout was reached.
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            now = time.monotonic()
+            if self.inflight_requests == 0:
+                remaining_quiet = idle_time - (now - self.last_network_activity)
+                if remaining_quiet <= 0:
+                    return True
+            else:
+                remaining_quiet = None
+            remaining_time = deadline - now
+            if remaining_time <= 0:
+                return False
+            self._network_activity.clear()
+            wait_for = (
+                remaining_time
+                if remaining_quiet is None
+                else min(remaining_quiet, remaining_time)
+            )
+            try:
+                await asyncio.wait_for(self._network_activity.wait(), wait_for)
+            except asyncio.TimeoutError:
+                pass
+
+    async def wait_for_settle(
+        self,
+        timeout: float = 3.0,
+        quiet_time: float = 0.1,
+        network_idle_time: float = 0.25,
+        action: str = "action",
+    ) -> bool:
+        """
+        Waits until the page is stable after an action: the document is ready, the network is idle and
+        the DOM and layout have stopped changing. Returns as soon as all three hold, or after `timeout`.
+
+        Args:
+            timeout (float, optional): Upper bound in seconds. Defaults to 3.0.
+            quiet_time (float, optional): Required window without DOM mutations, in seconds. Defaults to 0.1.
+            network_idle_time (float, optional): Required window without requests, in seconds. Defaults to 0.25.
+            action (str, optional): Label under which the settle latency is recorded. Defaults to "action".
+
+        Returns:
+            bool: True if the page settled, False if the timeout was reached.
+        """
+        start = time.monotonic()
+        deadline = start + timeout
+        settled = False
+        with tracer.span(f"settle.{action}") as span:
+            while not settled:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                generation = self.generation
+                if not await self.wait_for_dom_ready(remaining):
+                    break
+                remaining = max(0.0, deadline - time.monotonic())
+                network_idle, dom_quiet = await asyncio.gather(
+                    self.wait_for_network_idle(network_idle_time, remaining),
+                    self._wait_for_dom_quiet(quiet_time, remaining),
+                )
+                settled = network_idle and dom_quiet
+                if not settled and self.generation == generation:
+                    # not a navigation that interrupted the check: the page is just busy, stop at the bound
+                    break
+            duration = time.monotonic() - start
+            span.set_attributes(settled=settled, generation=self.generation)
+        settle_stats.record(action, duration, settled)
+        logger.debug(
+            f"Page {'settled' if settled else 'did not settle'} after {action} in {duration * 1000:.0f} ms"
+        )
+        return settled
+
+    async def _wait_for_dom_quiet(self, quiet_time: float, timeout: float) -> bool:
+        try:
+            return await self.page.evaluate(
+                SETTLE_JS, [quiet_time * 1000, timeout * 1000]
+            )
+        except Exception as e:
+            # the execution context is destroyed when the action navigates, the caller re-checks the new document
+            logger.debug(f"DOM quiet check interrupted: {e}")
+            return False
+
+    def _mark_dom_ready(self):
+        if not self._dom_ready.is_set():
+            self.ready_since = time.monotonic()
+            self._dom_ready.set()
+
+    def _mark_loaded(self):
+        self._mark_dom_ready()
+        if not self._loaded.is_set():
+            self.loaded_since = time.monotonic()
+            self._loaded.set()
+
+    def _start_navigation(self, request: Request):
+        self._navigation_request = request
+        self.generation += 1
+        self.ready_since = None
+        self.loaded_since = None
+        self._dom_ready.clear()
+        self._loaded.clear()
+
+    def _touch_network(self):
+        self.last_network_activity = time.monotonic()
+        self._network_activity.set()
+
+    def _on_request(self, request: Request):
+        self._inflight.add(request)
+        self._touch_network()
+        try:
+            if (
+                request.is_navigation_request()
+                and request.frame == self.page.main_frame
+            ):
+                self._start_navigation(request)
+        except Exception:
+            # the frame may already be detached, this request then does not concern the main document
+            pass
+
+    def _on_request_done(self, request: Request):
+        self._inflight.discard(request)
+        self._touch_network()
+
+    def _on_request_failed(self, request: Request):
+        self._on_request_done(request)
+        if request is self._navigation_request:
+            # aborted navigations (downloads, cancelled loads) leave the previous document in place
+            self._navigation_request = None
+            self._mark_loaded()
+
+    def _on_domcontentloaded(self, page: Page):
+        self._mark_dom_ready()
+
+    def _on_load(self, page: Page):
+        self._mark_loaded()
+
+
+class PageReadinessService:
+    """
+    Owns one PageReadiness tracker per open page, and routes the DOM mutations of each page to its tracker.
+    """
+
+    def __init__(self):
+        self._trackers: Dict[Page, PageReadiness] = {}
+
+    async def track(self, page: Page) -> PageReadiness:
+        tracker = self._trackers.get(page)
+        if tracker is None:
+            tracker = PageReadiness(page)
+            self._trackers[page] = tracker
+            page.on("close", self._forget)
+            await self._observe_mutations(tracker)
+            await tracker.sync()
+        return tracker
+
+    @staticmethod
+    async def _observe_mutations(tracker: PageReadiness):
+        """
+        Installs the mutation counter in the current and future documents of the page. The binding is
+        registered on this page only, so a mutation stamps the tracker of the page it happened in.
+        """
+        page = tracker.page
+        try:
+            await page.expose_binding(
+                "agentq_dom_mutated", lambda source: tracker.note_mutation()
+            )
+            await page.add_init_script(MUTATION_COUNTER_JS)
+            await page.evaluate(MUTATION_COUNTER_JS)
+        except Exception as e:
+            # e.g. the page closed while being tracked, or is still on a document that cannot run scripts
+            logger.debug(f"Could not install the DOM mutation counter: {e}")
+
+    def _forget(self, page: Page):
+        self._trackers.pop(page, None)
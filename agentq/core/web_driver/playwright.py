@@ -1,10 +1,23 @@
+import asyncio
+import contextvars
 import tempfile
 import time
-from typing import List, Union
+from contextlib import asynccontextmanager, contextmanager
+from typing import AsyncIterator, Iterator, List, Union
 
-from playwright.async_api import BrowserContext, Page, Playwright
+from playwright.async_api import BrowserContext, ElementHandle, Page, Playwright
 from playwright.async_api import async_playwright as playwright
 
+from agentq.core.web_driver.element_registry import (
+    ElementRegistry,
+    RegisteredElement,
+)
+from agentq.core.web_driver.page_readiness import (
+    PageReadiness,
+    PageReadinessService,
+    settle_stats,
+)
+from agentq.core.web_driver.screenshot_service import Screenshot, ScreenshotService
 from agentq.utils.dom_mutation_observer import (
     dom_mutation_change_detected,
     handle_navigation_for_mutation_observer,
@@ -12,6 +25,16 @@ from agentq.utils.dom_mutation_observer import (
 from agentq.utils.logger import logger
 from agentq.utils.ui_messagetype import MessageType
 
+# The page the current asyncio task (and the tasks it spawns) works on, see PlaywrightManager.use_page
+_session_page: contextvars.ContextVar[Union[Page, None]] = contextvars.ContextVar(
+    "agentq_session_page", default=None
+)
+
+# The screenshots directory of the current asyncio task, see PlaywrightManager.use_screenshots_dir
+_session_screenshots_dir: contextvars.ContextVar[Union[str, None]] = (
+    contextvars.ContextVar("agentq_session_screenshots_dir", default=None)
+)
+
 # TODO - Create a wrapper browser manager class that either starts a playwright manager (our solution) or a hosted browser manager like browserbase
 
 
@@ -23,6 +46,10 @@ class PlaywrightManager:
     _instance = None
     _take_screenshots = False
     _screenshots_dir = None
+    _readiness: Union[PageReadinessService, None] = None
+    _elements: ElementRegistry = ElementRegistry()
+    _screenshots: ScreenshotService = ScreenshotService()
+    _initialize_lock: Union[asyncio.Lock, None] = None
 
     def __new__(cls, *args, **kwargs):  # type: ignore
         """
@@ -71,20 +98,27 @@ class PlaywrightManager:
         if self.__async_initialize_done:
             return
 
-        # Step 1: Ensure Playwright is started and browser context is created
-        await self.start_playwright()
-        self.eval_mode = eval_mode
-        await self.ensure_browser_context()
+        # concurrent sessions share one browser, only the first caller starts it
+        if PlaywrightManager._initialize_lock is None:
+            PlaywrightManager._initialize_lock = asyncio.Lock()
+        async with PlaywrightManager._initialize_lock:
+            if self.__async_initialize_done:
+                return
 
-        # Step 2: Deferred setup of handlers
-        # await self.setup_handlers()
+            # Step 1: Ensure Playwright is started and browser context is created
+            await self.start_playwright()
+            self.eval_mode = eval_mode
+            await self.ensure_browser_context()
 
-        self._homepage = homepage
+            # Step 2: Deferred setup of handlers
+            # await self.setup_handlers()
 
-        # Step 3: Navigate to homepage
-        await self.go_to_homepage()
+            self._homepage = homepage
 
-        self.__async_initialize_done = True
+            # Step 3: Navigate to homepage
+            await self.go_to_homepage()
+
+            self.__async_initialize_done = True
 
     async def ensure_browser_context(self):
         """
@@ -92,6 +126,122 @@ class PlaywrightManager:
         """
         if self._browser_context is None:
             await self.create_browser_context()
+            await self.setup_page_readiness()
+
+    async def setup_page_readiness(self):
+        """
+        Subscribes the page readiness service to every current and future page of the browser context.
+        """
+        readiness = PlaywrightManager._readiness_service()
+        self._browser_context.on("page", readiness.track)
+        for page in self._browser_context.pages:
+            await readiness.track(page)
+
+    @staticmethod
+    def _readiness_service() -> PageReadinessService:
+        if PlaywrightManager._readiness is None:
+            PlaywrightManager._readiness = PageReadinessService()
+        return PlaywrightManager._readiness
+
+    async def get_page_readiness(self, page: Union[Page, None] = None) -> PageReadiness:
+        """
+        Returns the cached readiness tracker of a page, attaching one if the page is not tracked yet.
+
+        Args:
+            page (Page, optional): The page to track. Defaults to the current page.
+        """
+        if page is None:
+            page = await self.get_current_page()
+        return await PlaywrightManager._readiness_service().track(page)
+
+    async def wait_for_page_ready(
+        self, page: Union[Page, None] = None, timeout: float = 5.0
+    ) -> bool:
+        """
+        Waits until the page's DOM is no longer loading, using the cached event state instead of polling the page.
+
+        Args:
+            page (Page, optional): The page to wait for. Defaults to the current page.
+            timeout (float, optional): Maximum wait in seconds. Defaults to 5.0.
+
+        Returns:
+            bool: True if the DOM is ready, False if the timeout was reached.
+        """
+        readiness = await self.get_page_readiness(page)
+        return await readiness.wait_for_dom_ready(timeout)
+
+    async def wait_for_page_settle(
+        self,
+        page: Union[Page, None] = None,
+        timeout: float = 3.0,
+        action: str = "action",
+    ) -> bool:
+        """
+        Waits until the page is stable after an action (network idle, no DOM mutations, stable layout), bounded by `timeout`.
+        Use this instead of fixed sleeps after interacting with the page.
+
+        Args:
+            page (Page, optional): The page to wait for. Defaults to the current page.
+            timeout (float, optional): Upper bound in seconds. Defaults to 3.0.
+            action (str, optional): Label under which the settle latency is recorded. Defaults to "action".
+
+        Returns:
+            bool: True if the page settled, False if the timeout was reached.
+        """
+        readiness = await self.get_page_readiness(page)
+        # the action may have changed what is on screen without a DOM mutation (e.g. typed text)
+        PlaywrightManager._screenshots.invalidate(readiness.page)
+        return await readiness.wait_for_settle(timeout=timeout, action=action)
+
+    async def capture_screenshot(self, page: Union[Page, None] = None) -> Screenshot:
+        """
+        Captures the visible viewport in the configured format and size, reusing the last screenshot while
+        the page is unchanged, see ScreenshotService.
+
+        Args:
+            page (Page, optional): The page to capture. Defaults to the current page.
+        """
+        readiness = await self.get_page_readiness(page)
+        return await PlaywrightManager._screenshots.capture(readiness)
+
+    async def register_elements(self, page: Union[Page, None] = None):
+        """
+        Captures the interactive elements of a page after its mmids have been injected, see ElementRegistry.
+
+        Args:
+            page (Page, optional): The page that was just extracted. Defaults to the current page.
+        """
+        readiness = await self.get_page_readiness(page)
+        await PlaywrightManager._elements.populate(readiness.page, readiness.generation)
+
+    async def get_registered_element(
+        self, selector: str, page: Union[Page, None] = None
+    ) -> Union[ElementHandle, None]:
+        """
+        Returns a handle to the element registered for an `[mmid='N']` selector during the last DOM extraction.
+
+        Args:
+            selector (str): The mmid selector.
+            page (Page, optional): The page of the element. Defaults to the current page.
+
+        Returns:
+            ElementHandle | None: The element, or None if it is not registered, stale or detached and the selector has to be resolved.
+        """
+        readiness = await self.get_page_readiness(page)
+        return await PlaywrightManager._elements.get_element(
+            readiness.page, selector, readiness.generation
+        )
+
+    async def lookup_registered_element(
+        self, selector: str, page: Union[Page, None] = None
+    ) -> Union[RegisteredElement, None]:
+        """
+        Returns the tag name and attributes captured for an `[mmid='N']` selector during the last DOM extraction, without a page round-trip.
+        """
+        readiness = await self.get_page_readiness(page)
+        return PlaywrightManager._elements.lookup(
+            readiness.page, selector, readiness.generation
+        )
 
     # async def setup_handlers(self):
     #     """
@@ -112,6 +262,13 @@ class PlaywrightManager:
         """
         Stops the Playwright instance and resets it to None. This method should be called to clean up resources.
         """
+        settle_stats.log_summary()
+        screenshots = PlaywrightManager._screenshots
+        if screenshots.hits or screenshots.misses:
+            logger.info(
+                f"Screenshots captured: {screenshots.misses}, reused from cache: {screenshots.hits}"
+            )
+
         # Close the browser context if it's initialized
         if PlaywrightManager._browser_context is not None:
             await PlaywrightManager._browser_context.close()
@@ -172,7 +329,7 @@ class PlaywrightManager:
 
             # in eval mode - start a temp browser.
             if self.eval_mode:
-                print("Starting in eval mode", self.eval_mode)
+                logger.debug("Starting in eval mode %s", self.eval_mode)
                 new_user_dir = tempfile.mkdtemp()
                 logger.info(
                     f"Starting a temporary browser instance. trying to launch with a new user dir {new_user_dir}"
@@ -257,11 +414,16 @@ class PlaywrightManager:
 
     async def get_current_page(self) -> Page:
         """
-        Get the current page of the browser
+        Get the current page of the browser.
+
+        Inside `use_page` / `session_page` this is the page bound to the running task, otherwise the last open page of the shared context.
 
         Returns:
             Page: The current page if any.
         """
+        session_page = _session_page.get()
+        if session_page is not None and not session_page.is_closed():
+            return session_page
         try:
             browser: BrowserContext = await self.get_browser_context()  # type: ignore
             # Filter out closed pages
@@ -280,6 +442,37 @@ class PlaywrightManager:
             await self.ensure_browser_context()
             return await self.get_current_page()
 
+    @contextmanager
+    def use_page(self, page: Page) -> Iterator[Page]:
+        """
+        Binds a page to the current execution context. Every skill called from this task, or from tasks it creates,
+        then acts on this page instead of the last opened one, so independent sessions can share the browser concurrently.
+
+        Example:
+            with playwright_manager.use_page(page):
+                await orchestrator.execute_command(command)
+        """
+        token = _session_page.set(page)
+        try:
+            yield page
+        finally:
+            _session_page.reset(token)
+
+    @asynccontextmanager
+    async def session_page(self) -> AsyncIterator[Page]:
+        """
+        Opens a new tab in the shared browser context, binds it with `use_page` and closes it on exit.
+        """
+        browser_context = await self.get_browser_context()
+        page = await browser_context.new_page()  # type: ignore
+        await self.get_page_readiness(page)
+        try:
+            with self.use_page(page):
+                yield page
+        finally:
+            if not page.is_closed():
+                await page.close()
+
     async def close_all_tabs(self, keep_first_tab: bool = True):
         """
         Closes all tabs in the browser context, except for the first tab if `keep_first_tab` is set to True.
@@ -322,7 +515,7 @@ class PlaywrightManager:
         page: Page = await PlaywrightManager.get_current_page(self)
         page.on("domcontentloaded", self.ui_manager.handle_navigation)  # type: ignore
         page.on("domcontentloaded", handle_navigation_for_mutation_observer)  # type: ignore
-        await page.expose_function(
+        await page.expose_binding(
             "dom_mutation_change_detected", dom_mutation_change_detected
         )  # type: ignore
 
@@ -494,7 +687,19 @@ class PlaywrightManager:
         self._screenshots_dir = screenshots_dir
 
     def get_screenshots_dir(self):
-        return self._screenshots_dir
+        return _session_screenshots_dir.get() or self._screenshots_dir
+
+    @contextmanager
+    def use_screenshots_dir(self, screenshots_dir: str) -> Iterator[str]:
+        """
+        Saves the screenshots taken from the current execution context to `screenshots_dir`, like `use_page`
+        this keeps concurrent sessions (e.g. parallel eval tasks) from writing into each other's folders.
+        """
+        token = _session_screenshots_dir.set(screenshots_dir)
+        try:
+            yield screenshots_dir
+        finally:
+            _session_screenshots_dir.reset(token)
 
     async def take_screenshots(
         self,
@@ -517,9 +722,11 @@ class PlaywrightManager:
         screenshot_name += ".png"
         screenshot_path = f"{self.get_screenshots_dir()}/{screenshot_name}"
         try:
-            await page.wait_for_load_state(
-                state=load_state, timeout=take_snapshot_timeout
-            )  # type: ignore
+            readiness = await self.get_page_readiness(page)
+            if load_state == "load":
+                await readiness.wait_for_load(timeout=take_snapshot_timeout / 1000)
+            else:
+                await readiness.wait_for_dom_ready(timeout=take_snapshot_timeout / 1000)
             await page.screenshot(
                 path=screenshot_path,
                 full_page=full_page,
@@ -0,0 +1,256 @@
+import base64
+import math
+import os
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional, Set, Tuple
+
+from playwright.async_api import CDPSession, Page
+
+from agentq.core.web_driver.page_readiness import MUTATION_COUNTER_JS, PageReadiness
+from agentq.utils.logger import logger
+from agentq.utils.tracing import tracer
+
+SCREENSHOT_FORMATS = ("png", "jpeg", "webp")
+
+# Scroll offset and size of the visual viewport in CSS pixels, and the document's mutation count, in one round-trip
+VIEWPORT_JS = """
+() => {
+    const mutations = MUTATION_COUNTER_JS;
+    const viewport = window.visualViewport;
+    return viewport
+        ? [viewport.pageLeft, viewport.pageTop, viewport.width, viewport.height, mutations]
+        : [window.scrollX, window.scrollY, window.innerWidth, window.innerHeight, mutations];
+}
+""".replace("MUTATION_COUNTER_JS", MUTATION_COUNTER_JS.strip())
+
+
+def estimate_vision_tokens(width: int, height: int) -> int:
+    """
+    Estimates the input tokens of an image for a high-detail vision request (GPT-4o tiling): the image is
+    fitted into 2048x2048, its shortest side scaled down to 768px, then billed 170 tokens per 512px tile plus 85.
+    """
+    if width <= 0 or height <= 0:
+        return 0
+    scale = min(1.0, 2048 / max(width, height))
+    width, height = width * scale, height * scale
+    scale = min(1.0, 768 / min(width, height))
+    width, height = width * scale, height * scale
+    return 85 + 170 * math.ceil(width / 512) * math.ceil(height / 512)
+
+
+@dataclass
+class ScreenshotConfig:
+    """
+    Attributes:
+        format (str): "jpeg", "webp" or "png". WebP needs Chromium, other browsers fall back to JPEG.
+        quality (int): Compression quality (0-100) for JPEG and WebP.
+        max_dimension (int | None): Longest side of the image in pixels; larger viewports are downscaled by the
+                                    browser before encoding. 1024 keeps a 16:9 viewport at 4 vision tiles
+                                    instead of 6. None keeps the CSS-pixel resolution.
+        cache_ttl (float): Seconds a screenshot is reused while the page has not navigated, mutated or been typed into.
+    """
+
+    format: str = "jpeg"
+    quality: int = 80
+    max_dimension: Optional[int] = 1024
+    cache_ttl: float = 2.0
+
+    @classmethod
+    def from_env(cls) -> "ScreenshotConfig":
+        """Reads AGENTQ_SCREENSHOT_FORMAT, _QUALITY, _MAX_DIMENSION (0 for full resolution) and _CACHE_TTL."""
+        config = cls()
+        screenshot_format = os.getenv("AGENTQ_SCREENSHOT_FORMAT", config.format).lower()
+        if screenshot_format not in SCREENSHOT_FORMATS:
+            raise ValueError(
+                f"AGENTQ_SCREENSHOT_FORMAT must be one of {SCREENSHOT_FORMATS}, got {screenshot_format}"
+            )
+        config.format = screenshot_format
+        config.quality = int(os.getenv("AGENTQ_SCREENSHOT_QUALITY", config.quality))
+        max_dimension = int(
+            os.getenv("AGENTQ_SCREENSHOT_MAX_DIMENSION", config.max_dimension or 0)
+        )
+        config.max_dimension = max_dimension or None
+        config.cache_ttl = float(
+            os.getenv("AGENTQ_SCREENSHOT_CACHE_TTL", config.cache_ttl)
+        )
+        return config
+
+
+@dataclass
+class Screenshot:
+    """A captured viewport, kept base64 encoded as returned by the browser."""
+
+    base64_data: str
+    format: str
+    width: int
+    height: int
+
+    @property
+    def mime_type(self) -> str:
+        return f"image/{self.format}"
+
+    @property
+    def data_url(self) -> str:
+        return f"data:{self.mime_type};base64,{self.base64_data}"
+
+    @property
+    def size_bytes(self) -> int:
+        return len(self.base64_data) * 3 // 4
+
+    @property
+    def vision_tokens(self) -> int:
+        return estimate_vision_tokens(self.width, self.height)
+
+    def to_bytes(self) -> bytes:
+        return base64.b64decode(self.base64_data)
+
+
+class _CachedScreenshot:
+    def __init__(self, key: Tuple, captured_at: float, screenshot: Screenshot):
+        self.key = key
+        self.captured_at = captured_at
+        self.screenshot = screenshot
+
+
+class ScreenshotService:
+    """
+    Captures viewport screenshots for the vision, planner and captcha agents.
+
+    On Chromium the screenshot is taken through CDP, which encodes JPEG or WebP and downscales to
+    `max_dimension` inside the browser, and returns base64 directly. Elsewhere Playwright's screenshot with
+    `type`/`quality` is used at CSS-pixel scale.
+
+    A screenshot is reused for `cache_ttl` seconds as long as the page's document generation (see
+    PageReadiness), its in-page count of DOM mutations and typed values (see MUTATION_COUNTER_JS) and the viewport
+    are unchanged, e.g. when MCTS captures the same state twice.
+    """
+
+    def __init__(self, config: Optional[ScreenshotConfig] = None):
+        self._config = config
+        self._cache: Dict[Page, _CachedScreenshot] = {}
+        self._cdp_sessions: Dict[Page, CDPSession] = {}
+        self._known_pages: Set[Page] = set()
+        self._cdp_unsupported = False
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def config(self) -> ScreenshotConfig:
+        # read lazily, the environment may be loaded from .env after import
+        if self._config is None:
+            self._config = ScreenshotConfig.from_env()
+        return self._config
+
+    @config.setter
+    def config(self, config: ScreenshotConfig):
+        self._config = config
+        self._cache = {}
+
+    async def capture(self, readiness: PageReadiness) -> Screenshot:
+        """
+        Returns a screenshot of the visible viewport of the tracked page, from the cache when still valid.
+
+        Args:
+            readiness (PageReadiness): The readiness tracker of the page, used to key the cache.
+        """
+        page = readiness.page
+        config = self.config
+        with tracer.span("screenshot.capture", format=config.format) as span:
+            x, y, width, height, mutations = await page.evaluate(VIEWPORT_JS)
+            # the mutation count is read from the page itself, so a change made just before is never missed
+            key = (readiness.generation, mutations, x, y, width, height)
+            cached = self._cache.get(page)
+            now = time.monotonic()
+            if (
+                cached is not None
+                and cached.key == key
+                and now - cached.captured_at <= config.cache_ttl
+            ):
+                self.hits += 1
+                span.set_attributes(cached=True)
+                return cached.screenshot
+
+            self.misses += 1
+            scale = 1.0
+            if config.max_dimension and max(width, height) > config.max_dimension:
+                scale = config.max_dimension / max(width, height)
+            screenshot = await self._capture_cdp(page, x, y, width, height, scale)
+            if screenshot is None:
+                screenshot = await self._capture_playwright(page, width, height)
+
+            if page not in self._known_pages:
+                self._known_pages.add(page)
+                page.on("close", self.forget)
+            self._cache[page] = _CachedScreenshot(key, now, screenshot)
+            span.set_attributes(
+                cached=False,
+                width=screenshot.width,
+                height=screenshot.height,
+                bytes=screenshot.size_bytes,
+                vision_tokens=screenshot.vision_tokens,
+            )
+            return screenshot
+
+    async def _capture_cdp(
+        self, page: Page, x: float, y: float, width: float, height: float, scale: float
+    ) -> Optional[Screenshot]:
+        if self._cdp_unsupported:
+            return None
+        config = self.config
+        session = self._cdp_sessions.get(page)
+        if session is None:
+            try:
+                session = await page.context.new_cdp_session(page)
+            except Exception as e:
+                # CDP sessions are only available in Chromium
+                logger.debug(f"CDP is not available, using page.screenshot: {e}")
+                self._cdp_unsupported = True
+                return None
+            self._cdp_sessions[page] = session
+        params = {
+            "format": config.format,
+            "clip": {"x": x, "y": y, "width": width, "height": height, "scale": scale},
+            "captureBeyondViewport": False,
+        }
+        if config.format != "png":
+            params["quality"] = config.quality
+        try:
+            result = await session.send("Page.captureScreenshot", params)
+        except Exception as e:
+            logger.debug(f"CDP screenshot failed, using page.screenshot: {e}")
+            self._cdp_sessions.pop(page, None)
+            return None
+        return Screenshot(
+            base64_data=result["data"],
+            format=config.format,
+            width=round(width * scale),
+            height=round(height * scale),
+        )
+
+    async def _capture_playwright(
+        self, page: Page, width: float, height: float
+    ) -> Screenshot:
+        config = self.config
+        # Playwright only encodes PNG and JPEG
+        screenshot_format = "png" if config.format == "png" else "jpeg"
+        screenshot_bytes = await page.screenshot(
+            full_page=False,
+            type=screenshot_format,
+            quality=config.quality if screenshot_format == "jpeg" else None,
+            scale="css",
+        )
+        return Screenshot(
+            base64_data=base64.b64encode(screenshot_bytes).decode("utf-8"),
+            format=screenshot_format,
+            width=round(width),
+            height=round(height),
+        )
+
+    def invalidate(self, page: Page):
+        self._cache.pop(page, None)
+
+    def forget(self, page: Page):
+        self._cache.pop(page, None)
+        self._cdp_sessions.pop(page, None)
+        self._known_pages.discard(page)
@@ -0,0 +1,166 @@
+import contextvars
+import gzip
+import json
+import os
+import queue
+import re
+import threading
+from contextlib import contextmanager
+from typing import Any, Iterator, Optional, Tuple
+
+from agentq.utils.logger import logger
+
+# Set this to a directory to keep the accessibility trees and page texts extracted on every DOM read.
+DEBUG_ARTIFACTS_DIR_ENV_VAR = "AGENTQ_DEBUG_ARTIFACTS_DIR"
+
+_artifact_session: contextvars.ContextVar[str] = contextvars.ContextVar(
+    "agentq_artifact_session", default="default"
+)
+
+
+@contextmanager
+def artifact_session(session_id: str) -> Iterator[str]:
+    """
+    Prefixes the debug artifacts written in the current execution context with the session id, so concurrent
+    sessions don't overwrite each other's files. Like the progress listeners, the binding follows the asyncio
+    tasks created inside the block.
+
+    Example:
+        with artifact_session(orchestrator.session_id):
+            await get_dom_with_content_type("all_fields")
+    """
+    token = _artifact_session.set(re.sub(r"[^\w.-]", "_", str(session_id)))
+    try:
+        yield session_id
+    finally:
+        _artifact_session.reset(token)
+
+
+class DebugArtifactSink:
+    """
+    Writes debug artifacts (DOM snapshots, accessibility trees) off the event loop.
+
+    The sink is off until a directory is configured, either explicitly or through the AGENTQ_DEBUG_ARTIFACTS_DIR
+    environment variable, and `write` returns immediately while it is off. When on, artifacts are handed to a
+    background thread through a bounded queue, serialized as compact JSON and gzip-compressed. When the queue is
+    full the artifact is dropped rather than blocking the agent.
+
+    Each session keeps the latest artifact per name: `<session>_<name>.gz`.
+
+    Example:
+        if debug_artifacts.enabled:
+            debug_artifacts.write("json_accessibility_dom.json", accessibility_tree)
+    """
+
+    def __init__(self, max_queued: int = 16, compress: bool = True):
+        """
+        Args:
+            max_queued (int, optional): Artifacts waiting to be written before new ones are dropped. Defaults to 16.
+            compress (bool, optional): Gzip the artifacts. Defaults to True.
+        """
+        self.max_queued = max_queued
+        self.compress = compress
+        self.directory: Optional[str] = None
+        self.dropped = 0
+        self._env_checked = False
+        self._lock = threading.Lock()
+        self._queue: "queue.Queue[Optional[Tuple[str, Any]]]" = queue.Queue(
+            maxsize=max_queued
+        )
+        self._worker: Optional[threading.Thread] = None
+
+    @property
+    def enabled(self) -> bool:
+        if not self._env_checked:
+            self._configure_from_env()
+        return self.directory is not None
+
+    def _configure_from_env(self):
+        with self._lock:
+            if self._env_checked:
+                return
+            self._env_checked = True
+            directory = os.environ.get(DEBUG_ARTIFACTS_DIR_ENV_VAR)
+            if directory and self.directory is None:
+                self.directory = directory
+                logger.info(f"Writing debug artifacts to {directory}")
+
+    def configure(self, directory: Optional[str], compress: bool = True):
+        """Turns the sink on with the given directory, or off with None."""
+        self._env_checked = True
+        self.directory = directory
+        self.compress = compress
+
+    def write(self, name: str, content: Any):
+        """
+        Queues an artifact for writing. Does nothing while the sink is off.
+
+        Args:
+            name (str): The file name, e.g. "json_accessibility_dom.json". It is prefixed with the session id.
+            content (Any): A string written as is, or a JSON-serializable object. Objects are serialized on the
+                           writer thread, so they must not be modified afterwards; pass a string to snapshot one.
+        """
+        if not self.enabled:
+            return
+        file_name = f"{_artifact_session.get()}_{name}"
+        if self._worker is None:
+            self._start_worker()
+        try:
+            self._queue.put_nowait((file_name, content))
+        except queue.Full:
+            self.dropped += 1
+            logger.debug(f"Debug artifact queue is full, dropped {file_name}")
+
+    def flush(self):
+        """Blocks until every queued artifact has been written."""
+        if self._worker is not None:
+            self._queue.join()
+
+    def shutdown(self):
+        if self._worker is None:
+            return
+        self._queue.put(None)
+        self._worker.join()
+        self._worker = None
+
+    def _start_worker(self):
+        with self._lock:
+            if self._worker is not None:
+                return
+            self._worker = threading.Thread(
+                target=self._run, name="debug-artifacts", daemon=True
+            )
+            self._worker.start()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                self._write_file(*item)
+            except Exception as e:
+                logger.error(f"Failed to write debug artifact {item[0]}: {e}")  # type: ignore
+            finally:
+                self._queue.task_done()
+
+    def _write_file(self, file_name: str, content: Any):
+        if not isinstance(content, str):
+            content = json.dumps(content, default=str, separators=(",", ":"))
+        directory = self.directory
+        if directory is None:
+            return
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, file_name + (".gz" if self.compress else ""))
+        temp_path = f"{path}.tmp"
+        if self.compress:
+            with gzip.open(temp_path, "wt", encoding="utf-8", compresslevel=1) as f:
+                f.write(content)
+        else:
+            with open(temp_path, "w", encoding="utf-8") as f:
+                f.write(content)
+        # replace the previous snapshot atomically, so a reader never sees a half written file
+        os.replace(temp_path, path)
+
+
+debug_artifacts = DebugArtifactSink()
@@ -1,21 +1,45 @@
-import asyncio
 from typing import List, Optional
 
 from playwright.async_api import ElementHandle, Page
 
+from agentq.core.web_driver.element_registry import ATTRIBUTES_OF_INTEREST
+from agentq.core.web_driver.playwright import PlaywrightManager
 from agentq.utils.logger import logger
 
 
 async def wait_for_non_loading_dom_state(page: Page, max_wait_millis: int):
-    max_wait_seconds = max_wait_millis / 1000
-    end_time = asyncio.get_event_loop().time() + max_wait_seconds
-    while asyncio.get_event_loop().time() < end_time:
-        dom_state = await page.evaluate("document.readyState")
-        if dom_state != "loading":
-            logger.debug(f"DOM state is not 'loading': {dom_state}")
-            break  # Exit the loop if the DOM state is not 'loading'
+    """
+    Waits until the DOM of the page is no longer 'loading'.
+
+    The state comes from the event-driven page readiness service on PlaywrightManager,
+    so an already loaded page returns immediately without evaluating anything in the page.
+
+    Args:
+        page (Page): The page to wait for.
+        max_wait_millis (int): Maximum wait time in milliseconds.
+    """
+    is_ready = await PlaywrightManager().wait_for_page_ready(
+        page, timeout=max_wait_millis / 1000
+    )
+    if is_ready:
+        logger.debug("DOM state is not 'loading'")
+    else:
+        logger.debug(f"DOM still loading after {max_wait_millis} ms")
 
-        await asyncio.sleep(0.05)
+
+# Builds the opening tag of each element with its non-empty attributes of interest
+OPENING_TAGS_JS = """
+([elements, attributes, tagNames]) => elements.map((element, index) => {
+    let openingTag = `<${tagNames[index] || element.tagName.toLowerCase()}`;
+    for (const attr of attributes) {
+        const value = element.getAttribute(attr);
+        if (value) {
+            openingTag += ` ${attr}="${value}"`;
+        }
+    }
+    return openingTag + '>';
+})
+"""
 
 
 async def get_element_outer_html(
@@ -32,35 +56,29 @@ async def get_element_outer_html(
     Returns:
         str: The opening tag of the HTML element, including a select set of attributes.
     """
-    tag_name: str = (
-        element_tag_name
-        if element_tag_name
-        else await page.evaluate("element => element.tagName.toLowerCase()", element)
-    )
+    opening_tags = await get_elements_outer_html([element], page, [element_tag_name])
+    return opening_tags[0]
 
-    attributes_of_interest: List[str] = [
-        "id",
-        "name",
-        "aria-label",
-        "placeholder",
-        "href",
-        "src",
-        "aria-autocomplete",
-        "role",
-        "type",
-        "data-testid",
-        "value",
-        "selected",
-        "aria-labelledby",
-        "aria-describedby",
-        "aria-haspopup",
-    ]
-    opening_tag: str = f"<{tag_name}"
-
-    for attr in attributes_of_interest:
-        value: str = await element.get_attribute(attr)  # type: ignore
-        if value:
-            opening_tag += f' {attr}="{value}"'
-    opening_tag += ">"
-
-    return opening_tag
+
+async def get_elements_outer_html(
+    elements: List[ElementHandle],
+    page: Page,
+    element_tag_names: Optional[List[Optional[str]]] = None,
+) -> List[str]:
+    """
+    Constructs the opening tags of several HTML elements in a single page evaluation, e.g. to summarize the elements of a mutation report.
+
+    Args:
+        elements (List[ElementHandle]): The elements to retrieve the opening tags for.
+        page (Page): The page object associated with the elements.
+        element_tag_names (List[Optional[str]], optional): Known tag names, in the order of `elements`. Missing ones are read from the elements.
+
+    Returns:
+        List[str]: The opening tag of each element, in the same format as get_element_outer_html.
+    """
+    if not elements:
+        return []
+    tag_names = element_tag_names or [None] * len(elements)
+    return await page.evaluate(
+        OPENING_TAGS_JS, [elements, ATTRIBUTES_OF_INTEREST, tag_names]
+    )
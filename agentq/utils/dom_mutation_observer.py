@@ -1,21 +1,25 @@
 import asyncio
 import json
-from typing import Callable, List  # noqa: UP035
+import weakref
+from typing import Any, Callable, Dict, List  # noqa: UP035
 
 from playwright.async_api import Page
 
-# Create an event loop
-loop = asyncio.get_event_loop()
+# The DOM change callbacks of each page. Sessions work on their own tab of the shared browser (see
+# PlaywrightManager.use_page), so the changes of a page only reach the skills acting on that page.
+_DOM_change_callbacks: "weakref.WeakKeyDictionary[Page, List[Callable[[str], None]]]" = weakref.WeakKeyDictionary()
 
-DOM_change_callback: List[Callable[[str], None]] = []
 
+def subscribe(callback: Callable[[str], None], page: Page) -> None:
+    _DOM_change_callbacks.setdefault(page, []).append(callback)
 
-def subscribe(callback: Callable[[str], None]) -> None:
-    DOM_change_callback.append(callback)
 
-
-def unsubscribe(callback: Callable[[str], None]) -> None:
-    DOM_change_callback.remove(callback)
+def unsubscribe(callback: Callable[[str], None], page: Page) -> None:
+    callbacks = _DOM_change_callbacks.get(page, [])
+    if callback in callbacks:
+        callbacks.remove(callback)
+    if not callbacks:
+        _DOM_change_callbacks.pop(page, None)
 
 
 async def add_mutation_observer(page: Page):
@@ -70,9 +74,10 @@ async def handle_navigation_for_mutation_observer(page: Page):
     await add_mutation_observer(page)
 
 
-async def dom_mutation_change_detected(changes_detected: str):
+async def dom_mutation_change_detected(source: Dict[str, Any], changes_detected: str):
     """
-    Detects changes in the DOM (new nodes added) and emits the event to all subscribed callbacks.
+    Detects changes in the DOM (new nodes added) and emits the event to the callbacks subscribed to the page
+    that reported them. Exposed with `page.expose_binding`, which passes that page in `source`.
     The changes_detected is a string in JSON formatt containing the tag and content of the new nodes added to the DOM.
 
     e.g.  The following will be detected when autocomplete recommendations show up when one types Nelson Mandela on google search
@@ -80,8 +85,8 @@ async def dom_mutation_change_detected(changes_detected: str):
     """
     changes_detected = json.loads(changes_detected.replace("\t", "").replace("\n", ""))
     if len(changes_detected) > 0:
-        # Emit the event to all subscribed callbacks
-        for callback in DOM_change_callback:
+        # Emit the event to the callbacks of the page, copied as a callback may unsubscribe
+        for callback in list(_DOM_change_callbacks.get(source["page"], [])):
             # If the callback is a coroutine function
             if asyncio.iscoroutinefunction(callback):
                 await callback(changes_detected)
@@ -1,5 +1,4 @@
 import json
-import os
 import re
 import traceback
 from typing import Dict, List, Optional
@@ -7,8 +6,8 @@ from typing import Dict, List, Optional
 from playwright.async_api import Page
 from typing_extensions import Annotated, Any
 
-from agentq.config.config import SOURCE_LOG_FOLDER_PATH
 from agentq.core.web_driver.playwright import PlaywrightManager
+from agentq.utils.debug_artifacts import debug_artifacts
 from agentq.utils.logger import logger
 
 space_delimited_mmid = re.compile(r"^[\d ]+$")
@@ -601,17 +600,17 @@ async def do_get_accessibility_info(page: Page, only_input_fields: bool = False)
         Dict[str, Any] or None: The enhanced accessibility tree as a dictionary, or None if an error occurred.
     """
     await __inject_attributes(page)
+    await PlaywrightManager().register_elements(page)
     accessibility_tree: Dict[str, Any] = await page.accessibility.snapshot(
         interesting_only=True
     )  # type: ignore
 
-    with open(
-        os.path.join(SOURCE_LOG_FOLDER_PATH, "json_accessibility_dom.json"),
-        "w",
-        encoding="utf-8",
-    ) as f:
-        f.write(json.dumps(accessibility_tree, indent=2))
-        logger.debug("json_accessibility_dom.json saved")
+    if debug_artifacts.enabled:
+        # the tree is enriched in place below, so snapshot it now (compact dumps use the fast C encoder)
+        debug_artifacts.write(
+            "json_accessibility_dom.json",
+            json.dumps(accessibility_tree, separators=(",", ":")),
+        )
 
     await __cleanup_dom(page)
     try:
@@ -621,15 +620,7 @@ async def do_get_accessibility_info(page: Page, only_input_fields: bool = False)
 
         logger.debug("Enhanced Accessibility Tree ready")
 
-        with open(
-            os.path.join(
-                SOURCE_LOG_FOLDER_PATH, "json_accessibility_dom_enriched.json"
-            ),
-            "w",
-            encoding="utf-8",
-        ) as f:
-            f.write(json.dumps(enhanced_tree, indent=2))
-            logger.debug("json_accessibility_dom_enriched.json saved")
+        debug_artifacts.write("json_accessibility_dom_enriched.json", enhanced_tree)
 
         return enhanced_tree
     except Exception as e:
@@ -0,0 +1,119 @@
+import argparse
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+from tabulate import tabulate
+
+from agentq.config.config import PROJECT_ROOT
+
+# cold start of the CLI, the Flask server and the async server
+DEFAULT_TARGETS = ["agentq.__main__", "server", "async_server"]
+
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int, int]]:
+    """
+    Parses the output of `python -X importtime`.
+
+    Returns:
+        List[Tuple[str, int, int]]: (module, self time, cumulative time) in microseconds, in import order.
+    """
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:") :].split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue  # the header line
+        imports.append((parts[2].rstrip(), int(parts[0]), int(parts[1])))
+    return imports
+
+
+def measure_import(module: str) -> List[Tuple[str, int, int]]:
+    """Imports the module in a fresh interpreter with `-X importtime` and returns the parsed timings."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr[-2000:]}")
+    return parse_importtime(result.stderr)
+
+
+def benchmark(module: str, runs: int = 3) -> Dict:
+    """
+    Measures the cold import time of a module over several fresh interpreters.
+
+    Returns:
+        Dict: The median total import time in milliseconds and the slowest packages of the last run.
+    """
+    totals = []
+    imports: List[Tuple[str, int, int]] = []
+    for _ in range(runs):
+        imports = measure_import(module)
+        # the requested module is imported last, its cumulative time covers everything it pulled in
+        totals.append(imports[-1][2] / 1000)
+    # a top-level package's cumulative time covers the submodules and dependencies it imported
+    packages: Dict[str, int] = {}
+    for name, _, cumulative in imports:
+        package = name.strip()
+        if "." not in package and package != module:
+            packages[package] = max(packages.get(package, 0), cumulative)
+    return {
+        "module": module,
+        "median_ms": round(statistics.median(totals), 1),
+        "min_ms": round(min(totals), 1),
+        "modules_imported": len(imports),
+        "slowest_packages": sorted(
+            packages.items(), key=lambda item: item[1], reverse=True
+        ),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Measure the cold start import time of the agentq entry points with `python -X importtime`."
+    )
+    parser.add_argument(
+        "modules",
+        nargs="*",
+        default=DEFAULT_TARGETS,
+        help=f"Modules to import (default: {' '.join(DEFAULT_TARGETS)})",
+    )
+    parser.add_argument("--runs", type=int, default=3, help="Runs per module")
+    parser.add_argument(
+        "--top", type=int, default=10, help="Slowest top-level packages to show"
+    )
+    args = parser.parse_args()
+
+    results = [benchmark(module, args.runs) for module in args.modules]
+    print(
+        tabulate(
+            [
+                [
+                    result["module"],
+                    result["median_ms"],
+                    result["min_ms"],
+                    result["modules_imported"],
+                ]
+                for result in results
+            ],
+            headers=["Module", "Median (ms)", "Min (ms)", "Modules Imported"],
+            tablefmt="grid",
+        )
+    )
+    for result in results:
+        print(f"\nSlowest packages imported by {result['module']}:")
+        print(
+            tabulate(
+                [
+                    [package, round(cumulative / 1000, 1)]
+                    for package, cumulative in result["slowest_packages"][: args.top]
+                ],
+                headers=["Package", "Cumulative (ms)"],
+                tablefmt="grid",
+            )
+        )
@@ -0,0 +1,59 @@
+import functools
+import inspect
+import os
+from typing import Any, Callable
+
+_TRACING_ENV_VARS = ("LANGCHAIN_TRACING_V2", "LANGSMITH_TRACING")
+
+
+def langsmith_enabled() -> bool:
+    return any(
+        os.getenv(env_var, "").lower() == "true" for env_var in _TRACING_ENV_VARS
+    )
+
+
+def traceable(*traceable_args: Any, **traceable_kwargs: Any):
+    """
+    Drop-in replacement for `langsmith.traceable` that defers importing langsmith until the decorated
+    function is first called.
+
+    The decision is taken on the first call rather than at import, so environment variables loaded later
+    (e.g. by `load_dotenv` in the Orchestrator) are respected. When LangSmith tracing is not enabled the
+    function is called directly and langsmith is never imported.
+
+    Example:
+        @traceable(run_type="chain", name="agent_run")
+        async def run(self, input_data): ...
+    """
+
+    def decorator(func: Callable) -> Callable:
+        target = None
+
+        def resolve() -> Callable:
+            nonlocal target
+            if target is None:
+                if langsmith_enabled():
+                    from langsmith import traceable as langsmith_traceable
+
+                    target = langsmith_traceable(*traceable_args, **traceable_kwargs)(
+                        func
+                    )
+                else:
+                    target = func
+            return target
+
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                return await resolve()(*args, **kwargs)
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            return resolve()(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
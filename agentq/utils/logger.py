@@ -1,10 +1,19 @@
+import atexit
 import logging
 import os
-from typing import Union
+import queue
+import sys
+import threading
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional, Union
 
-# Create a logs directory if it doesn't exist
+# The logs directory is created when the first record is written, not at import
 log_directory = "logs"
-os.makedirs(log_directory, exist_ok=True)
+
+# Level of the app.log logger and of the console output. Call sites pass %-style arguments
+# (logger.debug("Q: %s", q)) so disabled levels cost a level check and no string formatting.
+LOG_LEVEL = os.getenv("AGENTQ_LOG_LEVEL", "INFO").upper()
+CONSOLE_LOG_LEVEL = os.getenv("AGENTQ_CONSOLE_LOG_LEVEL", "INFO").upper()
 
 # Configure the root logger
 logging.basicConfig(
@@ -16,9 +25,84 @@ logging.basicConfig(
 for handler in logging.root.handlers[:]:
     logging.root.removeHandler(handler)
 
+
+class _LogFileHandler(logging.FileHandler):
+    """A FileHandler that opens its file, creating the logs directory if needed, on the first record."""
+
+    def __init__(self, filename: str):
+        super().__init__(filename, delay=True)
+
+    def _open(self):
+        os.makedirs(os.path.dirname(self.baseFilename), exist_ok=True)
+        return super()._open()
+
+
+class _ConsoleFormatter(logging.Formatter):
+    """Prints the bare message, resetting the terminal color after colored lines."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        message = super().format(record)
+        if "\033[" in message:
+            message += "\033[0m"
+        return message
+
+
+_log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+_listener: Optional[QueueListener] = None
+_listener_lock = threading.Lock()
+
+
+def _start_listener():
+    global _listener
+    with _listener_lock:
+        if _listener is not None:
+            return
+        file_handler = _LogFileHandler(os.path.join(log_directory, "app.log"))
+        console_handler = logging.StreamHandler(sys.stdout)
+        console_handler.setLevel(CONSOLE_LOG_LEVEL)
+        console_handler.setFormatter(_ConsoleFormatter())
+        # only the console logger is printed, everything is written to app.log
+        console_handler.addFilter(lambda record: record.name == console.name)
+        _listener = QueueListener(
+            _log_queue, file_handler, console_handler, respect_handler_level=True
+        )
+        _listener.start()
+        atexit.register(stop_logging)
+
+
+class _AsyncQueueHandler(QueueHandler):
+    """
+    Hands records to a background thread which does the file and console I/O, so logging never blocks the
+    event loop. The listener thread is started with the first record.
+    """
+
+    def emit(self, record: logging.LogRecord):
+        if _listener is None:
+            _start_listener()
+        super().emit(record)
+
+
+def stop_logging():
+    """Writes out the queued records and stops the listener thread. Registered to run at exit."""
+    global _listener
+    with _listener_lock:
+        if _listener is None:
+            return
+        _listener.stop()
+        _listener = None
+
+
+_queue_handler = _AsyncQueueHandler(_log_queue)
+
 logger = logging.getLogger(__name__)
-logger.addHandler(logging.FileHandler(os.path.join(log_directory, "app.log")))
-logger.setLevel(logging.INFO)
+logger.addHandler(_queue_handler)
+logger.setLevel(LOG_LEVEL)
+
+# Status lines meant for whoever runs agentq (state changes, results, errors), printed to stdout
+console = logging.getLogger("agentq.console")
+console.addHandler(_queue_handler)
+console.setLevel(CONSOLE_LOG_LEVEL)
+console.propagate = False
 
 # logging.getLogger("httpcore").setLevel(logging.WARNING)
 # logging.getLogger("httpx").setLevel(logging.WARNING)
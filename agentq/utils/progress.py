@@ -0,0 +1,50 @@
+import contextvars
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Tuple
+
+from agentq.utils.logger import logger
+
+ProgressCallback = Callable[[Dict[str, Any]], None]
+
+_listeners: contextvars.ContextVar[Tuple[ProgressCallback, ...]] = (
+    contextvars.ContextVar("agentq_progress_listeners", default=())
+)
+
+
+def report_progress(event: str, **data: Any):
+    """
+    Notifies the progress listeners bound to the current execution context, e.g. the job running this objective.
+
+    Events are plain dicts with an "event" name, a unix "time" and the given data. Without a listener this is a no-op.
+
+    Args:
+        event (str): The event name, e.g. "task_completed", "mcts_iteration" or "dpo_pair".
+        **data: JSON-serializable details of the event.
+    """
+    listeners = _listeners.get()
+    if not listeners:
+        return
+    progress_event = {"event": event, "time": time.time(), **data}
+    for listener in listeners:
+        try:
+            listener(progress_event)
+        except Exception as e:
+            logger.error(f"Progress listener failed on {event}: {e}")
+
+
+@contextmanager
+def progress_listener(callback: ProgressCallback) -> Iterator[ProgressCallback]:
+    """
+    Binds a progress listener to the current execution context. Like the session page (see PlaywrightManager.use_page),
+    the binding follows the asyncio tasks created inside the block and stays invisible to concurrent sessions.
+
+    Example:
+        with progress_listener(events.append):
+            await orchestrator.execute_command(command)
+    """
+    token = _listeners.set(_listeners.get() + (callback,))
+    try:
+        yield callback
+    finally:
+        _listeners.reset(token)
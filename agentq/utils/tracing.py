@@ -0,0 +1,402 @@
+import argparse
+import contextvars
+import functools
+import itertools
+import json
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Union
+
+from tabulate import tabulate
+
+from agentq.utils.logger import logger
+
+# Set this to a file path to export every span of the run as one JSON object per line.
+TRACE_FILE_ENV_VAR = "AGENTQ_TRACE_FILE"
+
+_span_ids = itertools.count(1)
+_current_span: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar(
+    "agentq_current_span", default=None
+)
+
+
+@dataclass
+class Span:
+    """
+    A timed stage of the agent loop.
+
+    Attributes:
+        name (str): The stage name, e.g. "dom.extract", "llm.agentq_actor", "skill.click" or "mcts.expand".
+        start (float): Monotonic start time in seconds (time.perf_counter).
+        end (float): Monotonic end time in seconds, None while the span is open.
+        wall_time (float): Unix timestamp of the start, to correlate spans with logs.
+        attributes (Dict[str, Any]): Free-form details such as token counts or the selector used.
+    """
+
+    name: str
+    start: float
+    end: Optional[float] = None
+    wall_time: float = field(default_factory=time.time)
+    span_id: int = field(default_factory=lambda: next(_span_ids))
+    parent_id: Optional[int] = None
+    attributes: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def duration(self) -> float:
+        if self.end is None:
+            return 0.0
+        return self.end - self.start
+
+    def set_attribute(self, key: str, value: Any):
+        self.attributes[key] = value
+
+    def set_attributes(self, **attributes: Any):
+        self.attributes.update(attributes)
+
+    def to_dict(self) -> Dict[str, Any]:
+        span_dict = asdict(self)
+        span_dict["duration_ms"] = round(self.duration * 1000, 3)
+        return span_dict
+
+
+class SpanExporter:
+    """Receives every finished span. Subclasses decide where the span goes."""
+
+    def export(self, span: Span):
+        raise NotImplementedError("This method should be overridden by subclasses.")
+
+    def shutdown(self):
+        pass
+
+
+class JsonlSpanExporter(SpanExporter):
+    """Appends finished spans to a local JSONL file, one span per line."""
+
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        directory = os.path.dirname(file_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(file_path, "a", encoding="utf-8", buffering=1)
+        self._lock = threading.Lock()
+
+    def export(self, span: Span):
+        line = json.dumps(span.to_dict(), default=str, separators=(",", ":"))
+        with self._lock:
+            self._file.write(line + "\n")
+
+    def shutdown(self):
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+
+class InMemorySpanExporter(SpanExporter):
+    """Keeps finished spans in memory, e.g. to build a report at the end of a run."""
+
+    def __init__(self):
+        self.spans: List[Span] = []
+
+    def export(self, span: Span):
+        self.spans.append(span)
+
+    def clear(self):
+        self.spans = []
+
+
+_span_collection: contextvars.ContextVar[Optional[List[Span]]] = contextvars.ContextVar(
+    "agentq_span_collection", default=None
+)
+
+
+class ContextSpanCollector(SpanExporter):
+    """
+    Hands every span to the collection bound in the execution context the span finished in (see collect_spans),
+    so the spans of concurrent tasks, e.g. parallel eval workers, are kept apart.
+    """
+
+    def export(self, span: Span):
+        spans = _span_collection.get()
+        if spans is not None:
+            spans.append(span)
+
+
+_context_collector = ContextSpanCollector()
+
+
+class _NoopSpan:
+    """Returned when tracing is disabled so instrumented code pays close to nothing."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def set_attribute(self, key: str, value: Any):
+        pass
+
+    def set_attributes(self, **attributes: Any):
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class _ActiveSpan:
+    def __init__(self, tracer: "Tracer", name: str, attributes: Dict[str, Any]):
+        self._tracer = tracer
+        self._name = name
+        self._attributes = attributes
+        self._span: Optional[Span] = None
+        self._token = None
+
+    def __enter__(self) -> Span:
+        parent = _current_span.get()
+        self._span = Span(
+            name=self._name,
+            start=time.perf_counter(),
+            parent_id=parent.span_id if parent else None,
+            attributes=self._attributes,
+        )
+        self._token = _current_span.set(self._span)
+        return self._span
+
+    def __exit__(self, exc_type, exc, tb):
+        span = self._span
+        span.end = time.perf_counter()
+        if exc_type is not None:
+            span.set_attribute("error", f"{exc_type.__name__}: {exc}")
+        _current_span.reset(self._token)
+        self._tracer._export(span)
+        return False
+
+    async def __aenter__(self) -> Span:
+        return self.__enter__()
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return self.__exit__(exc_type, exc, tb)
+
+
+class Tracer:
+    """
+    Lightweight span tracer for the agent loop.
+
+    Tracing is off until an exporter is added, either explicitly or through the AGENTQ_TRACE_FILE
+    environment variable. Spans nest through a context variable, so concurrent asyncio tasks
+    keep separate parents.
+
+    Example:
+        with tracer.span("dom.extract", content_type="all_fields"):
+            ...
+    """
+
+    def __init__(self):
+        self._exporters: List[SpanExporter] = []
+        self._env_checked = False
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        if not self._env_checked:
+            self._configure_from_env()
+        return len(self._exporters) > 0
+
+    def _configure_from_env(self):
+        with self._lock:
+            if self._env_checked:
+                return
+            self._env_checked = True
+            trace_file = os.environ.get(TRACE_FILE_ENV_VAR)
+            if trace_file:
+                self._exporters.append(JsonlSpanExporter(trace_file))
+                logger.info(f"Tracing spans to {trace_file}")
+
+    def add_exporter(self, exporter: SpanExporter):
+        self._configure_from_env()
+        self._exporters.append(exporter)
+
+    def remove_exporter(self, exporter: SpanExporter):
+        if exporter in self._exporters:
+            self._exporters.remove(exporter)
+
+    def span(self, name: str, **attributes: Any) -> Union[_ActiveSpan, _NoopSpan]:
+        """
+        Opens a span usable with both `with` and `async with`.
+
+        Args:
+            name (str): The stage name.
+            **attributes: Initial span attributes.
+        """
+        if not self.enabled:
+            return _NOOP_SPAN
+        return _ActiveSpan(self, name, attributes)
+
+    def _export(self, span: Span):
+        for exporter in self._exporters:
+            try:
+                exporter.export(span)
+            except Exception as e:
+                logger.error(f"Failed to export span {span.name}: {e}")
+
+    def shutdown(self):
+        for exporter in self._exporters:
+            exporter.shutdown()
+        self._exporters = []
+
+
+tracer = Tracer()
+
+
+def traced(name: str) -> Callable:
+    """
+    Decorator that wraps every call of an async function in a span named `name`.
+    """
+
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            if not tracer.enabled:
+                return await func(*args, **kwargs)
+            with tracer.span(name):
+                return await func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+@contextmanager
+def collect_spans() -> Iterator[List[Span]]:
+    """
+    Collects the spans finished inside the block, including those of the asyncio tasks it creates, into a list.
+    Turns tracing on for the rest of the run if it was off.
+
+    Example:
+        with collect_spans() as spans:
+            await orchestrator.execute_command(command)
+        print_span_report(spans)
+    """
+    if _context_collector not in tracer._exporters:
+        tracer.add_exporter(_context_collector)
+    spans: List[Span] = []
+    token = _span_collection.set(spans)
+    try:
+        yield spans
+    finally:
+        _span_collection.reset(token)
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    # rounded first so float error (0.07 * 100 = 7.000000000000001) does not push the rank up by one
+    rank = math.ceil(round(fraction * len(sorted_values), 9))
+    return sorted_values[max(0, min(len(sorted_values), rank) - 1)]
+
+
+def summarize_spans(
+    spans: Iterable[Union[Span, Dict[str, Any]]],
+) -> List[Dict[str, Any]]:
+    """
+    Aggregates spans per stage name.
+
+    Args:
+        spans: Span objects or span dicts as written by JsonlSpanExporter.
+
+    Returns:
+        List[Dict[str, Any]]: One row per stage with count, total, p50, p95 and max in milliseconds, and summed token counts for LLM stages, sorted by total time.
+    """
+    durations: Dict[str, List[float]] = {}
+    tokens: Dict[str, Dict[str, int]] = {}
+    for span in spans:
+        if isinstance(span, Span):
+            name, duration_ms, attributes = (
+                span.name,
+                span.duration * 1000,
+                span.attributes,
+            )
+        else:
+            name, duration_ms, attributes = (
+                span["name"],
+                span["duration_ms"],
+                span.get("attributes", {}),
+            )
+        durations.setdefault(name, []).append(duration_ms)
+        for key in ("prompt_tokens", "completion_tokens"):
+            if attributes.get(key) is not None:
+                stage_tokens = tokens.setdefault(name, {})
+                stage_tokens[key] = stage_tokens.get(key, 0) + attributes[key]
+
+    rows = []
+    for name, values in durations.items():
+        values.sort()
+        rows.append(
+            {
+                "stage": name,
+                "count": len(values),
+                "total_ms": round(sum(values), 2),
+                "p50_ms": round(percentile(values, 0.5), 2),
+                "p95_ms": round(percentile(values, 0.95), 2),
+                "max_ms": round(values[-1], 2),
+                **tokens.get(name, {}),
+            }
+        )
+    rows.sort(key=lambda row: row["total_ms"], reverse=True)
+    return rows
+
+
+def load_spans(file_path: str) -> List[Dict[str, Any]]:
+    with open(file_path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def print_span_report(spans: Iterable[Union[Span, Dict[str, Any]]]):
+    rows = summarize_spans(spans)
+    if not rows:
+        print("No spans recorded.")
+        return
+    headers = [
+        "Stage",
+        "Count",
+        "Total (ms)",
+        "p50 (ms)",
+        "p95 (ms)",
+        "Max (ms)",
+        "Prompt Tokens",
+        "Completion Tokens",
+    ]
+    table = [
+        [
+            row["stage"],
+            row["count"],
+            row["total_ms"],
+            row["p50_ms"],
+            row["p95_ms"],
+            row["max_ms"],
+            row.get("prompt_tokens", ""),
+            row.get("completion_tokens", ""),
+        ]
+        for row in rows
+    ]
+    print(tabulate(table, headers=headers, tablefmt="grid"))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Print per-stage latency percentiles from a JSONL trace file."
+    )
+    parser.add_argument("trace_file", type=str)
+    args = parser.parse_args()
+    print_span_report(load_spans(args.trace_file))
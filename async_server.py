@@ -0,0 +1,237 @@
+import argparse
+import asyncio
+import contextlib
+import json
+from typing import Optional
+
+from aiohttp import web
+
+from agentq.core.orchestrator.jobs import JobKind, JobManager, JobQueueFullError
+from agentq.core.orchestrator.session_pool import PoolFullError, SessionPool
+from agentq.utils.logger import logger
+
+POOL_KEY = web.AppKey("session_pool", SessionPool)
+QUEUE_TIMEOUT_KEY = web.AppKey("queue_timeout", float)
+JOBS_KEY = web.AppKey("jobs", JobManager)
+
+
+def _goal_or_error(request: web.Request):
+    goal = request.query.get("goal")
+    if not goal:
+        return None, web.json_response({"error": "No goal provided"}, status=400)
+    return goal, None
+
+
+def _pool_full_response(error: Exception) -> web.Response:
+    return web.json_response(
+        {"error": str(error)}, status=503, headers={"Retry-After": "5"}
+    )
+
+
+async def _session_or_error(request: web.Request, stack: contextlib.AsyncExitStack):
+    """
+    Waits for a free session of the pool and enters it on `stack`. Only the wait is turned into a 503, errors
+    raised while the session runs go through the usual error handling.
+    """
+    pool = request.app[POOL_KEY]
+    try:
+        session = await stack.enter_async_context(
+            pool.acquire(timeout=request.app[QUEUE_TIMEOUT_KEY])
+        )
+    except PoolFullError as e:
+        return None, _pool_full_response(e)
+    except asyncio.TimeoutError:
+        return None, _pool_full_response(
+            TimeoutError("Timed out waiting for a free session")
+        )
+    return session, None
+
+
+async def execute_command(request: web.Request) -> web.Response:
+    goal, error_response = _goal_or_error(request)
+    if error_response is not None:
+        return error_response
+    async with contextlib.AsyncExitStack() as stack:
+        session, error_response = await _session_or_error(request, stack)
+        if error_response is not None:
+            return error_response
+        result = await session.run_command(goal)
+    return web.json_response({"result": result})
+
+
+async def run_mcts(request: web.Request) -> web.Response:
+    goal, error_response = _goal_or_error(request)
+    if error_response is not None:
+        return error_response
+    async with contextlib.AsyncExitStack() as stack:
+        session, error_response = await _session_or_error(request, stack)
+        if error_response is not None:
+            return error_response
+        dpo_pairs = await session.run_mcts(goal)
+    return web.json_response(
+        {"result": [pair.model_dump(mode="json") for pair in dpo_pairs]}
+    )
+
+
+async def health(request: web.Request) -> web.Response:
+    return web.json_response(request.app[POOL_KEY].stats())
+
+
+async def submit_job(request: web.Request) -> web.Response:
+    params = dict(request.query)
+    if request.can_read_body:
+        try:
+            params.update(await request.json())
+        except json.JSONDecodeError:
+            return web.json_response({"error": "Body must be JSON"}, status=400)
+    goal = params.get("goal")
+    if not goal:
+        return web.json_response({"error": "No goal provided"}, status=400)
+    try:
+        kind = JobKind(params.get("kind", JobKind.EXECUTE.value))
+    except ValueError:
+        kinds = [kind.value for kind in JobKind]
+        return web.json_response({"error": f"kind must be one of {kinds}"}, status=400)
+    try:
+        job = request.app[JOBS_KEY].submit(kind, goal)
+    except JobQueueFullError as e:
+        return _pool_full_response(e)
+    return web.json_response(
+        {
+            "job_id": job.job_id,
+            "status": job.status.value,
+            "status_url": f"/jobs/{job.job_id}",
+            "events_url": f"/jobs/{job.job_id}/events",
+        },
+        status=202,
+    )
+
+
+def _get_job(request: web.Request):
+    job = request.app[JOBS_KEY].get(request.match_info["job_id"])
+    if job is None:
+        raise web.HTTPNotFound(
+            text=json.dumps({"error": "Unknown job"}), content_type="application/json"
+        )
+    return job
+
+
+def _event_index(
+    value: Optional[str], name: str, default: Optional[int]
+) -> Optional[int]:
+    """Parses an event index sent by the client, a 400 when it is not a non-negative integer."""
+    if not value:
+        return default
+    try:
+        index = int(value)
+    except ValueError:
+        index = -1
+    if index < 0:
+        raise web.HTTPBadRequest(
+            text=json.dumps({"error": f"{name} must be a non-negative integer"}),
+            content_type="application/json",
+        )
+    return index
+
+
+async def get_job(request: web.Request) -> web.Response:
+    """Polling endpoint: the job's state, plus its events from index `after` when given."""
+    job = _get_job(request)
+    after = _event_index(request.query.get("after"), "after", None)
+    return web.json_response(job.to_dict(events_after=after))
+
+
+async def stream_job_events(request: web.Request) -> web.StreamResponse:
+    """Streams the job's progress events as server-sent events until the job has finished."""
+    job = _get_job(request)
+    last_event_id = _event_index(
+        request.headers.get("Last-Event-ID"), "Last-Event-ID", -1
+    )
+    after = max(last_event_id + 1, _event_index(request.query.get("after"), "after", 0))
+    response = web.StreamResponse(
+        headers={"Content-Type": "text/event-stream", "Cache-Control": "no-cache"}
+    )
+    await response.prepare(request)
+    index = after
+    async for event in request.app[JOBS_KEY].stream_events(job.job_id, after=after):
+        payload = json.dumps(event, default=str)
+        await response.write(
+            f"id: {index}\nevent: {event['event']}\ndata: {payload}\n\n".encode()
+        )
+        index += 1
+    await response.write_eof()
+    return response
+
+
+def create_app(pool: SessionPool, queue_timeout: float = 300) -> web.Application:
+    """
+    Builds the async server. Unlike the Flask server in server.py, requests run concurrently on a pool of
+    pre-warmed sessions (see SessionPool): the browser is started and the agents are constructed once at startup.
+
+    /execute and /execute_mcts answer once the objective is done. For long objectives, POST /jobs queues a
+    background job instead and returns its id; poll GET /jobs/{job_id} or stream GET /jobs/{job_id}/events (SSE).
+
+    Args:
+        pool (SessionPool): The session pool, started when the app starts.
+        queue_timeout (float, optional): Maximum wait in seconds for a free session before answering 503. Defaults to 300.
+    """
+    app = web.Application()
+    app[POOL_KEY] = pool
+    app[QUEUE_TIMEOUT_KEY] = queue_timeout
+    app[JOBS_KEY] = JobManager(pool)
+    app.router.add_get("/execute", execute_command)
+    app.router.add_get("/execute_mcts", run_mcts)
+    app.router.add_get("/health", health)
+    app.router.add_post("/jobs", submit_job)
+    app.router.add_get("/jobs/{job_id}", get_job)
+    app.router.add_get("/jobs/{job_id}/events", stream_job_events)
+
+    async def start_pool(app: web.Application):
+        await app[POOL_KEY].start()
+        await app[JOBS_KEY].start()
+
+    async def stop_pool(app: web.Application):
+        await app[JOBS_KEY].stop()
+        await app[POOL_KEY].stop()
+
+    app.on_startup.append(start_pool)
+    app.on_cleanup.append(stop_pool)
+    return app
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Serve AgentQ goals concurrently from a pool of warm browser sessions."
+    )
+    parser.add_argument("--host", type=str, default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument(
+        "--pool_size",
+        type=int,
+        default=2,
+        help="Number of concurrent sessions (default: 2)",
+    )
+    parser.add_argument(
+        "--max_waiting",
+        type=int,
+        default=16,
+        help="Requests allowed to wait for a session before new ones get a 503 (default: 16)",
+    )
+    parser.add_argument(
+        "--queue_timeout",
+        type=float,
+        default=300,
+        help="Seconds a request waits for a free session before it gets a 503 (default: 300)",
+    )
+    parser.add_argument("--homepage", type=str, default="https://google.com")
+    args = parser.parse_args()
+
+    session_pool = SessionPool(
+        size=args.pool_size, homepage=args.homepage, max_waiting=args.max_waiting
+    )
+    logger.info(
+        f"Starting async server with {args.pool_size} sessions on {args.host}:{args.port}"
+    )
+    web.run_app(
+        create_app(session_pool, args.queue_timeout), host=args.host, port=args.port
+    )
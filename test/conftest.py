@@ -0,0 +1,25 @@
+import os
+
+import pytest
+
+from test.mock_site import mock_site_in_background
+
+
+@pytest.fixture(scope="session")
+def mock_site():
+    """
+    Starts the bundled mock web site for the whole test session.
+
+    Binds to a free port by default so it never collides with a dev server on :3000.
+    Set AGENTQ_MOCK_SITE_PORT=3000 to serve it where `run_agent` and `browser_mcts.main(eval_mode=True)` expect it.
+    """
+    port = int(os.environ.get("AGENTQ_MOCK_SITE_PORT", "0"))
+    latency_ms = int(os.environ.get("AGENTQ_MOCK_SITE_LATENCY_MS", "0"))
+    with mock_site_in_background(port=port, latency_ms=latency_ms) as site:
+        yield site
+
+
+@pytest.fixture
+def mock_site_url(mock_site):
+    """The homepage URL of the running mock site."""
+    return mock_site.homepage
@@ -0,0 +1,147 @@
+import json
+import os
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from agentq.utils.logger import logger
+
+
+class EvalSummary:
+    """Running pass/fail/skip counts and times of an eval run, updated as results are recorded."""
+
+    def __init__(self):
+        self.completed = 0
+        self.passed = 0
+        self.failed = 0
+        self.skipped = 0
+        self.total_time = 0.0
+
+    def _update(self, result: Dict[str, Any], sign: int):
+        score = result["score"]
+        self.completed += sign
+        if score == 1:
+            self.passed += sign
+        elif score < 0:
+            self.skipped += sign
+        else:
+            self.failed += sign
+        self.total_time += sign * result["tct"]
+
+    def add(self, result: Dict[str, Any]):
+        self._update(result, 1)
+
+    def remove(self, result: Dict[str, Any]):
+        self._update(result, -1)
+
+    @property
+    def average_time(self) -> float:
+        return self.total_time / self.completed if self.completed else 0.0
+
+    def __str__(self) -> str:
+        return (
+            f"{self.completed} completed: {self.passed} passed, {self.failed} failed, "
+            f"{self.skipped} skipped, {round(self.total_time, 2)}s"
+        )
+
+
+class EvalStore:
+    """
+    Checkpoint of an eval run: an append-only JSONL file with one line per completed task, flushed and fsynced
+    before the next task starts, so a crash loses at most the task in flight.
+
+    Each line is {"index": <task index in the test file>, "result": <task result>}. When a task is recorded
+    twice (e.g. rerun after a resume) the last line wins. A line cut short by a crash is dropped on load and
+    the file is truncated back to the last complete line.
+
+    Example:
+        store = EvalStore(results_dir, resume=True)
+        for index, task_config in store.pending(indexed_task_configs):
+            store.append(index, await run_task(task_config))
+        print(store.summary)
+    """
+
+    FILE_NAME = "results.jsonl"
+
+    def __init__(self, results_dir: str, resume: bool = False):
+        """
+        Args:
+            results_dir (str): Directory of the run, the store is `<results_dir>/results.jsonl`.
+            resume (bool, optional): Load the results already in the store. Otherwise an existing store is
+                                     moved to `results.jsonl.previous` and the run starts empty. Defaults to False.
+        """
+        self.path = os.path.join(results_dir, self.FILE_NAME)
+        self.summary = EvalSummary()
+        self._records: Dict[str, Tuple[int, Dict[str, Any]]] = {}
+        if os.path.exists(self.path):
+            if resume:
+                self._load()
+            else:
+                os.replace(self.path, f"{self.path}.previous")
+                logger.info(f"Moved the previous eval store to {self.path}.previous")
+        self._file = open(self.path, "a", encoding="utf-8")
+
+    def _load(self):
+        valid_size = 0
+        with open(self.path, "rb") as f:
+            for line in f:
+                # a complete line that lost its newline is dropped too, the next append would extend it
+                record = None
+                if line.endswith(b"\n"):
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        pass
+                if record is None:
+                    logger.warning(
+                        f"Dropping incomplete record at byte {valid_size} of {self.path}"
+                    )
+                    break
+                self._record(record["index"], record["result"])
+                valid_size += len(line)
+        if valid_size != os.path.getsize(self.path):
+            with open(self.path, "r+b") as f:
+                f.truncate(valid_size)
+        logger.info(f"Loaded {self.summary.completed} results from {self.path}")
+
+    def _record(self, index: int, result: Dict[str, Any]):
+        task_id = str(result["task_id"])
+        previous = self._records.get(task_id)
+        if previous is not None:
+            self.summary.remove(previous[1])
+        self._records[task_id] = (index, result)
+        self.summary.add(result)
+
+    def append(self, index: int, result: Dict[str, Any]):
+        """Records a task result durably: the line is on disk when this returns."""
+        line = json.dumps({"index": index, "result": result}, ensure_ascii=False)
+        self._file.write(line + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._record(index, result)
+
+    def __contains__(self, task_id: Any) -> bool:
+        return str(task_id) in self._records
+
+    @property
+    def last_completed_index(self) -> Optional[int]:
+        """Highest task index with a result. With parallel workers earlier tasks may still be missing."""
+        if not self._records:
+            return None
+        return max(index for index, _ in self._records.values())
+
+    def pending(
+        self, indexed_task_configs: Iterable[Tuple[int, Dict[str, Any]]]
+    ) -> List[Tuple[int, Dict[str, Any]]]:
+        """Returns the (index, task config) pairs that have no result yet."""
+        return [
+            (index, task_config)
+            for index, task_config in indexed_task_configs
+            if task_config.get("task_id") not in self
+        ]
+
+    def results(self) -> List[Tuple[int, Dict[str, Any]]]:
+        """Returns the (index, result) pairs recorded so far, in task order."""
+        return sorted(self._records.values(), key=lambda record: record[0])
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
@@ -1,13 +1,16 @@
 """base class for evaluation"""
 
+import asyncio
 import collections
+import contextvars
 import html
-import time
+import inspect
+import os
 import urllib
 import urllib.parse
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Union
 
-from playwright.sync_api import CDPSession, Page
+from playwright.async_api import CDPSession, Page
 from termcolor import colored
 
 from agentq.core.agent.eval_agent import EvalAgent
@@ -15,13 +18,66 @@ from agentq.core.models.models import EvalAgentInput, EvalAgentOutput
 from agentq.core.skills.get_dom_with_content_type import get_dom_with_content_type
 from agentq.core.skills.get_screenshot import get_screenshot
 from agentq.core.skills.get_url import geturl
+from agentq.core.web_driver.playwright import PlaywrightManager
 from agentq.utils.logger import logger
+from test.llm_grader import FUZZY_MATCH, UA_MATCH, GradingRequest, llm_grader
 from test.test_utils import (
     clean_answer,
     evaluate_exact_match,
-    evaluate_fuzzy_match,
     evaluate_must_include,
-    evaluate_ua_match,
+)
+
+# Set to "true" to stop evaluating a task once one evaluator scores 0
+EVAL_SHORT_CIRCUIT_ENV_VAR = "AGENTQ_EVAL_SHORT_CIRCUIT"
+
+
+class EvaluationContext:
+    """Page data of one task (URL, DOM, screenshot), extracted on first use and shared by its evaluators.
+
+    EvaluatorComb binds a context while its evaluators run. Evaluators get it with `EvaluationContext.for_page`.
+
+    Example:
+        context = EvaluationContext.for_page(page)
+        dom_content, screenshot = await asyncio.gather(context.dom(), context.screenshot())
+    """
+
+    def __init__(self, page: Page) -> None:
+        self.page = page
+        self._values: Dict[str, asyncio.Future] = {}
+
+    @classmethod
+    def for_page(cls, page: Page) -> "EvaluationContext":
+        """Returns the bound context of the page, or a new one when evaluating outside EvaluatorComb."""
+        context = _evaluation_context.get()
+        if context is not None and context.page is page:
+            return context
+        return cls(page)
+
+    async def _once(self, name: str, extract: Callable[[], Awaitable[Any]]) -> Any:
+        value = self._values.get(name)
+        if value is None:
+            value = asyncio.ensure_future(extract())
+            self._values[name] = value
+        # an evaluator cancelled by the short circuit must not cancel the extraction for the others
+        return await asyncio.shield(value)
+
+    async def url(self) -> str:
+        return await self._once("url", lambda: geturl(webpage=self.page))
+
+    async def dom(self) -> Any:
+        return await self._once(
+            "dom",
+            lambda: get_dom_with_content_type(
+                content_type="all_fields", webpage=self.page
+            ),
+        )
+
+    async def screenshot(self) -> str:
+        return await self._once("screenshot", lambda: get_screenshot(webpage=self.page))
+
+
+_evaluation_context: contextvars.ContextVar[Optional[EvaluationContext]] = (
+    contextvars.ContextVar("agentq_evaluation_context", default=None)
 )
 
 
@@ -89,18 +145,25 @@ class StringEvaluator(Evaluator):
                 if value == "N/A":
                     score *= evaluate_exact_match(ref=value, pred=pred)
                     if score != 1:
-                        score = 1.0 * evaluate_ua_match(
-                            intent=task_config["intent"],
-                            ref=task_config["eval"]["string_note"],
-                            pred=pred,
+                        score = 1.0 * await llm_grader.grade(
+                            GradingRequest(
+                                UA_MATCH,
+                                pred=pred,
+                                reference=task_config["eval"]["string_note"],
+                                question=intent,
+                            )
                         )
                 else:
                     logger.info(f"Evaluating generic for answer: {answer}")
                     assert isinstance(value, List)
-                    for reference in value:
-                        score *= evaluate_fuzzy_match(
-                            ref=reference, pred=pred, intent=intent
-                        )
+                    # all references are graded in one batch
+                    for verdict in await llm_grader.grade_many(
+                        [
+                            GradingRequest(FUZZY_MATCH, pred, reference, intent)
+                            for reference in value
+                        ]
+                    ):
+                        score *= verdict
             else:
                 logger.info(f"Unknown approach value received: {approach}")
         return {"score": score}
@@ -196,8 +259,15 @@ class HTMLContentEvaluator(Evaluator):
     """Evaluates if specified HTML content or elements appear on the webpage.
 
     This involves navigating to URLs specified in the configuration and checking for the presence of HTML elements or content using various strategies.
+
+    Targets on other URLs are checked concurrently, each URL in its own page of the eval browser context, and
+    targets sharing a URL share the navigation. Targets with prep_actions get a fresh page, since their actions
+    modify it.
     """
 
+    # upper bound of the wait for a target page to settle after loading, in seconds
+    settle_timeout: float = 3.0
+
     async def __call__(
         self,
         task_config: Dict[str, Any],
@@ -221,85 +291,124 @@ class HTMLContentEvaluator(Evaluator):
         """
         targets = task_config["eval"]["program_html"]
 
+        # group the targets by the page they are checked on, keeping their order within a page
+        groups: Dict[Any, Tuple[str, List[Dict[str, Any]]]] = {}
+        for index, target in enumerate(targets):
+            target_url = self._resolve_url(target["url"], page)
+            key = (target_url, index) if "prep_actions" in target else target_url
+            groups.setdefault(key, (target_url, []))[1].append(target)
+
+        scores = await asyncio.gather(
+            *(
+                self._evaluate_targets(target_url, group_targets, page)
+                for target_url, group_targets in groups.values()
+            )
+        )
+        score = 1.0
+        for group_score in scores:
+            score *= group_score
+        return {"score": score}
+
+    @staticmethod
+    def _resolve_url(target_url: str, page: Page) -> str:
+        if target_url.startswith("func"):
+            func = target_url.split("func:")[1]
+            func = func.replace("__last_url__", page.url)
+            target_url = eval(func)
+        return target_url
+
+    async def _evaluate_targets(
+        self, target_url: str, targets: List[Dict[str, Any]], page: Page
+    ) -> float:
+        # "last" is the page the agent ended on, other urls are opened next to it
+        if target_url == "last":
+            return await self._score_targets(targets, page)
+
+        target_page = await page.context.new_page()
+        try:
+            await target_page.goto(target_url, wait_until="load")
+            await PlaywrightManager().wait_for_page_settle(
+                target_page, timeout=self.settle_timeout, action="eval_navigation"
+            )
+            return await self._score_targets(targets, target_page)
+        finally:
+            await target_page.close()
+
+    async def _score_targets(self, targets: List[Dict[str, Any]], page: Page) -> float:
         score = 1.0
         for target in targets:
-            target_url: str = target["url"]  # which url to check
-            if target_url.startswith("func"):
-                func = target_url.split("func:")[1]
-                func = func.replace("__last_url__", page.url)
-                target_url = eval(func)
-
-            locator: str = target["locator"]  # js element locator
-
-            # navigate to that url
-            if target_url != "last":
-                page.goto(target_url)
-                time.sleep(3)
-
-            # empty, use the full page
-            if not locator.strip():
-                selected_element = page.content()
-            # use JS to select the element
-            elif (
-                locator.startswith("document.")
-                or locator.startswith("[...document.")
-                or locator.startswith("jsblock:")
-            ):
-                if "prep_actions" in target:
-                    try:
-                        for prep_action in target["prep_actions"]:
-                            page.evaluate(f"() => {prep_action}")
-                    except Exception:
-                        pass
+            selected_element = html.unescape(await self._select_content(target, page))
+            score *= self._score_content(target, selected_element)
+        return score
+
+    async def _select_content(self, target: Dict[str, Any], page: Page) -> str:
+        locator: str = target["locator"]  # js element locator
+
+        # empty, use the full page
+        if not locator.strip():
+            return await page.content()
+        # use JS to select the element
+        if (
+            locator.startswith("document.")
+            or locator.startswith("[...document.")
+            or locator.startswith("jsblock:")
+        ):
+            if "prep_actions" in target:
                 try:
-                    if locator.startswith("jsblock:"):
-                        locator = locator.split("jsblock:")[1]
-
-                    selected_element = str(await page.evaluate(f"() => {locator}"))
-                    if not selected_element:
-                        selected_element = ""
+                    for prep_action in target["prep_actions"]:
+                        await page.evaluate(f"() => {prep_action}")
                 except Exception:
-                    # the page is wrong, return empty
-                    selected_element = ""
-            # run program to call API
-            elif locator.startswith("func:"):  # a helper function
-                func = locator.split("func:")[1]
-                func = func.replace("__page__", "page")
-                selected_element = eval(func)
-            else:
-                raise ValueError(f"Unknown locator: {locator}")
-
-            selected_element = html.unescape(selected_element)
-
-            if "exact_match" in target["required_contents"]:
-                required_contents = target["required_contents"]["exact_match"]
-                cur_score = evaluate_exact_match(
-                    ref=required_contents, pred=selected_element
+                    pass
+            try:
+                if locator.startswith("jsblock:"):
+                    locator = locator.split("jsblock:")[1]
+
+                selected_element = str(await page.evaluate(f"() => {locator}"))
+                return selected_element or ""
+            except Exception:
+                # the page is wrong, return empty
+                return ""
+        # run program to call API
+        if locator.startswith("func:"):  # a helper function
+            func = locator.split("func:")[1]
+            func = func.replace("__page__", "page")
+            selected_element = eval(func, globals(), {"page": page})
+            if inspect.isawaitable(selected_element):
+                selected_element = await selected_element
+            return selected_element
+        raise ValueError(f"Unknown locator: {locator}")
+
+    @staticmethod
+    def _score_content(target: Dict[str, Any], selected_element: str) -> float:
+        if "exact_match" in target["required_contents"]:
+            required_contents = target["required_contents"]["exact_match"]
+            cur_score = evaluate_exact_match(
+                ref=required_contents, pred=selected_element
+            )
+            # logger.info(f"[exact match] {cur_score}, selected element: {selected_element}, required contents: {required_contents}")
+            return float(cur_score)
+        if "must_include" in target["required_contents"]:
+            required_contents = target["required_contents"]["must_include"]
+            assert isinstance(required_contents, List)
+            score = 1.0
+            for content in required_contents:  # type: ignore
+                content_or = content.split(" |OR| ")  # type: ignore
+                cur_score = any(
+                    [
+                        evaluate_must_include(
+                            ref=content,  # type: ignore
+                            pred=selected_element,
+                            tokenize=False,
+                        )
+                        for content in content_or  # type: ignore
+                    ]
                 )
                 score *= float(cur_score)
-                # logger.info(f"[exact match] {cur_score}, selected element: {selected_element}, required contents: {required_contents}")
-            elif "must_include" in target["required_contents"]:
-                required_contents = target["required_contents"]["must_include"]
-                assert isinstance(required_contents, List)
-                for content in required_contents:  # type: ignore
-                    content_or = content.split(" |OR| ")  # type: ignore
-                    cur_score = any(
-                        [
-                            evaluate_must_include(
-                                ref=content,  # type: ignore
-                                pred=selected_element,
-                                tokenize=False,
-                            )
-                            for content in content_or  # type: ignore
-                        ]
-                    )
-                    score *= float(cur_score)
-                    # logger.info(f"[must include] {cur_score}, selected element: {selected_element}, required contents: {content_or}")
-            else:
-                raise ValueError(
-                    f"Unknown required_contents: {target['required_contents'].keys()}"
-                )
-        return {"score": score}
+                # logger.info(f"[must include] {cur_score}, selected element: {selected_element}, required contents: {content_or}")
+            return score
+        raise ValueError(
+            f"Unknown required_contents: {target['required_contents'].keys()}"
+        )
 
 
 class ManualContentEvaluator(Evaluator):
@@ -389,10 +498,10 @@ class LLMEvaluator(Evaluator):
         client: Optional[CDPSession] = None,
         answer: Optional[str] = None,
     ) -> Dict[str, Union[float, str]]:
-        # Get current page URL and DOM content
-        current_url = await geturl(webpage=page)
-        dom_content = await get_dom_with_content_type(
-            content_type="all_fields", webpage=page
+        # Get current page URL, DOM content and screenshot, shared with the other evaluators of the task
+        context = EvaluationContext.for_page(page)
+        current_url, dom_content, screenshot = await asyncio.gather(
+            context.url(), context.dom(), context.screenshot()
         )
 
         # Prepare input for the eval agent
@@ -403,9 +512,6 @@ class LLMEvaluator(Evaluator):
             current_page_dom=str(dom_content),
         )
 
-        # Get screenshot
-        screenshot = await get_screenshot(webpage=page)
-
         # Call the eval agent
         eval_output: EvalAgentOutput = await self.eval_agent.run(eval_input, screenshot)
 
@@ -420,17 +526,24 @@ class LLMEvaluator(Evaluator):
 class EvaluatorComb(Evaluator):
     """Combines multiple evaluators to perform a comprehensive evaluation based on different criteria.
 
+    The evaluators are independent and run concurrently, sharing one EvaluationContext for the page data.
+
     Attributes:
         evaluators (List[Evaluator]): A List of evaluator instances to be used for evaluation.
+        short_circuit (bool): Cancel the remaining evaluators as soon as one scores 0, since the product stays 0.
     """
 
-    def __init__(self, evaluators: List[Evaluator]) -> None:
+    def __init__(
+        self, evaluators: List[Evaluator], short_circuit: bool = False
+    ) -> None:
         """Initializes the composite evaluator with a List of individual evaluators.
 
         Parameters:
             evaluators (List[Evaluator]): The List of evaluators to include in the composite evaluation.
+            short_circuit (bool, optional): Stop evaluating once the score is 0. Defaults to False.
         """
         self.evaluators = evaluators
+        self.short_circuit = short_circuit
 
     async def __call__(
         self,
@@ -450,10 +563,43 @@ class EvaluatorComb(Evaluator):
         Returns:
             Dict[str, float|str]: "score" - The aggregated score from all evaluators, representing the overall evaluation result. "reason" - The reason for the evaluation score, if applicable.
         """
+        token = _evaluation_context.set(EvaluationContext(page))
+        try:
+            # the tasks copy the current context, so they all see the shared EvaluationContext
+            tasks = [
+                asyncio.create_task(evaluator(task_config, page, client, answer))
+                for evaluator in self.evaluators
+            ]
+        finally:
+            _evaluation_context.reset(token)
+
+        results: Dict[int, Dict[str, Union[float, str]]] = {}
+        try:
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    results[tasks.index(task)] = task.result()
+                if self.short_circuit and any(
+                    results[tasks.index(task)]["score"] == 0 for task in done
+                ):
+                    logger.info(
+                        f"Evaluation short-circuited with {len(pending)} evaluators left"
+                    )
+                    break
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+            # let the cancelled evaluators clean up, e.g. close the pages they opened
+            await asyncio.gather(*tasks, return_exceptions=True)
+
         score: float = 1.0
         reason: str | None = None
-        for evaluator in self.evaluators:
-            eval_result = await evaluator(task_config, page, client, answer)
+        # aggregate in the configured order, whichever evaluator finished first
+        for _, eval_result in sorted(results.items()):
             score: float = score * eval_result["score"]  # type: ignore
             if "reason" in eval_result:
                 if reason is None:
@@ -463,11 +609,14 @@ class EvaluatorComb(Evaluator):
         return {"score": score, "reason": reason}  # type: ignore
 
 
-def evaluator_router(task_config: Dict[str, Any]) -> EvaluatorComb:
+def evaluator_router(
+    task_config: Dict[str, Any], short_circuit: Optional[bool] = None
+) -> EvaluatorComb:
     """Creates and configures a composite evaluator based on the evaluation types specified in the configuration file.
 
     Parameters:
         task_config Dict[str, Any]: configuration specifying the evaluation types to use.
+        short_circuit (bool, optional): Stop evaluating once the score is 0. Defaults to the AGENTQ_EVAL_SHORT_CIRCUIT environment variable.
 
     Returns:
         EvaluatorComb: A composite evaluator configured with the specified types of individual evaluators.
@@ -497,4 +646,6 @@ def evaluator_router(task_config: Dict[str, Any]) -> EvaluatorComb:
         else:
             raise ValueError(f"eval_type {eval_type} is not supported")
 
-    return EvaluatorComb(evaluators)
+    if short_circuit is None:
+        short_circuit = os.getenv(EVAL_SHORT_CIRCUIT_ENV_VAR, "").lower() == "true"
+    return EvaluatorComb(evaluators, short_circuit=short_circuit)
@@ -0,0 +1,310 @@
+"""Grades answers with an LLM in batches, with verdicts cached on disk across eval runs."""
+
+import asyncio
+import hashlib
+import json
+import os
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+from agentq.config.config import PROJECT_TEST_ROOT
+from agentq.utils.logger import logger
+
+DEFAULT_GRADING_MODEL = "gpt-4-turbo-preview"
+DEFAULT_CACHE_PATH = os.path.join(PROJECT_TEST_ROOT, "cache", "llm_grades.jsonl")
+
+FUZZY_MATCH = "fuzzy_match"
+UA_MATCH = "ua_match"
+
+_FUZZY_MATCH_INSTRUCTIONS = (
+    "Help a teacher to grade the answer of a student given a question. Keep in mind that the student may use "
+    "different phrasing or wording to answer the question. The goal is to evaluate whether the answer is "
+    "semantically equivalent to the reference answer.\n"
+    "all the string 'N/A' that you see is a special sequence that means 'not achievable'\n"
+)
+_UA_MATCH_INSTRUCTIONS = (
+    "The task described is inherently unachievable due to the reason specified under 'actual unachievable reason'. "
+    "An individual previously attempted this task and was unable to complete it. They provided a reason for their "
+    "failure, which is Listed under 'reported unachievable reason'. Your role is to review both the actual and "
+    "reported reasons. Determine if the reported reason aligns with the actual reason, even if implicitly.\n"
+)
+_VERDICTS = {
+    FUZZY_MATCH: "Conclude each judgement by correct/incorrect/partially correct.",
+    UA_MATCH: "If the stated reason is in line with the actual reason, the verdict is 'same'. Otherwise, it is 'different'.",
+}
+
+
+def _normalize(text: str) -> str:
+    return re.sub(r"\s+", " ", str(text)).strip().lower()
+
+
+@dataclass(frozen=True)
+class GradingRequest:
+    """
+    Attributes:
+        kind (str): FUZZY_MATCH (is the answer semantically equivalent to the reference) or UA_MATCH (does the
+                    reported unachievable reason match the actual one).
+        pred (str): The predicted answer or reported reason.
+        reference (str): The reference answer or actual reason.
+        question (str): The task intent.
+    """
+
+    kind: str
+    pred: str
+    reference: str
+    question: str
+
+    def cache_key(self, model: str) -> str:
+        normalized = [
+            model,
+            self.kind,
+            _normalize(self.pred),
+            _normalize(self.reference),
+            _normalize(self.question),
+        ]
+        return hashlib.sha256(json.dumps(normalized).encode("utf-8")).hexdigest()
+
+    def describe(self) -> str:
+        if self.kind == UA_MATCH:
+            return (
+                f"task: {self.question}\n"
+                f"actual unachievable reason: {self.reference}\n"
+                f"reported unachievable reason: {self.pred}\n"
+            )
+        return (
+            f"question: {self.question}\n"
+            f"reference answer: {self.reference}\n"
+            f"student answer: {self.pred}\n"
+        )
+
+
+# cache key, request and the future its callers await
+_PendingGrade = Tuple[str, GradingRequest, asyncio.Future]
+
+
+def parse_verdict(kind: str, response: str) -> float:
+    """Maps a judgement to a score: 1.0 for correct/same, 0.0 for incorrect, partially correct or different."""
+    response = response.lower()
+    if kind == UA_MATCH:
+        if "different" in response:
+            return 0.0
+        if "same" in response:
+            return 1.0
+    else:
+        if "partially correct" in response or "incorrect" in response:
+            return 0.0
+        if "correct" in response:
+            return 1.0
+    raise ValueError(f"Unexpected {kind} verdict: {response}")
+
+
+class GradeCache:
+    """Verdicts keyed by the normalized (pred, reference, question) triple, appended to a JSONL file."""
+
+    def __init__(self, path: Optional[str] = DEFAULT_CACHE_PATH):
+        """
+        Args:
+            path (str, optional): The cache file. None keeps the verdicts in memory only.
+        """
+        self.path = path
+        self._verdicts: Optional[Dict[str, float]] = None
+
+    def _load(self) -> Dict[str, float]:
+        if self._verdicts is None:
+            self._verdicts = {}
+            if self.path and os.path.exists(self.path):
+                with open(self.path, encoding="utf-8") as f:
+                    for line in f:
+                        try:
+                            entry = json.loads(line)
+                        except json.JSONDecodeError:
+                            continue  # a line cut short by a crash
+                        self._verdicts[entry["key"]] = entry["verdict"]
+        return self._verdicts
+
+    def get(self, key: str) -> Optional[float]:
+        return self._load().get(key)
+
+    def put(self, key: str, verdict: float):
+        self._load()[key] = verdict
+        if self.path:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps({"key": key, "verdict": verdict}) + "\n")
+
+
+class LLMGrader:
+    """
+    Grades fuzzy matches and unachievable-reason matches with an LLM.
+
+    Requests made within `batch_window` seconds of each other, e.g. the references of a task or the tasks of
+    parallel eval workers, are graded together in one completion of up to `batch_size` items. At most
+    `max_concurrency` completions are in flight. Verdicts are cached on disk by the normalized triple, so
+    reruns only pay for new answers, and identical requests in flight share one grading.
+
+    Example:
+        scores = await llm_grader.grade_many(
+            [GradingRequest(FUZZY_MATCH, pred, reference, intent) for reference in references]
+        )
+    """
+
+    def __init__(
+        self,
+        model: str = DEFAULT_GRADING_MODEL,
+        batch_size: int = 8,
+        max_concurrency: int = 4,
+        batch_window: float = 0.05,
+        cache: Optional[GradeCache] = None,
+    ):
+        self.model = model
+        self.batch_size = batch_size
+        self.max_concurrency = max_concurrency
+        self.batch_window = batch_window
+        self.cache = cache or GradeCache()
+        self.hits = 0
+        self.completions = 0
+        self._client = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._pending: Dict[str, List[_PendingGrade]] = {}
+        self._flush_handles: Dict[str, asyncio.TimerHandle] = {}
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        self._batches: Set[asyncio.Task] = set()
+
+    @property
+    def client(self):
+        if self._client is None:
+            from openai import AsyncOpenAI
+
+            if "OPENAI_API_KEY" not in os.environ:
+                raise ValueError(
+                    "OPENAI_API_KEY environment variable must be set when using OpenAI API."
+                )
+            self._client = AsyncOpenAI(
+                api_key=os.environ["OPENAI_API_KEY"],
+                organization=os.environ.get("OPENAI_ORGANIZATION") or None,
+            )
+        return self._client
+
+    def _bind_loop(self) -> asyncio.AbstractEventLoop:
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            # asyncio primitives belong to one loop, e.g. each asyncio.run of run_tests
+            self._loop = loop
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._pending = {}
+            self._flush_handles = {}
+            self._in_flight = {}
+        return loop
+
+    async def grade(self, request: GradingRequest) -> float:
+        """Returns 1.0 or 0.0 for the request, from the cache when it was graded before."""
+        key = request.cache_key(self.model)
+        verdict = self.cache.get(key)
+        if verdict is not None:
+            self.hits += 1
+            return verdict
+        loop = self._bind_loop()
+        future = self._in_flight.get(key)
+        if future is None:
+            future = loop.create_future()
+            self._in_flight[key] = future
+            pending = self._pending.setdefault(request.kind, [])
+            pending.append((key, request, future))
+            if len(pending) >= self.batch_size:
+                self._flush(request.kind)
+            elif request.kind not in self._flush_handles:
+                self._flush_handles[request.kind] = loop.call_later(
+                    self.batch_window, self._flush, request.kind
+                )
+        return await asyncio.shield(future)
+
+    async def grade_many(self, requests: Sequence[GradingRequest]) -> List[float]:
+        return list(
+            await asyncio.gather(*(self.grade(request) for request in requests))
+        )
+
+    def _flush(self, kind: str):
+        handle = self._flush_handles.pop(kind, None)
+        if handle is not None:
+            handle.cancel()
+        batch = self._pending.pop(kind, [])
+        if batch:
+            task = asyncio.create_task(self._grade_batch(kind, batch))
+            self._batches.add(task)
+            task.add_done_callback(self._batches.discard)
+
+    async def _grade_batch(self, kind: str, batch: List[_PendingGrade]):
+        requests = [request for _, request, _ in batch]
+        try:
+            assert self._semaphore is not None
+            async with self._semaphore:
+                verdicts = await self._request_verdicts(kind, requests)
+        except Exception as e:
+            for key, _, future in batch:
+                self._in_flight.pop(key, None)
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (key, _, future), verdict in zip(batch, verdicts):
+            self.cache.put(key, verdict)
+            self._in_flight.pop(key, None)
+            if not future.done():
+                future.set_result(verdict)
+
+    async def _complete(self, prompt: str, json_output: bool = False) -> str:
+        self.completions += 1
+        response = await self.client.chat.completions.create(
+            model=self.model,
+            messages=[
+                {"role": "system", "content": "You are a helpful assistant"},
+                {"role": "user", "content": prompt},
+            ],
+            temperature=0,
+            max_tokens=768,
+            top_p=1.0,
+            n=1,
+            response_format={"type": "json_object"} if json_output else None,
+        )
+        return response.choices[0].message.content or ""
+
+    async def _request_verdicts(
+        self, kind: str, requests: List[GradingRequest]
+    ) -> List[float]:
+        instructions = (
+            _UA_MATCH_INSTRUCTIONS if kind == UA_MATCH else _FUZZY_MATCH_INSTRUCTIONS
+        )
+        if len(requests) == 1:
+            response = await self._complete(
+                instructions + requests[0].describe() + _VERDICTS[kind]
+            )
+            return [parse_verdict(kind, response)]
+
+        items = "\n".join(
+            f"item {number}:\n{request.describe()}"
+            for number, request in enumerate(requests, 1)
+        )
+        prompt = (
+            f"{instructions}Grade each of the {len(requests)} items below independently.\n\n{items}\n"
+            f"{_VERDICTS[kind]} Respond with a JSON object "
+            '{"verdicts": [...]} holding one verdict string per item, in order.'
+        )
+        response = await self._complete(prompt, json_output=True)
+        try:
+            verdicts = json.loads(response)["verdicts"]
+            if len(verdicts) != len(requests):
+                raise ValueError(f"{len(verdicts)} verdicts for {len(requests)} items")
+            return [parse_verdict(kind, str(verdict)) for verdict in verdicts]
+        except (ValueError, KeyError, TypeError) as e:
+            logger.warning(
+                f"Malformed batch of {kind} verdicts, grading one by one: {e}"
+            )
+            return [
+                verdict
+                for request in requests
+                for verdict in await self._request_verdicts(kind, [request])
+            ]
+
+
+llm_grader = LLMGrader()
@@ -0,0 +1,6 @@
+from test.mock_site.server import MockSiteServer, mock_site_in_background
+
+__all__ = (
+    "MockSiteServer",
+    "mock_site_in_background",
+)
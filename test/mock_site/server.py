@@ -0,0 +1,172 @@
+import argparse
+import asyncio
+import os
+import threading
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from aiohttp import web
+
+from agentq.utils.logger import logger
+
+STATIC_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+
+# the eval entry points (`agentq.__main__.run_agent`, `browser_mcts.main`) point at http://localhost:3000/abc
+DEFAULT_HOST = "localhost"
+DEFAULT_PORT = 3000
+HOMEPAGE_ALIASES = ("/", "/abc")
+
+
+class MockSiteServer:
+    """
+    Serves the bundled mock web site from an in-process aiohttp server.
+
+    The site ships a home page, search with autocomplete and sorting, a paginated catalog,
+    product pages, a multi-field form and modal dialogs. Everything is static and deterministic,
+    so whole-agent runs, DOM extraction and MCTS iterations can be benchmarked without network access.
+
+    Example:
+        async with MockSiteServer(port=0) as site:
+            await page.goto(site.homepage)
+    """
+
+    def __init__(
+        self,
+        host: str = DEFAULT_HOST,
+        port: int = DEFAULT_PORT,
+        latency_ms: int = 0,
+    ):
+        """
+        Args:
+            host (str, optional): Interface to bind to. Defaults to "localhost".
+            port (int, optional): Port to bind to, 0 picks a free port. Defaults to 3000.
+            latency_ms (int, optional): Artificial delay added to every response to mimic a remote site. Defaults to 0.
+        """
+        self.host = host
+        self.port = port
+        self.latency_ms = latency_ms
+        self._runner: Optional[web.AppRunner] = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    @property
+    def homepage(self) -> str:
+        return f"{self.base_url}/abc"
+
+    def url(self, path: str) -> str:
+        return f"{self.base_url}/{path.lstrip('/')}"
+
+    def create_app(self) -> web.Application:
+        middlewares = [self._latency_middleware] if self.latency_ms > 0 else []
+        app = web.Application(middlewares=middlewares)
+        for alias in HOMEPAGE_ALIASES:
+            app.router.add_get(alias, self._homepage_handler)
+        app.router.add_static("/", STATIC_ROOT)
+        return app
+
+    async def start(self):
+        if self._runner is not None:
+            return
+        self._runner = web.AppRunner(self.create_app(), access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        if self.port == 0:
+            # resolve the ephemeral port picked by the OS
+            self.port = site._server.sockets[0].getsockname()[1]  # type: ignore
+        logger.info(f"Mock site serving {STATIC_ROOT} at {self.base_url}")
+
+    async def stop(self):
+        if self._runner is None:
+            return
+        await self._runner.cleanup()
+        self._runner = None
+        logger.info("Mock site stopped")
+
+    async def __aenter__(self) -> "MockSiteServer":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.stop()
+
+    async def _homepage_handler(self, request: web.Request) -> web.StreamResponse:
+        return web.FileResponse(os.path.join(STATIC_ROOT, "index.html"))
+
+    @web.middleware
+    async def _latency_middleware(self, request: web.Request, handler):
+        await asyncio.sleep(self.latency_ms / 1000)
+        return await handler(request)
+
+
+@contextmanager
+def mock_site_in_background(
+    host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, latency_ms: int = 0
+) -> Iterator[MockSiteServer]:
+    """
+    Runs a MockSiteServer on its own event loop in a daemon thread.
+
+    This keeps the site reachable while the caller drives the browser from a different loop
+    (e.g. `asyncio.run(run_agent(...))`) or from synchronous pytest-playwright tests.
+    """
+    server = MockSiteServer(host=host, port=port, latency_ms=latency_ms)
+    loop = asyncio.new_event_loop()
+    started = threading.Event()
+    stop_event: Optional[asyncio.Event] = None
+    startup_error: Optional[BaseException] = None
+
+    async def _serve():
+        nonlocal stop_event, startup_error
+        stop_event = asyncio.Event()
+        try:
+            await server.start()
+        except BaseException as e:
+            startup_error = e
+            started.set()
+            return
+        started.set()
+        await stop_event.wait()
+        await server.stop()
+
+    thread = threading.Thread(
+        target=loop.run_until_complete, args=(_serve(),), daemon=True
+    )
+    thread.start()
+    started.wait()
+    if startup_error is not None:
+        thread.join()
+        loop.close()
+        raise startup_error
+    try:
+        yield server
+    finally:
+        loop.call_soon_threadsafe(stop_event.set)  # type: ignore
+        thread.join()
+        loop.close()
+
+
+async def serve_forever(host: str, port: int, latency_ms: int):
+    async with MockSiteServer(host=host, port=port, latency_ms=latency_ms) as site:
+        print(f"Mock site running at {site.homepage} (Ctrl+C to stop)")
+        await asyncio.Event().wait()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Serve the AgentQ mock web site for offline benchmarks."
+    )
+    parser.add_argument("--host", type=str, default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument(
+        "--latency_ms",
+        type=int,
+        default=0,
+        help="Artificial delay in milliseconds added to every response (default: 0)",
+    )
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve_forever(args.host, args.port, args.latency_ms))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,54 @@
+// Shared data and helpers for the AgentQ mock site. Everything is generated
+// deterministically so DOM extraction benchmarks see the same page every run.
+const CATEGORIES = ["Laptops", "Phones", "Headphones", "Cameras", "Monitors"];
+const BRANDS = ["Acme", "Globex", "Initech", "Umbrella", "Hooli", "Stark"];
+
+const PRODUCTS = Array.from({ length: 120 }, (_, i) => {
+    const category = CATEGORIES[i % CATEGORIES.length];
+    const brand = BRANDS[i % BRANDS.length];
+    return {
+        id: i + 1,
+        name: `${brand} ${category.slice(0, -1)} ${100 + i}`,
+        category: category,
+        brand: brand,
+        price: 49 + ((i * 37) % 950),
+        rating: 1 + ((i * 7) % 5),
+    };
+});
+
+function getParam(name) {
+    return new URLSearchParams(window.location.search).get(name);
+}
+
+function renderProduct(product) {
+    const item = document.createElement("div");
+    item.className = "product";
+    const link = document.createElement("a");
+    link.href = `product.html?id=${product.id}`;
+    link.textContent = product.name;
+    const meta = document.createElement("span");
+    meta.textContent = ` - $${product.price} - ${product.rating}/5 stars`;
+    item.appendChild(link);
+    item.appendChild(meta);
+    return item;
+}
+
+function renderPagination(container, page, totalPages, baseQuery) {
+    container.innerHTML = "";
+    for (let p = 1; p <= totalPages; p++) {
+        if (p === page) {
+            const current = document.createElement("span");
+            current.textContent = `${p}`;
+            current.setAttribute("aria-current", "page");
+            container.appendChild(current);
+        } else {
+            const link = document.createElement("a");
+            const query = new URLSearchParams(baseQuery);
+            query.set("page", `${p}`);
+            link.href = `?${query.toString()}`;
+            link.textContent = `${p}`;
+            link.setAttribute("aria-label", `Page ${p}`);
+            container.appendChild(link);
+        }
+    }
+}
@@ -0,0 +1,231 @@
+"""Per-task latency and cost breakdown of an eval run, built from the tracing spans of each task."""
+
+import argparse
+import csv
+import json
+import os
+from typing import Any, Dict, Iterable, List, Tuple, Union
+
+from tabulate import tabulate
+
+from agentq.utils.tracing import Span, percentile
+
+PERFORMANCE_JSON = "performance.json"
+PERFORMANCE_CSV = "performance.csv"
+
+# columns aggregated across the tasks of a file, in report order
+METRICS = [
+    "tct",
+    "agent_turns",
+    "llm_calls",
+    "llm_time_s",
+    "prompt_tokens",
+    "completion_tokens",
+    "dom_extractions",
+    "dom_time_s",
+    "skill_calls",
+    "skill_time_s",
+    "screenshots",
+    "screenshots_cached",
+]
+
+
+def _span_fields(
+    span: Union[Span, Dict[str, Any]],
+) -> Tuple[Any, Any, str, float, Dict]:
+    if isinstance(span, Span):
+        return span.span_id, span.parent_id, span.name, span.duration, span.attributes
+    return (
+        span["span_id"],
+        span.get("parent_id"),
+        span["name"],
+        span["duration_ms"] / 1000,
+        span.get("attributes", {}),
+    )
+
+
+def task_performance(spans: Iterable[Union[Span, Dict[str, Any]]]) -> Dict[str, Any]:
+    """
+    Breaks down the spans of one task (see collect_spans).
+
+    Returns:
+        Dict[str, Any]: Agent turns, LLM calls per agent with tokens and time, DOM extraction count and time,
+                        skill count and time, and screenshot count. Times are in seconds. A skill calling another
+                        skill is counted once.
+    """
+    fields = [_span_fields(span) for span in spans]
+    skill_ids = {
+        span_id for span_id, _, name, _, _ in fields if name.startswith("skill.")
+    }
+    performance: Dict[str, Any] = {
+        "agent_turns": 0,
+        "llm_calls_per_agent": {},
+        "llm_calls": 0,
+        "llm_time_s": 0.0,
+        "prompt_tokens": 0,
+        "completion_tokens": 0,
+        "dom_extractions": 0,
+        "dom_time_s": 0.0,
+        "skill_calls": 0,
+        "skill_time_s": 0.0,
+        "screenshots": 0,
+        "screenshots_cached": 0,
+    }
+    llm_calls_per_agent = performance["llm_calls_per_agent"]
+    for _, parent_id, name, duration, attributes in fields:
+        if name == "orchestrator.turn":
+            performance["agent_turns"] += 1
+        elif name.startswith("llm."):
+            agent = name[len("llm.") :]
+            llm_calls_per_agent[agent] = llm_calls_per_agent.get(agent, 0) + 1
+            performance["llm_calls"] += 1
+            performance["llm_time_s"] += duration
+            performance["prompt_tokens"] += attributes.get("prompt_tokens") or 0
+            performance["completion_tokens"] += attributes.get("completion_tokens") or 0
+        elif name == "dom.extract":
+            performance["dom_extractions"] += 1
+            performance["dom_time_s"] += duration
+        elif name.startswith("skill.") and parent_id not in skill_ids:
+            performance["skill_calls"] += 1
+            performance["skill_time_s"] += duration
+        elif name == "screenshot.capture":
+            performance["screenshots"] += 1
+            if attributes.get("cached"):
+                performance["screenshots_cached"] += 1
+    for key in ("llm_time_s", "dom_time_s", "skill_time_s"):
+        performance[key] = round(performance[key], 3)
+    return performance
+
+
+def performance_rows(test_results: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Flattens the performance of each task result into one row, with a `llm_calls.<agent>` column per agent."""
+    rows = []
+    for result in test_results:
+        performance = result.get("performance")
+        if performance is None:
+            continue  # e.g. a result recorded before performance was collected
+        row: Dict[str, Any] = {
+            "task_id": result["task_id"],
+            "score": result["score"],
+            "tct": round(result["tct"], 3),
+        }
+        row.update(
+            (key, value)
+            for key, value in performance.items()
+            if key != "llm_calls_per_agent"
+        )
+        for agent, calls in performance["llm_calls_per_agent"].items():
+            row[f"llm_calls.{agent}"] = calls
+        rows.append(row)
+    return rows
+
+
+def aggregate_performance(rows: List[Dict[str, Any]]) -> Dict[str, Dict[str, float]]:
+    """Returns mean, p50, p95, max and total of every metric across the tasks."""
+    aggregate = {}
+    for metric in METRICS:
+        values = sorted(row.get(metric, 0) for row in rows)
+        if not values:
+            continue
+        aggregate[metric] = {
+            "mean": round(sum(values) / len(values), 3),
+            "p50": round(percentile(values, 0.5), 3),
+            "p95": round(percentile(values, 0.95), 3),
+            "max": round(values[-1], 3),
+            "total": round(sum(values), 3),
+        }
+    return aggregate
+
+
+def write_performance_report(
+    test_results: Iterable[Dict[str, Any]], results_dir: str
+) -> Dict[str, Dict[str, float]]:
+    """
+    Writes performance.csv (one row per task) and performance.json (the rows and the aggregate) to the results
+    directory, and returns the aggregate.
+    """
+    rows = performance_rows(test_results)
+    aggregate = aggregate_performance(rows)
+
+    columns: List[str] = []
+    for row in rows:
+        columns.extend(column for column in row if column not in columns)
+    with open(
+        os.path.join(results_dir, PERFORMANCE_CSV), "w", encoding="utf-8", newline=""
+    ) as f:
+        writer = csv.DictWriter(f, fieldnames=columns, restval=0)
+        writer.writeheader()
+        writer.writerows(rows)
+    with open(os.path.join(results_dir, PERFORMANCE_JSON), "w", encoding="utf-8") as f:
+        json.dump({"aggregate": aggregate, "tasks": rows}, f, indent=4)
+    return aggregate
+
+
+def print_performance_summary(aggregate: Dict[str, Dict[str, float]]):
+    table = [
+        [
+            metric,
+            values["mean"],
+            values["p50"],
+            values["p95"],
+            values["max"],
+            values["total"],
+        ]
+        for metric, values in aggregate.items()
+    ]
+    print(
+        tabulate(
+            table,
+            headers=["Metric", "Mean", "p50", "p95", "Max", "Total"],
+            tablefmt="grid",
+        )
+    )
+
+
+def compare_performance(
+    baseline_file: str, candidate_file: str, statistic: str = "p50"
+):
+    """Prints a statistic of every metric for two runs of the same task file, with the relative change."""
+    with open(baseline_file, encoding="utf-8") as f:
+        baseline = json.load(f)["aggregate"]
+    with open(candidate_file, encoding="utf-8") as f:
+        candidate = json.load(f)["aggregate"]
+    table = []
+    for metric in METRICS:
+        if metric not in baseline or metric not in candidate:
+            continue
+        before, after = baseline[metric][statistic], candidate[metric][statistic]
+        change = f"{(after - before) / before * 100:+.1f}%" if before else ""
+        table.append([metric, before, after, change])
+    print(
+        tabulate(
+            table,
+            headers=[
+                "Metric",
+                f"Baseline {statistic}",
+                f"Candidate {statistic}",
+                "Change",
+            ],
+            tablefmt="grid",
+        )
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Compare the performance.json of two eval runs, e.g. on two commits with the same task file."
+    )
+    parser.add_argument(
+        "baseline", type=str, help="performance.json of the baseline run"
+    )
+    parser.add_argument(
+        "candidate", type=str, help="performance.json of the run to compare"
+    )
+    parser.add_argument(
+        "--statistic",
+        choices=["mean", "p50", "p95", "max", "total"],
+        default="p50",
+        help="Statistic to compare (default: p50)",
+    )
+    args = parser.parse_args()
+    compare_performance(args.baseline, args.candidate, args.statistic)
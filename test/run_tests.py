@@ -50,6 +50,19 @@ if __name__ == "__main__":
         type=str,
         help='Path to the test configuration file. Default is "test/tasks/test.json" in the project root.',
     )
+    parser.add_argument(
+        "-workers",
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of tasks run concurrently, each in its own browser tab (default: 1)",
+    )
+    parser.add_argument(
+        "-resume",
+        "--resume",
+        action="store_true",
+        help="Skip the tasks that already have a result for this test results id",
+    )
 
     # Parse the command line arguments
     args = parser.parse_args()
@@ -64,5 +77,7 @@ if __name__ == "__main__":
             test_results_id=args.test_results_id,
             wait_time_non_headless=args.wait_time_non_headless,
             take_screenshots=args.take_screenshots,
+            workers=args.workers,
+            resume=args.resume,
         )
     )
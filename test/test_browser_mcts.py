@@ -0,0 +1,48 @@
+import asyncio
+
+from agentq.core.mcts import browser_mcts
+from agentq.core.mcts.browser_mcts import BrowserMCTSWrapper, run_mcts_search
+from agentq.core.mcts.core.mcts import MCTSResult
+from agentq.core.mcts.dpo_writer import read_dpo_dataset
+from agentq.core.mcts.tree_store import MCTS_TREE_DIR_ENV_VAR
+from test.test_dpo_writer import make_pair
+
+
+def test_dpo_pairs_reach_the_dataset_while_they_are_mined(tmp_path, monkeypatch):
+    monkeypatch.delenv(MCTS_TREE_DIR_ENV_VAR, raising=False)
+    total = browser_mcts.DPO_WRITE_CHUNK_SIZE + 1
+    on_disk = []
+
+    async def search(self):
+        return MCTSResult(
+            terminal_state=None,
+            cum_reward=None,
+            trace=None,
+            trace_of_nodes=None,
+            tree_state=None,
+        )
+
+    def iter_dpo_pairs(result, mining_config=None):
+        for index in range(total):
+            on_disk.append(len(list(read_dpo_dataset(str(tmp_path)))))
+            yield make_pair(index)
+
+    monkeypatch.setattr(BrowserMCTSWrapper, "__call__", search)
+    monkeypatch.setattr(
+        BrowserMCTSWrapper, "iter_dpo_pairs", staticmethod(iter_dpo_pairs)
+    )
+
+    pairs = asyncio.run(
+        run_mcts_search(
+            "buy a laptop",
+            actor=None,
+            critic=None,
+            vision=None,
+            dpo_dataset_dir=str(tmp_path),
+        )
+    )
+
+    assert len(pairs) == total
+    # the first chunk was written before the last pair was mined
+    assert on_disk[-1] == browser_mcts.DPO_WRITE_CHUNK_SIZE
+    assert len(list(read_dpo_dataset(str(tmp_path)))) == total
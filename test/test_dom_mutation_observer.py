@@ -0,0 +1,45 @@
+import asyncio
+import json
+
+from agentq.utils.dom_mutation_observer import (
+    dom_mutation_change_detected,
+    subscribe,
+    unsubscribe,
+)
+
+
+class FakePage:
+    pass
+
+
+CHANGES = json.dumps([{"tag": "SPAN", "content": "acme laptop pro"}])
+
+
+def test_changes_only_reach_the_callbacks_of_their_page():
+    page, other_page = FakePage(), FakePage()
+    received, other_received = [], []
+
+    async def other_callback(changes):
+        other_received.append(changes)
+
+    subscribe(received.append, page)
+    subscribe(other_callback, other_page)
+    try:
+        asyncio.run(dom_mutation_change_detected({"page": page}, CHANGES))
+    finally:
+        unsubscribe(received.append, page)
+        unsubscribe(other_callback, other_page)
+
+    assert received == [json.loads(CHANGES)]
+    assert other_received == []
+
+
+def test_unsubscribed_callbacks_are_not_called():
+    page = FakePage()
+    received = []
+    subscribe(received.append, page)
+    unsubscribe(received.append, page)
+
+    asyncio.run(dom_mutation_change_detected({"page": page}, CHANGES))
+
+    assert received == []
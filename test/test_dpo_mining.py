@@ -0,0 +1,101 @@
+from typing import Optional
+
+import pytest
+
+from agentq.core.mcts.core.mcts import MCTSNode
+from agentq.core.mcts.dpo_mining import (
+    CompactTree,
+    DPOMiningConfig,
+    mine_preference_pairs,
+)
+
+
+def add_node(parent: Optional[MCTSNode], visits: int, q: float) -> MCTSNode:
+    node = MCTSNode(state=None, action=None, parent=parent)
+    node.N = visits
+    node.Q = q
+    if parent is not None:
+        if parent.children is None:
+            parent.children = []
+        parent.children.append(node)
+    return node
+
+
+@pytest.fixture
+def tree():
+    """
+    root (N=10)
+    ├── best     N=4  Q=0.9   └── only (N=3, Q=1.0), a single child
+    ├── close    N=2  Q=0.85  (0.05 below best)
+    ├── tied_a   N=3  Q=0.5
+    ├── tied_b   N=2  Q=0.5
+    └── unvisited N=0
+    """
+    root = add_node(None, 10, 0.6)
+    nodes = {
+        "best": add_node(root, 4, 0.9),
+        "close": add_node(root, 2, 0.85),
+        "tied_a": add_node(root, 3, 0.5),
+        "tied_b": add_node(root, 2, 0.5),
+        "unvisited": add_node(root, 0, 0.0),
+    }
+    nodes["only"] = add_node(nodes["best"], 3, 1.0)
+    return CompactTree.from_root(root), nodes
+
+
+def mined(compact: CompactTree, nodes, config: DPOMiningConfig):
+    """The mined pairs as (winner, loser, margin) with the names of the nodes."""
+    name_of = {id(node): name for name, node in nodes.items()}
+    return [
+        (
+            name_of[id(compact.nodes[pair.winner])],
+            name_of[id(compact.nodes[pair.loser])],
+            round(pair.margin, 6),
+        )
+        for pair in mine_preference_pairs(compact, config)
+    ]
+
+
+def test_keeps_pairs_above_the_margin_by_decreasing_margin(tree):
+    compact, nodes = tree
+    pairs = mined(compact, nodes, DPOMiningConfig(min_q_margin=0.1))
+
+    assert sorted(pairs[:2]) == [("best", "tied_a", 0.4), ("best", "tied_b", 0.4)]
+    assert sorted(pairs[2:]) == [("close", "tied_a", 0.35), ("close", "tied_b", 0.35)]
+
+
+def test_lowering_the_margin_keeps_close_siblings(tree):
+    compact, nodes = tree
+    pairs = mined(compact, nodes, DPOMiningConfig(min_q_margin=0.04))
+
+    assert ("best", "close", 0.05) in pairs
+    assert len(pairs) == 5
+
+
+def test_tied_siblings_never_form_a_pair(tree):
+    compact, nodes = tree
+    pairs = mined(compact, nodes, DPOMiningConfig(min_q_margin=0.0))
+
+    assert {(winner, loser) for winner, loser, _ in pairs} == {
+        ("best", "close"),
+        ("best", "tied_a"),
+        ("best", "tied_b"),
+        ("close", "tied_a"),
+        ("close", "tied_b"),
+    }
+
+
+def test_a_single_child_and_unvisited_children_are_not_compared(tree):
+    compact, nodes = tree
+    pairs = mined(compact, nodes, DPOMiningConfig(min_q_margin=0.0))
+
+    assert all("only" not in pair[:2] for pair in pairs)
+    assert all("unvisited" not in pair[:2] for pair in pairs)
+
+
+def test_max_pairs_per_node_keeps_the_largest_margins(tree):
+    compact, nodes = tree
+    pairs = mined(compact, nodes, DPOMiningConfig(max_pairs_per_node=1))
+
+    assert len(pairs) == 1
+    assert pairs[0][0] == "best" and pairs[0][2] == 0.4
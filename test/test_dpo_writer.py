@@ -0,0 +1,116 @@
+import json
+import os
+
+import pytest
+
+from agentq.core.mcts.dpo_writer import DPODatasetWriter, dpo_entry, read_dpo_dataset
+from agentq.core.models.models import (
+    ActionType,
+    ClickAction,
+    DPOAction,
+    DPOPair,
+    DPOState,
+    GotoAction,
+)
+
+
+def make_pair(index: int) -> DPOPair:
+    return DPOPair(
+        state=DPOState(objective="buy a laptop", dom=f"<html>page {index}</html>"),
+        winning_action=DPOAction(
+            description="open the store",
+            action=GotoAction(
+                type=ActionType.GOTO_URL, website="http://localhost", timeout=None
+            ),
+        ),
+        losing_action=DPOAction(
+            description="click the banner",
+            action=ClickAction(
+                type=ActionType.CLICK, mmid=index, wait_before_execution=None
+            ),
+        ),
+    )
+
+
+def prompts(directory: str):
+    return [record["prompt"] for record in read_dpo_dataset(directory)]
+
+
+def test_skips_pairs_written_by_another_writer(tmp_path):
+    first = DPODatasetWriter(str(tmp_path))
+    assert first.write([make_pair(0), make_pair(1)]) == 2
+
+    second = DPODatasetWriter(str(tmp_path))
+    assert second.write([make_pair(1), make_pair(2)]) == 1
+    assert second.duplicates == 1
+    # the first writer reads what the second appended to the index before writing
+    assert first.write([make_pair(2)]) == 0
+
+    assert prompts(str(tmp_path)) == [
+        dpo_entry(make_pair(index))["prompt"] for index in range(3)
+    ]
+
+
+def test_starts_a_new_shard_once_the_current_one_is_full(tmp_path):
+    writer = DPODatasetWriter(str(tmp_path), max_shard_bytes=1)
+    for index in range(3):
+        writer.write([make_pair(index)])
+
+    assert [os.path.basename(path) for path in writer.shards()] == [
+        "dpo_pairs-00000.jsonl",
+        "dpo_pairs-00001.jsonl",
+        "dpo_pairs-00002.jsonl",
+    ]
+    assert prompts(str(tmp_path)) == [
+        dpo_entry(make_pair(index))["prompt"] for index in range(3)
+    ]
+
+
+def test_recovers_an_index_line_cut_short_by_a_crash(tmp_path):
+    DPODatasetWriter(str(tmp_path)).write([make_pair(0)])
+    index_path = tmp_path / "dpo_pairs.index"
+    with open(index_path, "ab") as f:
+        f.write(b"0123abcd")
+
+    writer = DPODatasetWriter(str(tmp_path))
+    assert writer.write([make_pair(0), make_pair(1)]) == 1
+
+    lines = index_path.read_bytes().split(b"\n")
+    assert lines[-1] == b""
+    assert [len(line) for line in lines[:-1]] == [32, 32]
+    assert DPODatasetWriter(str(tmp_path)).write([make_pair(0), make_pair(1)]) == 0
+
+
+def test_pairs_written_after_a_zstd_frame_cut_short_by_a_crash_are_read(tmp_path):
+    zstandard = pytest.importorskip("zstandard")
+    writer = DPODatasetWriter(str(tmp_path), compression="zstd")
+    writer.write([make_pair(0)])
+    shard = writer.shards()[0]
+    # a crash while appending the frame of pair 1, before its hash reached the index
+    frame = zstandard.ZstdCompressor().compress(
+        (json.dumps(dpo_entry(make_pair(1))) + "\n").encode("utf-8")
+    )
+    with open(shard, "ab") as f:
+        f.write(frame[: len(frame) // 2])
+
+    rerun = DPODatasetWriter(str(tmp_path), compression="zstd")
+    assert rerun.write([make_pair(1)]) == 1
+    assert rerun.write([make_pair(2)]) == 1
+
+    assert len(rerun.shards()) == 2
+    assert prompts(str(tmp_path)) == [
+        dpo_entry(make_pair(index))["prompt"] for index in range(3)
+    ]
+
+
+def test_complete_zstd_frames_are_appended_to_the_same_shard(tmp_path):
+    pytest.importorskip("zstandard")
+    writer = DPODatasetWriter(str(tmp_path), compression="zstd")
+    writer.write([make_pair(0)])
+    DPODatasetWriter(str(tmp_path), compression="zstd").write([make_pair(1)])
+    writer.write([make_pair(2)])
+
+    assert len(writer.shards()) == 1
+    assert prompts(str(tmp_path)) == [
+        dpo_entry(make_pair(index))["prompt"] for index in range(3)
+    ]
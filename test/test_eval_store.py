@@ -0,0 +1,105 @@
+import json
+
+from test.eval_store import EvalStore, EvalSummary
+
+
+def result(task_id, score=1.0, tct=2.0):
+    return {"task_id": task_id, "score": score, "tct": tct}
+
+
+def test_resume_drops_a_half_written_last_line(tmp_path):
+    store = EvalStore(str(tmp_path))
+    store.append(0, result(0))
+    store.append(1, result(1, score=0.0))
+    store.close()
+    with open(store.path, "a", encoding="utf-8") as f:
+        f.write('{"index": 2, "result": {"task_')
+
+    resumed = EvalStore(str(tmp_path), resume=True)
+    assert [index for index, _ in resumed.results()] == [0, 1]
+    assert 2 not in resumed
+    resumed.append(2, result(2))
+    resumed.close()
+
+    with open(store.path, encoding="utf-8") as f:
+        lines = f.read().splitlines()
+    assert [json.loads(line)["index"] for line in lines] == [0, 1, 2]
+
+
+def test_resume_drops_a_last_line_without_its_newline(tmp_path):
+    store = EvalStore(str(tmp_path))
+    store.append(0, result(0))
+    store.close()
+    with open(store.path, "a", encoding="utf-8") as f:
+        f.write(json.dumps({"index": 1, "result": result(1)}))
+
+    resumed = EvalStore(str(tmp_path), resume=True)
+    assert 1 not in resumed
+    resumed.append(1, result(1))
+    resumed.close()
+
+    reloaded = EvalStore(str(tmp_path), resume=True)
+    assert [index for index, _ in reloaded.results()] == [0, 1]
+    reloaded.close()
+
+
+def test_the_last_line_of_a_rerun_task_wins(tmp_path):
+    store = EvalStore(str(tmp_path))
+    store.append(0, result(0, score=0.0, tct=5.0))
+    store.append(1, result(1, score=-1.0, tct=1.0))
+    store.append(0, result(0, score=1.0, tct=3.0))
+    store.close()
+
+    resumed = EvalStore(str(tmp_path), resume=True)
+    assert resumed.results() == [
+        (0, result(0, score=1.0, tct=3.0)),
+        (1, result(1, score=-1.0, tct=1.0)),
+    ]
+    summary = resumed.summary
+    assert (summary.completed, summary.passed, summary.failed, summary.skipped) == (
+        2,
+        1,
+        0,
+        1,
+    )
+    assert summary.total_time == 4.0
+    resumed.close()
+
+
+def test_summary_remove_undoes_add():
+    summary = EvalSummary()
+    summary.add(result(0, score=0.0, tct=5.0))
+    summary.add(result(1, score=1.0, tct=1.0))
+    summary.remove(result(0, score=0.0, tct=5.0))
+
+    assert (summary.completed, summary.passed, summary.failed, summary.skipped) == (
+        1,
+        1,
+        0,
+        0,
+    )
+    assert summary.average_time == 1.0
+
+
+def test_pending_skips_completed_task_ids(tmp_path):
+    store = EvalStore(str(tmp_path))
+    store.append(0, result(0))
+    store.append(2, result("2"))
+    store.close()
+
+    resumed = EvalStore(str(tmp_path), resume=True)
+    configs = [(index, {"task_id": index}) for index in range(4)]
+    assert resumed.pending(configs) == [(1, {"task_id": 1}), (3, {"task_id": 3})]
+    assert resumed.last_completed_index == 2
+    resumed.close()
+
+
+def test_a_new_run_moves_the_previous_store_aside(tmp_path):
+    store = EvalStore(str(tmp_path))
+    store.append(0, result(0))
+    store.close()
+
+    fresh = EvalStore(str(tmp_path))
+    assert fresh.results() == []
+    assert (tmp_path / "results.jsonl.previous").exists()
+    fresh.close()
@@ -0,0 +1,129 @@
+import asyncio
+
+import pytest
+from aiohttp.test_utils import TestClient, TestServer
+
+from agentq.core.orchestrator.jobs import JobKind, JobManager, JobStatus
+from agentq.core.orchestrator.session_pool import PoolFullError, SessionPool
+from agentq.utils.progress import report_progress
+from async_server import create_app
+
+
+class FakeSession:
+    def __init__(self, session_id: int):
+        self.session_id = session_id
+
+    async def run_command(self, command: str):
+        report_progress("task_completed", task={"description": command})
+        return f"done: {command}"
+
+
+class FakePool(SessionPool):
+    """A SessionPool of fake sessions, without a browser."""
+
+    async def start(self):
+        if self._idle is not None:
+            return
+        self._idle = asyncio.Queue()
+        for session_id in range(self.size):
+            session = FakeSession(session_id)
+            self._sessions.append(session)
+            self._idle.put_nowait(session)
+
+    async def stop(self):
+        self._sessions = []
+        self._idle = None
+
+
+async def wait_until(condition, timeout: float = 5):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        assert asyncio.get_running_loop().time() < deadline
+        await asyncio.sleep(0.01)
+
+
+def test_pool_rejects_requests_past_max_waiting():
+    async def scenario():
+        pool = FakePool(size=1, max_waiting=1)
+        await pool.start()
+        async with pool.acquire():
+            waiter = asyncio.create_task(pool.acquire().__aenter__())
+            await wait_until(lambda: pool.stats()["waiting"] == 1)
+            with pytest.raises(PoolFullError):
+                async with pool.acquire():
+                    pass
+            with pytest.raises(asyncio.TimeoutError):
+                async with pool.acquire(timeout=0.01, limit_waiting=False):
+                    pass
+            waiter.cancel()
+
+    asyncio.run(scenario())
+
+
+def test_jobs_wait_for_a_session_when_direct_requests_fill_the_pool():
+    async def scenario():
+        pool = FakePool(size=1, max_waiting=1)
+        jobs = JobManager(pool)
+        await jobs.start()
+        release = asyncio.Event()
+
+        async def direct_request():
+            async with pool.acquire():
+                await release.wait()
+
+        busy = asyncio.create_task(direct_request())
+        waiting = asyncio.create_task(direct_request())
+        await wait_until(lambda: pool.stats()["waiting"] == 1)
+
+        job = jobs.submit(JobKind.EXECUTE, "search for laptops")
+        await asyncio.sleep(0.05)
+        assert job.status == JobStatus.QUEUED
+
+        release.set()
+        await asyncio.gather(busy, waiting)
+        await wait_until(lambda: job.done)
+        await jobs.stop()
+
+        assert job.status == JobStatus.SUCCEEDED
+        assert job.result == "done: search for laptops"
+        assert [event["event"] for event in job.events] == [
+            "job_started",
+            "task_completed",
+            "job_finished",
+        ]
+
+    asyncio.run(scenario())
+
+
+def parse_sse(body: str):
+    events = []
+    for block in body.strip().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((int(fields["id"]), fields["event"]))
+    return events
+
+
+def test_job_events_are_streamed_as_server_sent_events():
+    async def scenario():
+        async with TestClient(TestServer(create_app(FakePool(size=1)))) as client:
+            response = await client.post("/jobs", json={"goal": "search for laptops"})
+            assert response.status == 202
+            job = await response.json()
+
+            response = await client.get(job["events_url"])
+            assert response.headers["Content-Type"] == "text/event-stream"
+            assert parse_sse(await response.text()) == [
+                (0, "job_started"),
+                (1, "task_completed"),
+                (2, "job_finished"),
+            ]
+
+            response = await client.get(
+                job["events_url"], headers={"Last-Event-ID": "1"}
+            )
+            assert parse_sse(await response.text()) == [(2, "job_finished")]
+
+            response = await client.get(job["status_url"])
+            assert (await response.json())["status"] == "succeeded"
+
+    asyncio.run(scenario())
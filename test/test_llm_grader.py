@@ -0,0 +1,97 @@
+import asyncio
+import json
+import re
+from typing import List
+
+from test.llm_grader import FUZZY_MATCH, GradeCache, GradingRequest, LLMGrader
+
+
+class StubGrader(LLMGrader):
+    """Answers "correct" when the student answer is "right", without calling a model."""
+
+    def __init__(self, drop_verdicts: int = 0, **kwargs):
+        kwargs.setdefault("cache", GradeCache(None))
+        super().__init__(**kwargs)
+        self.drop_verdicts = drop_verdicts
+        self.prompts: List[str] = []
+
+    async def _complete(self, prompt: str, json_output: bool = False) -> str:
+        self.prompts.append(prompt)
+        answers = re.findall(r"student answer: (.*)", prompt)
+        verdicts = [
+            "correct" if answer.strip().lower() == "right" else "incorrect"
+            for answer in answers
+        ]
+        if not json_output:
+            return verdicts[0]
+        return json.dumps({"verdicts": verdicts[self.drop_verdicts :]})
+
+
+def request(pred: str, reference: str = "Acme Laptop", question: str = "name it"):
+    return GradingRequest(FUZZY_MATCH, pred, reference, question)
+
+
+def test_requests_made_together_are_graded_in_one_completion():
+    grader = StubGrader()
+    scores = asyncio.run(
+        grader.grade_many(
+            [request("right"), request("wrong"), request("right", reference="Acme")]
+        )
+    )
+
+    assert scores == [1.0, 0.0, 1.0]
+    assert len(grader.prompts) == 1
+    assert "Grade each of the 3 items" in grader.prompts[0]
+
+
+def test_batches_hold_at_most_batch_size_items():
+    grader = StubGrader(batch_size=2)
+    scores = asyncio.run(
+        grader.grade_many([request("right", reference=str(n)) for n in range(5)])
+    )
+
+    assert scores == [1.0] * 5
+    assert len(grader.prompts) == 3
+
+
+def test_identical_requests_in_flight_share_one_grading():
+    grader = StubGrader()
+    scores = asyncio.run(grader.grade_many([request("right")] * 3))
+
+    assert scores == [1.0] * 3
+    assert len(grader.prompts) == 1
+    assert "Grade each of" not in grader.prompts[0]
+
+
+def test_normalized_triples_are_graded_from_the_cache_on_rerun(tmp_path):
+    cache_path = str(tmp_path / "llm_grades.jsonl")
+    first = StubGrader(cache=GradeCache(cache_path))
+    asyncio.run(first.grade_many([request("right"), request("wrong")]))
+
+    rerun = StubGrader(cache=GradeCache(cache_path))
+    scores = asyncio.run(
+        rerun.grade_many(
+            [
+                request("  Right ", reference="acme   LAPTOP", question="Name it"),
+                request("WRONG", reference=" Acme Laptop\n"),
+            ]
+        )
+    )
+
+    assert scores == [1.0, 0.0]
+    assert rerun.prompts == []
+    assert rerun.hits == 2
+
+
+def test_a_batch_with_the_wrong_verdict_count_is_graded_one_by_one():
+    grader = StubGrader(drop_verdicts=1)
+    scores = asyncio.run(
+        grader.grade_many(
+            [request("right"), request("wrong"), request("right", reference="Acme")]
+        )
+    )
+
+    assert scores == [1.0, 0.0, 1.0]
+    # the batch, then one completion per item
+    assert len(grader.prompts) == 4
+    assert all("Grade each of" not in prompt for prompt in grader.prompts[1:])
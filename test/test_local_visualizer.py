@@ -0,0 +1,82 @@
+import json
+import os
+import urllib.request
+
+from agentq.core.mcts.tree_store import DOM_DIR, TREE_FILE, dom_key
+from agentq.core.mcts.visualization.local_visualizer import (
+    VIEWER_FILE,
+    export_tree,
+    start_tree_server,
+)
+from test.test_tree_store import HOME, OBJECTIVE, make_result
+
+
+def records_of(tree_dir: str):
+    with open(os.path.join(tree_dir, TREE_FILE), encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_exports_the_tree_as_header_node_and_edge_records(tmp_path):
+    result = make_result()
+    root = result.tree_state
+    tree_dir = export_tree(result, str(tmp_path), tree_id="run")
+
+    assert tree_dir == str(tmp_path / "run")
+    assert os.path.exists(os.path.join(tree_dir, VIEWER_FILE))
+    header, *records = records_of(tree_dir)
+    assert header["type"] == "tree"
+    assert (header["objective"], header["root"]) == (OBJECTIVE, root.id)
+    assert header["trace"] == [node.id for node in result.trace_of_nodes]
+
+    store, banner = root.children
+    # breadth first, each node preceded by the edge that led to it
+    assert [(record["type"], record.get("id")) for record in records] == [
+        ("node", root.id),
+        ("edge", None),
+        ("node", store.id),
+        ("edge", None),
+        ("node", banner.id),
+    ]
+    edges = [record for record in records if record["type"] == "edge"]
+    assert [(edge["source"], edge["target"]) for edge in edges] == [
+        (root.id, store.id),
+        (root.id, banner.id),
+    ]
+    assert edges[0]["action"]["description"] == "open the store"
+    nodes = {record["id"]: record for record in records if record["type"] == "node"}
+    assert (nodes[store.id]["N"], nodes[store.id]["Q"]) == (3, 0.9)
+
+
+def test_doms_are_written_once_and_referenced_by_key(tmp_path):
+    result = make_result()
+    tree_dir = export_tree(result, str(tmp_path), tree_id="run")
+
+    nodes = [record for record in records_of(tree_dir) if record["type"] == "node"]
+    # the root and the banner click share the home page
+    assert [node["dom"] for node in nodes] == [
+        dom_key(HOME),
+        dom_key("<html>store</html>"),
+        dom_key(HOME),
+    ]
+    assert sorted(os.listdir(os.path.join(tree_dir, DOM_DIR))) == sorted(
+        f"{dom_key(dom)}.txt" for dom in (HOME, "<html>store</html>")
+    )
+    with open(os.path.join(tree_dir, DOM_DIR, f"{dom_key(HOME)}.txt")) as f:
+        assert f.read() == HOME
+
+
+def test_serves_the_viewer_and_the_tree(tmp_path):
+    tree_dir = export_tree(make_result(), str(tmp_path), tree_id="run")
+    server, url = start_tree_server(tree_dir)
+    try:
+        assert url.endswith(f"/{VIEWER_FILE}")
+        with urllib.request.urlopen(url, timeout=5) as response:
+            assert response.status == 200
+            assert b"<html" in response.read().lower()
+        tree_url = url[: -len(VIEWER_FILE)] + TREE_FILE
+        with urllib.request.urlopen(tree_url, timeout=5) as response:
+            with open(os.path.join(tree_dir, TREE_FILE), "rb") as f:
+                assert response.read() == f.read()
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,35 @@
+import urllib.request
+
+import pytest
+
+
+def fetch(url: str) -> str:
+    with urllib.request.urlopen(url, timeout=10) as response:
+        assert response.status == 200
+        return response.read().decode("utf-8")
+
+
+def test_serves_the_homepage_at_its_aliases(mock_site, mock_site_url):
+    assert "<title>AgentQ Mock Store" in fetch(mock_site_url)
+    assert "<title>AgentQ Mock Store" in fetch(mock_site.url("/"))
+
+
+@pytest.mark.parametrize(
+    "page, title",
+    [
+        ("catalog.html", "Catalog"),
+        ("search.html", "Search"),
+        ("product.html", "Product"),
+        ("form.html", "Contact"),
+        ("modal.html", "Offers"),
+        ("confirmation.html", "Thank you"),
+    ],
+)
+def test_serves_the_static_pages(mock_site, page, title):
+    assert f"<title>{title} - AgentQ Mock Store" in fetch(mock_site.url(page))
+
+
+def test_package_exports_resolve():
+    namespace = {}
+    exec("from test.mock_site import *", namespace)
+    assert {"MockSiteServer", "mock_site_in_background"} <= namespace.keys()
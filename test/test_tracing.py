@@ -0,0 +1,31 @@
+import pytest
+
+from agentq.utils.tracing import percentile
+
+
+@pytest.mark.parametrize(
+    "n, fraction, rank",
+    [
+        (10, 0.5, 5),
+        (20, 0.95, 19),
+        (100, 0.95, 95),
+        (100, 0.07, 7),
+        (4, 0.5, 2),
+        (5, 0.5, 3),
+        (3, 0.95, 3),
+        (10, 1.0, 10),
+        (10, 0.0, 1),
+    ],
+)
+def test_percentile_is_nearest_rank(n, fraction, rank):
+    values = [float(value) for value in range(1, n + 1)]
+    assert percentile(values, fraction) == rank
+
+
+def test_percentile_of_no_values_is_zero():
+    assert percentile([], 0.5) == 0.0
+
+
+def test_percentile_of_one_value_is_that_value():
+    assert percentile([7.5], 0.5) == 7.5
+    assert percentile([7.5], 0.95) == 7.5
@@ -0,0 +1,190 @@
+import json
+import os
+from typing import Optional
+
+from agentq.core.mcts.core.mcts import MCTSNode, MCTSResult
+from agentq.core.mcts.dpo_builder import (
+    BuildSummary,
+    build_dpo_dataset,
+    find_tree_sources,
+)
+from agentq.core.mcts.dpo_writer import read_dpo_dataset
+from agentq.core.mcts.tree_store import (
+    TREE_FILE,
+    load_mcts_tree,
+    save_mcts_tree,
+    tree_from_log,
+)
+from agentq.core.models.models import (
+    ActionType,
+    BrowserAction,
+    BrowserState,
+    ClickAction,
+    GotoAction,
+    TaskWithActions,
+)
+
+OBJECTIVE = "buy a laptop"
+HOME = "<html>home</html>"
+
+
+def add_node(
+    parent: Optional[MCTSNode],
+    task: Optional[TaskWithActions],
+    dom: str,
+    visits: int,
+    q: float,
+) -> MCTSNode:
+    completed_tasks = list(parent.state.completed_tasks) if parent else []
+    if task is not None:
+        completed_tasks.append(task)
+    node = MCTSNode(
+        state=BrowserState(
+            dom=dom,
+            url="http://localhost",
+            objective=OBJECTIVE,
+            completed_tasks=completed_tasks,
+        ),
+        action=BrowserAction(task_with_action=task, rank=0.5) if task else None,
+        parent=parent,
+    )
+    node.N = visits
+    node.Q = q
+    if parent is not None:
+        if parent.children is None:
+            parent.children = []
+        parent.children.append(node)
+    return node
+
+
+def make_result() -> MCTSResult:
+    """
+    root (N=5, home)
+    ├── store   N=3  Q=0.9  goto the store
+    └── banner  N=2  Q=0.2  click the banner, the page stays home
+    """
+    root = add_node(None, None, HOME, 5, 0.6)
+    store = add_node(
+        root,
+        TaskWithActions(
+            id=1,
+            description="open the store",
+            actions_to_be_performed=[
+                GotoAction(
+                    type=ActionType.GOTO_URL, website="http://localhost", timeout=None
+                )
+            ],
+            result=None,
+        ),
+        "<html>store</html>",
+        3,
+        0.9,
+    )
+    add_node(
+        root,
+        TaskWithActions(
+            id=2,
+            description="click the banner",
+            actions_to_be_performed=[
+                ClickAction(type=ActionType.CLICK, mmid=7, wait_before_execution=None)
+            ],
+            result=None,
+        ),
+        HOME,
+        2,
+        0.2,
+    )
+    return MCTSResult(
+        terminal_state=store.state,
+        cum_reward=None,
+        trace=None,
+        trace_of_nodes=[root, store],
+        tree_state=root,
+    )
+
+
+def tree_log_of(root: MCTSNode):
+    """The JSON-encoded TreeLog of a tree, one snapshot, as TreeLog.from_mcts_results writes it."""
+    nodes, edges = {}, {}
+
+    def visit(node: MCTSNode):
+        nodes[str(node.id)] = {"id": node.id, "data": node.state.model_dump()}
+        for child in node.children or []:
+            edges[str(len(edges))] = {
+                "id": len(edges),
+                "source": node.id,
+                "target": child.id,
+                "data": {"Q": child.Q, "N": child.N, "reward": child.reward},
+            }
+            visit(child)
+
+    visit(root)
+    return {"logs": [{"nodes": nodes, "edges": edges}]}
+
+
+def shape(node: MCTSNode):
+    return (
+        node.N,
+        round(node.Q, 6),
+        node.state,
+        node.action.task_with_action if node.action else None,
+        [shape(child) for child in node.children or []],
+    )
+
+
+def test_a_saved_tree_loads_back_with_its_states_and_actions(tmp_path):
+    result = make_result()
+    tree_dir = save_mcts_tree(result, str(tmp_path), tree_id="run")
+
+    root = load_mcts_tree(tree_dir)
+
+    assert shape(root) == shape(result.tree_state)
+    assert [child.id for child in root.children] == [
+        child.id for child in result.tree_state.children
+    ]
+
+
+def test_a_tree_log_rebuilds_the_visited_tree():
+    result = make_result()
+
+    root = tree_from_log(json.loads(json.dumps(tree_log_of(result.tree_state))))
+
+    # the root has no edge, so no logged Q, its visits are those of its children
+    assert root.N == 5 and root.state == result.tree_state.state
+    assert [shape(child) for child in root.children] == [
+        shape(child) for child in result.tree_state.children
+    ]
+
+
+def test_builds_a_dataset_from_trees_and_tree_logs_once(tmp_path):
+    result = make_result()
+    save_mcts_tree(result, str(tmp_path / "trees"), tree_id="run")
+    with open(tmp_path / "trees" / "run.json", "w") as f:
+        json.dump(tree_log_of(result.tree_state), f)
+    with open(tmp_path / "trees" / "config.json", "w") as f:
+        json.dump({"workers": 4}, f)
+
+    sources = find_tree_sources([str(tmp_path / "trees")])
+    # config.json is not a TreeLog
+    assert sources == [
+        str(tmp_path / "trees" / "run.json"),
+        str(tmp_path / "trees" / "run"),
+    ]
+
+    output_dir = str(tmp_path / "dataset")
+    summary = build_dpo_dataset(sources, output_dir=output_dir, workers=1)
+    # both sources hold the same tree, so the same pair
+    assert summary == BuildSummary(trees=2, failed=0, pairs=2, written=1)
+    [record] = read_dpo_dataset(output_dir)
+    assert record["prompt"].startswith(f"Objective: {OBJECTIVE}\nCurrent DOM: {HOME}")
+    assert "open the store" in record["chosen"]
+    assert "click the banner" in record["rejected"]
+
+    rerun = build_dpo_dataset(sources, output_dir=output_dir, workers=1)
+    assert (rerun.pairs, rerun.written) == (2, 0)
+
+
+def test_tree_file_paths_are_resolved_to_their_directory(tmp_path):
+    tree_dir = save_mcts_tree(make_result(), str(tmp_path), tree_id="run")
+
+    assert find_tree_sources([os.path.join(tree_dir, TREE_FILE)]) == [tree_dir]
@@ -3,15 +3,30 @@
 import json
 import os
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Union
 
 from dotenv import load_dotenv
 from nltk.tokenize import word_tokenize  # type: ignore
-from openai import OpenAI
+
+from test.llm_grader import (
+    DEFAULT_GRADING_MODEL,
+    FUZZY_MATCH,
+    UA_MATCH,
+    GradingRequest,
+    llm_grader,
+    parse_verdict,
+)
 
 load_dotenv()
-client = OpenAI()
+
+
+@lru_cache(maxsize=None)
+def _get_openai_client():
+    from openai import OpenAI
+
+    return OpenAI()
 
 
 def llm_fuzzy_match(pred: str, reference: str, question: str) -> float:
@@ -19,6 +34,7 @@ def llm_fuzzy_match(pred: str, reference: str, question: str) -> float:
     Evaluates if a predicted answer matches a reference answer semantically, considering the context of a question.
 
     This function simulates a grading scenario, understanding that a student's answer may use different wording or phrasing from the reference answer. It uses GPT-4-turbo model to assess semantic equivalence.
+    Verdicts are shared with the LLMGrader cache. In async code, use `llm_grader.grade_many` to batch requests.
 
     Parameters:
         pred (str): The student's predicted answer.
@@ -28,6 +44,12 @@ def llm_fuzzy_match(pred: str, reference: str, question: str) -> float:
     Returns:
         float: Returns 1.0 if the predicted answer is semantically equivalent to the reference, otherwise 0.0.
     """
+    request = GradingRequest(FUZZY_MATCH, pred, reference, question)
+    key = request.cache_key(DEFAULT_GRADING_MODEL)
+    cached = llm_grader.cache.get(key)
+    if cached is not None:
+        return cached
+
     messages: List[Dict[str, Any]] = []
     # construct the question to ask
     message = "Help a teacher to grade the answer of a student given a question. Keep in mind that the student may use different phrasing or wording to answer the question. The goal is to evaluate whether the answer is semantically equivalent to the reference answer.\n"
@@ -42,18 +64,16 @@ def llm_fuzzy_match(pred: str, reference: str, question: str) -> float:
     ]
 
     response = generate_from_openai_chat_completion(
-        model="gpt-4-turbo-preview",
+        model=DEFAULT_GRADING_MODEL,
         messages=messages,
         temperature=0,
         max_tokens=768,
         top_p=1.0,
         context_length=0,
-    ).lower()
-    if "partially correct" in response or "incorrect" in response:
-        return 0.0
-    else:
-        assert "correct" in response
-        return 1.0
+    )
+    score = parse_verdict(FUZZY_MATCH, response)
+    llm_grader.cache.put(key, score)
+    return score
 
 
 def llm_ua_match(pred: str, reference: str, question: str) -> float:
@@ -62,6 +82,7 @@ def llm_ua_match(pred: str, reference: str, question: str) -> float:
 
     This function reviews both the actual and reported reasons for a task's unachievability within the context of the task.
     It assesses if the reported reason is implicitly or explicitly in line with the actual reason, using GPT-turbo model.
+    Verdicts are shared with the LLMGrader cache.
 
     Parameters:
         pred (str): The reported unachievable reason by an individual.
@@ -71,6 +92,12 @@ def llm_ua_match(pred: str, reference: str, question: str) -> float:
     Returns:
         float: Returns 1.0 if the reported reason aligns with the actual reason, otherwise 0.0.
     """
+    request = GradingRequest(UA_MATCH, pred, reference, question)
+    key = request.cache_key(DEFAULT_GRADING_MODEL)
+    cached = llm_grader.cache.get(key)
+    if cached is not None:
+        return cached
+
     messages: List[Dict[str, Any]] = []
     # construct the question to ask
     message = ""
@@ -90,18 +117,16 @@ def llm_ua_match(pred: str, reference: str, question: str) -> float:
     ]
 
     response = generate_from_openai_chat_completion(
-        model="gpt-4-turbo-preview",
+        model=DEFAULT_GRADING_MODEL,
         messages=messages,
         temperature=0,
         max_tokens=768,
         top_p=1.0,
         context_length=0,
-    ).lower()
-    if "different" in response:
-        return 0.0
-    else:
-        assert "same" in response
-        return 1.0
+    )
+    score = parse_verdict(UA_MATCH, response)
+    llm_grader.cache.put(key, score)
+    return score
 
 
 def generate_from_openai_chat_completion(
@@ -138,6 +163,7 @@ def generate_from_openai_chat_completion(
         raise ValueError(
             "OPENAI_API_KEY environment variable must be set when using OpenAI API."
         )
+    client = _get_openai_client()
     client.api_key = os.environ["OPENAI_API_KEY"]
     client.organization = os.environ.get("OPENAI_ORGANIZATION", "")
 
@@ -9,15 +9,21 @@ from tabulate import tabulate
 from termcolor import colored
 
 from agentq.config.config import PROJECT_TEST_ROOT
-from agentq.core.agent.agentq import AgentQ
-from agentq.core.agent.agentq_actor import AgentQActor
-from agentq.core.agent.agentq_critic import AgentQCritic
-from agentq.core.agent.browser_nav_agent import BrowserNavAgent
-from agentq.core.agent.planner_agent import PlannerAgent
-from agentq.core.models.models import State
 from agentq.core.orchestrator.orchestrator import Orchestrator
+from agentq.core.orchestrator.session_pool import (
+    SessionPool,
+    create_state_to_agent_map,
+)
+from agentq.core.web_driver.playwright import PlaywrightManager
 from agentq.utils.logger import logger
+from agentq.utils.tracing import collect_spans
+from test.eval_store import EvalStore
 from test.evaluators import evaluator_router
+from test.perf_report import (
+    print_performance_summary,
+    task_performance,
+    write_performance_report,
+)
 from test.test_utils import (
     get_formatted_current_timestamp,
     load_config,
@@ -81,13 +87,6 @@ def dump_log(task_id: str, messages: Dict[str, Any], logs_dir: str):
         json.dump(messages, f, ensure_ascii=False, indent=4)
 
 
-def save_test_results(test_results: List[Dict[str, Any]], test_results_id: str):
-    file_name = os.path.join(TEST_RESULTS, f"test_results_{test_results_id}.json")
-    with open(file_name, "w", encoding="utf-8") as f:
-        json.dump(test_results, f, ensure_ascii=False, indent=4)
-    logger.info(f"Test results dumped to: {file_name}")
-
-
 def save_individual_test_result(test_result: Dict[str, Any], results_dir: str):
     task_id = test_result["task_id"]
     file_name = os.path.join(results_dir, f"test_result_{task_id}.json")
@@ -145,7 +144,9 @@ async def execute_single_task(
 
     start_time = time.time()
     # current_url = await orchestrator.playwright_manager.get_current_url()
-    command_exec_result = await orchestrator.execute_command(command)
+    # spans of this task only, parallel workers collect their own
+    with collect_spans() as spans:
+        command_exec_result = await orchestrator.execute_command(command)
     end_time = time.time()
 
     single_task_result = {
@@ -163,6 +164,7 @@ async def execute_single_task(
     logger.info(f"Task {task_id} completed.")
 
     single_task_result["last_statement"] = command_exec_result
+    single_task_result["performance"] = task_performance(spans)
 
     dump_log(
         str(task_id), {"command": command, "result": command_exec_result}, logs_dir
@@ -184,15 +186,113 @@ async def execute_single_task(
     return single_task_result
 
 
-async def run_tests(
+async def run_single_test(
+    task_config: Dict[str, Any],
     orchestrator: Orchestrator,
+    page: Page,
+    test_results_id: str,
+    results_dir: str,
+) -> Dict[str, Any]:
+    """
+    Runs one task on the given page and saves its result. Logs and screenshots go to the task's own folders.
+    """
+    task_id = str(task_config.get("task_id"))
+    log_folders = create_task_log_folders(task_id, test_results_id)
+    playwright_manager = orchestrator.playwright_manager
+    with playwright_manager.use_screenshots_dir(log_folders["task_screenshots_folder"]):
+        task_result = await execute_single_task(
+            task_config, orchestrator, page, log_folders["task_log_folder"]
+        )
+        save_individual_test_result(task_result, results_dir)
+        await playwright_manager.take_screenshots("final", page)
+    return task_result
+
+
+async def run_tests_in_parallel(
+    indexed_task_configs: List[Tuple[int, Dict[str, Any]]],
+    workers: int,
+    test_results_id: str,
+    results_dir: str,
+    store: EvalStore,
+    total_tests: int,
+    wait_time_non_headless: int = 5,
+):
+    """
+    Runs the tasks on a pool of `workers` sessions, each with its own tab, orchestrator and agents (see SessionPool).
+
+    Results are recorded in the store as tasks complete. A task that raises is logged and left without a
+    result, so resuming the run retries it.
+    """
+    pool = SessionPool(
+        size=workers, homepage="about:blank", max_waiting=len(indexed_task_configs)
+    )
+    await pool.start()
+    completed = 0
+
+    async def run(index: int, task_config: Dict[str, Any]) -> Dict[str, Any]:
+        nonlocal completed
+        async with pool.acquire() as session:
+            # tabs the task opens are closed afterwards, the other workers' tabs are left alone
+            popups: List[Page] = []
+            on_popup = popups.append
+            session.page.on("popup", on_popup)
+            try:
+                task_result = await run_single_test(
+                    task_config,
+                    session.orchestrator,
+                    session.page,
+                    test_results_id,
+                    results_dir,
+                )
+            finally:
+                session.page.remove_listener("popup", on_popup)
+                for popup in popups:
+                    if not popup.is_closed():
+                        await popup.close()
+            if not pool.playwright_manager.isheadless:
+                await asyncio.sleep(wait_time_non_headless)
+        store.append(index, task_result)
+        completed += 1
+        print_test_result(task_result, index + 1, total_tests)
+        logger.info(f"Eval progress: {store.summary}")
+        print_progress_bar(completed, len(indexed_task_configs))
+        return task_result
+
+    try:
+        outcomes = await asyncio.gather(
+            *(run(index, task_config) for index, task_config in indexed_task_configs),
+            return_exceptions=True,
+        )
+    finally:
+        await pool.stop()
+
+    for (index, task_config), outcome in zip(indexed_task_configs, outcomes):
+        if isinstance(outcome, BaseException):
+            logger.error(
+                f"Task {task_config.get('task_id')} (index {index}) failed: {outcome}"
+            )
+
+
+async def run_tests(
+    orchestrator: Optional[Orchestrator],
     min_task_index: int,
     max_task_index: int,
     test_file: str = "",
     test_results_id: str = "",
     wait_time_non_headless: int = 5,
     take_screenshots: bool = True,
+    workers: int = 1,
+    resume: bool = False,
 ) -> List[Dict[str, Any]]:
+    """
+    Runs the tasks of a test file and prints a summary.
+
+    Args:
+        orchestrator (Orchestrator, optional): Orchestrator for sequential runs. One is created when None.
+        workers (int, optional): Number of tasks run concurrently, each in its own session. Defaults to 1 (sequential).
+        resume (bool, optional): Continue the run checkpointed in the results directory (see EvalStore): tasks
+                                 with a result are skipped and counted in the summary. Defaults to False.
+    """
     check_top_level_test_folders()
 
     if not test_file:
@@ -207,36 +307,61 @@ async def run_tests(
     test_results_id = create_test_results_id(test_results_id, test_file)
     results_dir = create_results_dir(test_file, test_results_id)
 
-    page = await orchestrator.playwright_manager.get_current_page()
-    test_results = []
     max_task_index = len(test_configurations) if not max_task_index else max_task_index
     total_tests = max_task_index - min_task_index
 
-    for index, task_config in enumerate(
-        test_configurations[min_task_index:max_task_index], start=min_task_index
-    ):
-        task_id = str(task_config.get("task_id"))
-        log_folders = create_task_log_folders(task_id, test_results_id)
+    store = EvalStore(results_dir, resume=resume)
+    pending_task_configs = store.pending(
+        enumerate(
+            test_configurations[min_task_index:max_task_index], start=min_task_index
+        )
+    )
+    if resume:
+        logger.info(
+            f"Resuming after task index {store.last_completed_index}: "
+            f"{store.summary.completed} tasks already have results, {len(pending_task_configs)} left"
+        )
 
+    if workers > 1:
+        PlaywrightManager().set_take_screenshots(take_screenshots)
+        await run_tests_in_parallel(
+            pending_task_configs,
+            workers,
+            test_results_id,
+            results_dir,
+            store,
+            total_tests,
+            wait_time_non_headless,
+        )
+    else:
+        owns_orchestrator = orchestrator is None
+        if orchestrator is None:
+            orchestrator = Orchestrator(
+                state_to_agent_map=create_state_to_agent_map(), eval_mode=True
+            )
+            await orchestrator.start()
         orchestrator.playwright_manager.set_take_screenshots(take_screenshots)
-        if take_screenshots:
-            orchestrator.playwright_manager.set_screenshots_dir(
-                log_folders["task_screenshots_folder"]
+        page = await orchestrator.playwright_manager.get_current_page()
+
+        for index, task_config in pending_task_configs:
+            print_progress_bar(index - min_task_index, total_tests)
+            task_result = await run_single_test(
+                task_config, orchestrator, page, test_results_id, results_dir
             )
+            store.append(index, task_result)
+            print_test_result(task_result, index + 1, total_tests)
+            logger.info(f"Eval progress: {store.summary}")
 
-        print_progress_bar(index - min_task_index, total_tests)
-        task_result = await execute_single_task(
-            task_config, orchestrator, page, log_folders["task_log_folder"]
-        )
-        test_results.append(task_result)
-        save_individual_test_result(task_result, results_dir)
-        print_test_result(task_result, index + 1, total_tests)
+            if not orchestrator.playwright_manager.isheadless:
+                await asyncio.sleep(wait_time_non_headless)
 
-        if not orchestrator.playwright_manager.isheadless:
-            await asyncio.sleep(wait_time_non_headless)
+            await orchestrator.playwright_manager.close_except_specified_tab(page)
 
-        await orchestrator.playwright_manager.take_screenshots("final", None)
-        await orchestrator.playwright_manager.close_except_specified_tab(page)
+        if owns_orchestrator:
+            await orchestrator.shutdown()
+
+    store.close()
+    test_results = [result for _, result in store.results()]
 
     print_progress_bar(total_tests, total_tests)
     print("\n\nAll tests completed.")
@@ -245,11 +370,11 @@ async def run_tests(
     detailed_results_table = [
         ["Test Index", "Task ID", "Intent", "Status", "Time Taken (s)"]
     ]
-    for idx, result in enumerate(test_results, 1):
+    for index, result in store.results():
         status, color = determine_status_and_color(result["score"])
         detailed_results_table.append(
             [
-                idx,
+                index + 1,
                 result["task_id"],
                 result["intent"],
                 colored(status, color),
@@ -259,10 +384,7 @@ async def run_tests(
 
     print(tabulate(detailed_results_table, headers="firstrow", tablefmt="grid"))
 
-    passed_tests = [result for result in test_results if result["score"] == 1]
-    skipped_tests = [result for result in test_results if result["score"] < 0]
-    failed_tests = [result for result in test_results if 0 <= result["score"] < 1]
-
+    summary = store.summary
     summary_table = [
         [
             "Total Tests",
@@ -274,30 +396,31 @@ async def run_tests(
         ],
         [
             total_tests,
-            len(passed_tests),
-            len(failed_tests),
-            len(skipped_tests),
-            round(sum(test["tct"] for test in test_results) / total_tests, 2),
-            round(sum(test["tct"] for test in test_results), 2),
+            summary.passed,
+            summary.failed,
+            summary.skipped,
+            round(summary.average_time, 2),
+            round(summary.total_time, 2),
         ],
     ]
 
     print("\nSummary Report:")
     print(tabulate(summary_table, headers="firstrow", tablefmt="grid"))
 
+    performance = write_performance_report(test_results, results_dir)
+    if performance:
+        print("\nPerformance Report:")
+        print_performance_summary(performance)
+        logger.info(f"Performance report written to: {results_dir}")
+
     return test_results
 
 
 # Main execution function (if needed)
 async def main():
-    state_to_agent_map = {
-        State.PLAN: PlannerAgent(),
-        State.BROWSE: BrowserNavAgent(),
-        State.AGENTQ_BASE: AgentQ(),
-        State.AGENTQ_ACTOR: AgentQActor(),
-        State.AGENTQ_CRITIC: AgentQCritic(),
-    }
-    orchestrator = Orchestrator(state_to_agent_map=state_to_agent_map, eval_mode=True)
+    orchestrator = Orchestrator(
+        state_to_agent_map=create_state_to_agent_map(), eval_mode=True
+    )
     await orchestrator.start()
     await run_tests(orchestrator, 0, 29)  # Example: Run first 5 tests
     await orchestrator.shutdown()